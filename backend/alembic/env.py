@@ -59,8 +59,8 @@ if not DATABASE_URL.startswith("postgresql+psycopg2://"):
 # -------------------------------------------------------------------
 # Import metadata AND MODELS
 # -------------------------------------------------------------------
-from app.database import Base  # noqa: E402
-import app.models  # noqa: E402  ✅ CRITICAL FIX
+from app.db.base import Base  # noqa: E402
+import app.models  # noqa: E402  (registers every model on Base.metadata)
 
 # -------------------------------------------------------------------
 # Alembic configuration
@@ -0,0 +1,43 @@
+"""add users.trial_ended_at
+
+Marks trials the expiry sweeper has processed, with a partial
+index over the ones it has not.
+
+Revision ID: 1f5c8e2b6d93
+Revises: e6a0c3d85b17
+Create Date: 2026-10-18 15:48:13.270914
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1f5c8e2b6d93'
+down_revision: Union[str, Sequence[str], None] = 'e6a0c3d85b17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('users', sa.Column('trial_ended_at', sa.DateTime(timezone=True), nullable=True))
+    # Trials that ended before the sweeper existed are only marked:
+    # the sweeper handles new expiries, not a months-old backlog
+    op.execute(
+        "UPDATE users SET trial_ended_at = trial_expires_at "
+        "WHERE trial_expires_at <= now()"
+    )
+    op.create_index(
+        'ix_users_trial_pending', 'users', ['trial_expires_at'],
+        unique=False,
+        postgresql_where=sa.text('trial_ended_at IS NULL'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_users_trial_pending', table_name='users')
+    op.drop_column('users', 'trial_ended_at')
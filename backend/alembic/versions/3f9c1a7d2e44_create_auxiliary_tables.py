@@ -0,0 +1,79 @@
+"""create referrals, email_verifications and audit_logs
+
+These models lived on a second declarative Base that Alembic
+never saw; with a single metadata they are now migrated too.
+
+Revision ID: 3f9c1a7d2e44
+Revises: b25ea3b5625b
+Create Date: 2026-10-18 09:12:40.118304
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f9c1a7d2e44'
+down_revision: Union[str, Sequence[str], None] = 'b25ea3b5625b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'referrals',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('referrer_id', sa.UUID(), nullable=False),
+        sa.Column('referred_id', sa.UUID(), nullable=False),
+        sa.Column('reward_amount_kes', sa.Integer(), nullable=False),
+        sa.Column('reward_paid', sa.Boolean(), nullable=False),
+        sa.Column('triggered_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.ForeignKeyConstraint(['referred_id'], ['users.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['referrer_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(op.f('ix_referrals_referred_id'), 'referrals', ['referred_id'], unique=True)
+    op.create_index(op.f('ix_referrals_referrer_id'), 'referrals', ['referrer_id'], unique=False)
+
+    op.create_table(
+        'email_verifications',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('user_id', sa.UUID(), nullable=False),
+        sa.Column('code', sa.String(length=6), nullable=False),
+        sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('used', sa.Boolean(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(op.f('ix_email_verifications_user_id'), 'email_verifications', ['user_id'], unique=False)
+
+    op.create_table(
+        'audit_logs',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('actor_id', sa.UUID(), nullable=True),
+        sa.Column('action_type', sa.String(length=100), nullable=False),
+        sa.Column('resource_type', sa.String(length=100), nullable=False),
+        sa.Column('resource_id', sa.String(length=100), nullable=False),
+        sa.Column('metadata', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.ForeignKeyConstraint(['actor_id'], ['users.id'], ondelete='SET NULL'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(op.f('ix_audit_logs_actor_id'), 'audit_logs', ['actor_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_audit_logs_actor_id'), table_name='audit_logs')
+    op.drop_table('audit_logs')
+    op.drop_index(op.f('ix_email_verifications_user_id'), table_name='email_verifications')
+    op.drop_table('email_verifications')
+    op.drop_index(op.f('ix_referrals_referrer_id'), table_name='referrals')
+    op.drop_index(op.f('ix_referrals_referred_id'), table_name='referrals')
+    op.drop_table('referrals')
@@ -0,0 +1,37 @@
+"""referral reward settlement
+
+Adds referrals.paid_at and a partial index over the rows the
+settlement job still has to claim.
+
+Revision ID: 4b7e2d9a0c68
+Revises: 9d4f6b2e8c15
+Create Date: 2026-10-18 14:10:22.081735
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4b7e2d9a0c68'
+down_revision: Union[str, Sequence[str], None] = '9d4f6b2e8c15'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('referrals', sa.Column('paid_at', sa.DateTime(timezone=True), nullable=True))
+    op.create_index(
+        'ix_referrals_unpaid_triggered', 'referrals', ['triggered_at', 'id'],
+        unique=False,
+        postgresql_where=sa.text('NOT reward_paid AND triggered_at IS NOT NULL'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_referrals_unpaid_triggered', table_name='referrals')
+    op.drop_column('referrals', 'paid_at')
@@ -0,0 +1,124 @@
+"""partition audit_logs by month
+
+Rebuilds audit_logs as a table range-partitioned on created_at,
+with a BRIN index on created_at and a composite (id, created_at)
+primary key. Existing rows are copied over. Partitions cover every
+month that has rows plus the next three; the app keeps creating
+them ahead (audit.maintain_partitions).
+
+Revision ID: 5e8b3f1c7a62
+Revises: c2d7e5a19f30
+Create Date: 2026-10-18 12:04:51.337160
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e8b3f1c7a62'
+down_revision: Union[str, Sequence[str], None] = 'c2d7e5a19f30'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+_CREATE_PARTITIONS = """
+DO $$
+DECLARE
+    month date := date_trunc('month', coalesce(
+        (SELECT min(created_at) FROM audit_logs_unpartitioned), now()
+    ) AT TIME ZONE 'UTC')::date;
+    last date := (date_trunc('month', now() AT TIME ZONE 'UTC') + interval '3 months')::date;
+BEGIN
+    WHILE month <= last LOOP
+        EXECUTE format(
+            'CREATE TABLE %I PARTITION OF audit_logs FOR VALUES FROM (%L) TO (%L)',
+            'audit_logs_p' || to_char(month, 'YYYY_MM'),
+            month,
+            (month + interval '1 month')::date
+        );
+        month := (month + interval '1 month')::date;
+    END LOOP;
+END
+$$;
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.drop_index('ix_audit_logs_actor_id', table_name='audit_logs')
+    op.execute("ALTER TABLE audit_logs RENAME TO audit_logs_unpartitioned")
+    op.execute("ALTER INDEX audit_logs_pkey RENAME TO audit_logs_unpartitioned_pkey")
+
+    op.execute(
+        """
+        CREATE TABLE audit_logs (
+            id bigint GENERATED BY DEFAULT AS IDENTITY,
+            created_at timestamptz NOT NULL DEFAULT now(),
+            actor_id uuid REFERENCES users (id) ON DELETE SET NULL,
+            action_type varchar(100) NOT NULL,
+            resource_type varchar(100) NOT NULL,
+            resource_id varchar(100) NOT NULL,
+            metadata jsonb NOT NULL DEFAULT '{}',
+            PRIMARY KEY (id, created_at)
+        ) PARTITION BY RANGE (created_at)
+        """
+    )
+    op.create_index('ix_audit_logs_actor_id', 'audit_logs', ['actor_id'], unique=False)
+    op.create_index(
+        'ix_audit_logs_created_at_brin', 'audit_logs', ['created_at'],
+        unique=False, postgresql_using='brin',
+    )
+    op.execute(_CREATE_PARTITIONS)
+
+    op.execute(
+        """
+        INSERT INTO audit_logs
+            (id, created_at, actor_id, action_type, resource_type, resource_id, metadata)
+        SELECT id, coalesce(created_at, now()), actor_id, action_type,
+               resource_type, resource_id, metadata
+        FROM audit_logs_unpartitioned
+        ORDER BY created_at
+        """
+    )
+    op.execute(
+        "SELECT setval(pg_get_serial_sequence('audit_logs', 'id'), "
+        "coalesce((SELECT max(id) FROM audit_logs), 0) + 1, false)"
+    )
+    op.execute("DROP TABLE audit_logs_unpartitioned")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("ALTER TABLE audit_logs RENAME TO audit_logs_partitioned")
+    op.execute("ALTER INDEX ix_audit_logs_actor_id RENAME TO ix_audit_logs_partitioned_actor_id")
+
+    op.execute(
+        """
+        CREATE TABLE audit_logs (
+            id serial PRIMARY KEY,
+            actor_id uuid REFERENCES users (id) ON DELETE SET NULL,
+            action_type varchar(100) NOT NULL,
+            resource_type varchar(100) NOT NULL,
+            resource_id varchar(100) NOT NULL,
+            metadata jsonb NOT NULL,
+            created_at timestamptz DEFAULT now()
+        )
+        """
+    )
+    op.create_index('ix_audit_logs_actor_id', 'audit_logs', ['actor_id'], unique=False)
+    op.execute(
+        """
+        INSERT INTO audit_logs
+            (id, actor_id, action_type, resource_type, resource_id, metadata, created_at)
+        SELECT id, actor_id, action_type, resource_type, resource_id, metadata, created_at
+        FROM audit_logs_partitioned
+        """
+    )
+    op.execute(
+        "SELECT setval(pg_get_serial_sequence('audit_logs', 'id'), "
+        "coalesce((SELECT max(id) FROM audit_logs), 0) + 1, false)"
+    )
+    # Drops every partition with it
+    op.execute("DROP TABLE audit_logs_partitioned")
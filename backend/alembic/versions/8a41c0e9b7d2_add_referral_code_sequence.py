@@ -0,0 +1,29 @@
+"""add referral code sequence
+
+Revision ID: 8a41c0e9b7d2
+Revises: 3f9c1a7d2e44
+Create Date: 2026-10-18 10:02:11.504871
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8a41c0e9b7d2'
+down_revision: Union[str, Sequence[str], None] = '3f9c1a7d2e44'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CACHE 1: blocks are reserved explicitly by the application
+    op.execute(sa.schema.CreateSequence(sa.Sequence('referral_code_seq', start=1, cache=1)))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute(sa.schema.DropSequence(sa.Sequence('referral_code_seq')))
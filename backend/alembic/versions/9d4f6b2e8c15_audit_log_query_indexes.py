@@ -0,0 +1,54 @@
+"""audit_logs query indexes
+
+Composite indexes ending in the (created_at DESC, id DESC) keyset
+for the actor, resource and action filters, and a jsonb_path_ops
+GIN index for metadata containment. The actor composite replaces
+the plain actor_id index.
+
+Revision ID: 9d4f6b2e8c15
+Revises: 5e8b3f1c7a62
+Create Date: 2026-10-18 13:31:09.644718
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9d4f6b2e8c15'
+down_revision: Union[str, Sequence[str], None] = '5e8b3f1c7a62'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_audit_logs_actor_created', 'audit_logs',
+        ['actor_id', sa.text('created_at DESC'), sa.text('id DESC')],
+    )
+    op.drop_index('ix_audit_logs_actor_id', table_name='audit_logs')
+    op.create_index(
+        'ix_audit_logs_resource_created', 'audit_logs',
+        ['resource_type', 'resource_id', sa.text('created_at DESC'), sa.text('id DESC')],
+    )
+    op.create_index(
+        'ix_audit_logs_action_created', 'audit_logs',
+        ['action_type', sa.text('created_at DESC'), sa.text('id DESC')],
+    )
+    op.create_index(
+        'ix_audit_logs_metadata_gin', 'audit_logs', ['metadata'],
+        postgresql_using='gin',
+        postgresql_ops={'metadata': 'jsonb_path_ops'},
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_audit_logs_metadata_gin', table_name='audit_logs')
+    op.drop_index('ix_audit_logs_action_created', table_name='audit_logs')
+    op.drop_index('ix_audit_logs_resource_created', table_name='audit_logs')
+    op.create_index('ix_audit_logs_actor_id', 'audit_logs', ['actor_id'], unique=False)
+    op.drop_index('ix_audit_logs_actor_created', table_name='audit_logs')
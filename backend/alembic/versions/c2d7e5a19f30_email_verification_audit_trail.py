@@ -0,0 +1,36 @@
+"""email_verifications becomes an audit trail
+
+Codes now live in Redis; rows no longer carry them, and the
+retention purge deletes by created_at.
+
+Revision ID: c2d7e5a19f30
+Revises: 8a41c0e9b7d2
+Create Date: 2026-10-18 11:20:37.902214
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c2d7e5a19f30'
+down_revision: Union[str, Sequence[str], None] = '8a41c0e9b7d2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.alter_column('email_verifications', 'code', existing_type=sa.String(length=6), nullable=True)
+    # Plaintext codes have no business outliving their use
+    op.execute("UPDATE email_verifications SET code = NULL")
+    op.create_index(op.f('ix_email_verifications_created_at'), 'email_verifications', ['created_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_email_verifications_created_at'), table_name='email_verifications')
+    op.execute("UPDATE email_verifications SET code = '' WHERE code IS NULL")
+    op.alter_column('email_verifications', 'code', existing_type=sa.String(length=6), nullable=False)
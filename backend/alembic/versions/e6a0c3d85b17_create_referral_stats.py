@@ -0,0 +1,80 @@
+"""create referral_stats
+
+Per-user direct/descendant referral counts and tree depth, kept
+up to date at signup. Backfilled here from users.referred_by_id.
+
+Revision ID: e6a0c3d85b17
+Revises: 4b7e2d9a0c68
+Create Date: 2026-10-18 15:02:47.519203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e6a0c3d85b17'
+down_revision: Union[str, Sequence[str], None] = '4b7e2d9a0c68'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+_BACKFILL = """
+WITH RECURSIVE chain(user_id, ancestor_id, distance) AS (
+    SELECT id, referred_by_id, 1
+    FROM users
+    WHERE referred_by_id IS NOT NULL
+    UNION ALL
+    SELECT c.user_id, p.referred_by_id, c.distance + 1
+    FROM chain c
+    JOIN users p ON p.id = c.ancestor_id
+    WHERE p.referred_by_id IS NOT NULL
+),
+below AS (
+    SELECT ancestor_id AS user_id,
+           count(*) FILTER (WHERE distance = 1) AS direct_count,
+           count(*) AS descendant_count
+    FROM chain
+    GROUP BY ancestor_id
+),
+above AS (
+    SELECT user_id, max(distance) AS depth
+    FROM chain
+    GROUP BY user_id
+)
+INSERT INTO referral_stats (user_id, direct_count, descendant_count, depth)
+SELECT coalesce(below.user_id, above.user_id),
+       coalesce(below.direct_count, 0),
+       coalesce(below.descendant_count, 0),
+       coalesce(above.depth, 0)
+FROM below
+FULL JOIN above ON above.user_id = below.user_id
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'referral_stats',
+        sa.Column('user_id', sa.UUID(), nullable=False),
+        sa.Column('direct_count', sa.Integer(), nullable=False),
+        sa.Column('descendant_count', sa.Integer(), nullable=False),
+        sa.Column('depth', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('user_id'),
+    )
+    op.execute(_BACKFILL)
+    op.create_index(
+        'ix_referral_stats_leaderboard', 'referral_stats',
+        [sa.text('direct_count DESC'), sa.text('descendant_count DESC'), 'user_id'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_referral_stats_leaderboard', table_name='referral_stats')
+    op.drop_table('referral_stats')
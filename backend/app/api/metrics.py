@@ -0,0 +1,140 @@
+import os
+from typing import Iterator
+
+from fastapi import APIRouter, Response
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    generate_latest,
+    multiprocess,
+)
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily, Metric
+
+from app.core.hashing import password_hasher
+from app.core.rate_limit import rate_limiter
+from app.core.security import verified_claims_cache
+from app.crud.user import principal_cache
+from app.db.engines import pool_stats
+from app.services.audit import audit_buffer
+
+
+router = APIRouter(tags=["Metrics"])
+
+
+# --------------------------------------------------
+# Point-in-time state
+# --------------------------------------------------
+class StateCollector:
+    """
+    Pool, cache, hasher and buffer gauges, read from the existing
+    stats() counters at scrape time: nothing runs per request.
+    """
+
+    def collect(self) -> Iterator[Metric]:
+        pool = pool_stats()
+        connections = GaugeMetricFamily(
+            "db_pool_connections",
+            "Connections in the async pool by state.",
+            labels=["state"],
+        )
+        for state in ("checked_in", "checked_out", "overflow"):
+            connections.add_metric([state], pool.get(state, 0))
+        yield connections
+        yield CounterMetricFamily(
+            "db_pool_checkouts", "Pool checkouts.", value=pool["checkouts"]
+        )
+        yield CounterMetricFamily(
+            "db_pool_checkout_wait_seconds",
+            "Total time spent waiting for a pooled connection.",
+            value=pool["checkout_wait_seconds_total"],
+        )
+        yield CounterMetricFamily(
+            "db_pool_checkout_timeouts",
+            "Checkouts that timed out.",
+            value=pool["checkout_timeouts"],
+        )
+
+        hits = CounterMetricFamily(
+            "cache_hits", "Cache hits by cache and tier.", labels=["cache", "tier"]
+        )
+        misses = CounterMetricFamily("cache_misses", "Cache misses.", labels=["cache"])
+        entries = GaugeMetricFamily(
+            "cache_entries", "Entries held in process.", labels=["cache"]
+        )
+
+        principal = principal_cache.stats()
+        hits.add_metric(["principal", "local"], principal["local_hits"])
+        hits.add_metric(["principal", "redis"], principal["redis_hits"])
+        misses.add_metric(["principal"], principal["misses"])
+        entries.add_metric(["principal"], principal["local"]["size"])
+
+        tokens = verified_claims_cache.stats()
+        hits.add_metric(["token", "local"], tokens["hits"])
+        misses.add_metric(["token"], tokens["misses"])
+        entries.add_metric(["token"], tokens["size"])
+
+        limiter = rate_limiter.stats()
+        entries.add_metric(["rate_limit"], limiter["local"]["size"])
+        yield hits
+        yield misses
+        yield entries
+
+        decisions = CounterMetricFamily(
+            "rate_limit_decisions", "Rate limiter decisions.", labels=["result"]
+        )
+        decisions.add_metric(["allowed"], limiter["allowed"])
+        decisions.add_metric(["local_reject"], limiter["local_rejects"])
+        decisions.add_metric(["redis_reject"], limiter["redis_rejects"])
+        yield decisions
+
+        hasher = password_hasher.stats()
+        hashing = GaugeMetricFamily(
+            "password_hash_jobs", "Password hash/verify jobs by state.", labels=["state"]
+        )
+        hashing.add_metric(["in_flight"], hasher["in_flight"])
+        hashing.add_metric(["waiting"], hasher["waiting"])
+        yield hashing
+        yield CounterMetricFamily(
+            "password_hash_queue_wait_seconds",
+            "Total time hash jobs waited before running.",
+            value=hasher["queue_wait_seconds_total"],
+        )
+
+        audit = audit_buffer.stats()
+        yield GaugeMetricFamily(
+            "audit_buffered_events", "Audit events waiting to be written.",
+            value=audit["buffered"],
+        )
+        yield CounterMetricFamily(
+            "audit_dropped_events", "Audit events dropped on overflow.",
+            value=audit["dropped"],
+        )
+
+
+_state_collector = StateCollector()
+_registered = False
+
+
+def _registry() -> CollectorRegistry:
+    """
+    With PROMETHEUS_MULTIPROC_DIR set (several uvicorn workers) the
+    request metrics are aggregated across workers; the state gauges
+    are those of the worker that serves the scrape.
+    """
+    global _registered
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        registry.register(_state_collector)
+        return registry
+
+    if not _registered:
+        REGISTRY.register(_state_collector)
+        _registered = True
+    return REGISTRY
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics() -> Response:
+    return Response(generate_latest(_registry()), media_type=CONTENT_TYPE_LATEST)
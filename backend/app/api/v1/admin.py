@@ -0,0 +1,154 @@
+import json
+import uuid
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.metrics import InstrumentedRoute
+from app.crud.audit_log import AuditLogFilter, list_audit_logs
+from app.db.session import get_db
+from app.models.user import User
+from app.schemas.audit_log import AuditLogPage
+from app.schemas.user import UserImportReport
+from app.services.audit import audit
+from app.services.auth import get_current_admin
+from app.services.user_import import IMPORT_FORMATS, aiter_lines, import_users
+
+
+router = APIRouter(
+    prefix="/admin",
+    tags=["Admin"],
+    route_class=InstrumentedRoute,
+)
+
+
+_CONTENT_TYPE_FORMATS = {
+    "text/csv": "csv",
+    "application/x-ndjson": "ndjson",
+    "application/ndjson": "ndjson",
+    "application/jsonl": "ndjson",
+}
+
+
+# --------------------------------------------------
+# Bulk user import
+# --------------------------------------------------
+@router.post(
+    "/users/import",
+    response_model=UserImportReport,
+)
+async def import_users_endpoint(
+    request: Request,
+    fmt: Optional[str] = Query(
+        None,
+        alias="format",
+        description="csv or ndjson; defaults from Content-Type",
+    ),
+    batch_size: Optional[int] = Query(None, ge=1),
+    db: AsyncSession = Depends(get_db),
+    admin: User = Depends(get_current_admin),
+):
+    """
+    Import users from a raw CSV or NDJSON request body.
+
+    The body is read as a stream, so uploads are never held in
+    memory in full.
+    """
+    if fmt is None:
+        content_type = request.headers.get("content-type", "").split(";")[0].strip()
+        fmt = _CONTENT_TYPE_FORMATS.get(content_type)
+
+    if fmt not in IMPORT_FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Send text/csv or application/x-ndjson, or pass ?format=",
+        )
+
+    report = await import_users(
+        db,
+        aiter_lines(request.stream()),
+        fmt=fmt,
+        batch_size=batch_size,
+    )
+    audit(
+        "admin.users_import",
+        "user",
+        "*",
+        actor_id=admin.id,
+        metadata={
+            "format": fmt,
+            "total_rows": report.total_rows,
+            "inserted": report.inserted,
+            "failed": report.failed,
+        },
+    )
+    return report
+
+
+# --------------------------------------------------
+# Audit log
+# --------------------------------------------------
+@router.get(
+    "/audit-logs",
+    response_model=AuditLogPage,
+)
+async def list_audit_logs_endpoint(
+    actor_id: Optional[uuid.UUID] = None,
+    resource_type: Optional[str] = Query(None, max_length=100),
+    resource_id: Optional[str] = Query(None, max_length=100),
+    action_type: Optional[str] = Query(None, max_length=100),
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    metadata: Optional[str] = Query(
+        None,
+        description='JSON object the metadata must contain, e.g. {"format":"csv"}',
+    ),
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=500),
+    db: AsyncSession = Depends(get_db),
+    _admin: User = Depends(get_current_admin),
+):
+    """
+    Audit events, newest first, with keyset pagination: pass the
+    returned ``next_cursor`` to get the following page.
+    """
+    if resource_id is not None and resource_type is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="resource_id requires resource_type",
+        )
+
+    metadata_contains = None
+    if metadata is not None:
+        try:
+            metadata_contains = json.loads(metadata)
+        except ValueError:
+            metadata_contains = None
+        if not isinstance(metadata_contains, dict):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="metadata must be a JSON object",
+            )
+
+    filters = AuditLogFilter(
+        actor_id=actor_id,
+        resource_type=resource_type,
+        resource_id=resource_id,
+        action_type=action_type,
+        since=since,
+        until=until,
+        metadata_contains=metadata_contains,
+    )
+    try:
+        items, next_cursor = await list_audit_logs(
+            db, filters, cursor=cursor, limit=limit
+        )
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
+
+    return {"items": items, "next_cursor": next_cursor}
@@ -1,19 +1,41 @@
-from fastapi import APIRouter, Depends, status
+from datetime import datetime, timezone
+
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
+from app.core.metrics import InstrumentedRoute
 from app.db.session import get_db
-from app.schemas.user import UserCreate, UserLogin, UserRead
+from app.schemas.user import (
+    EmailVerificationConfirm,
+    EmailVerificationIssued,
+    RefreshRequest,
+    SessionRead,
+    TokenPair,
+    UserCreate,
+    UserLogin,
+    UserRead,
+)
 from app.services.auth import (
     register_user,
     authenticate_user,
     get_current_user,
+    get_current_principal,
+    client_ip,
+    enforce_rate_limit,
+    refresh_session,
+    request_email_verification,
+    confirm_email_verification,
 )
 from app.models.user import User
+from app.read_models.user import user_read_response
+from app.services.sessions import list_sessions, revoke_all_sessions, revoke_sessions
 
 
 router = APIRouter(
     prefix="/auth",
     tags=["Auth"],
+    route_class=InstrumentedRoute,
 )
 
 
@@ -27,31 +49,109 @@ router = APIRouter(
 )
 async def register(
     payload: UserCreate,
+    request: Request,
     db: AsyncSession = Depends(get_db),
 ):
+    await enforce_rate_limit(
+        request,
+        "register",
+        email=payload.email,
+        phone=payload.phone_number,
+    )
     return await register_user(db, payload)
 
 
 # --------------------------------------------------
 # Login
 # --------------------------------------------------
-@router.post("/login")
+@router.post(
+    "/login",
+    response_model=TokenPair,
+)
 async def login(
     payload: UserLogin,
+    request: Request,
     db: AsyncSession = Depends(get_db),
 ):
+    await enforce_rate_limit(request, "login", email=payload.email)
     user = await authenticate_user(
         db,
         email=payload.email,
         password=payload.password,
+        user_agent=request.headers.get("user-agent"),
+        ip=client_ip(request),
     )
 
     return {
         "access_token": user.access_token,
+        "refresh_token": user.refresh_token,
         "token_type": "bearer",
+        "expires_in": settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
     }
 
 
+# --------------------------------------------------
+# Refresh
+# --------------------------------------------------
+@router.post(
+    "/refresh",
+    response_model=TokenPair,
+)
+async def refresh(
+    payload: RefreshRequest,
+    db: AsyncSession = Depends(get_db),
+):
+    return await refresh_session(db, payload.refresh_token)
+
+
+# --------------------------------------------------
+# Sessions
+# --------------------------------------------------
+@router.get(
+    "/sessions",
+    response_model=list[SessionRead],
+)
+async def sessions(
+    current_user: User = Depends(get_current_user),
+):
+    return [
+        SessionRead(
+            id=item["id"],
+            created_at=datetime.fromtimestamp(item["created_at"], timezone.utc),
+            last_used_at=datetime.fromtimestamp(item["last_used_at"], timezone.utc),
+            user_agent=item["user_agent"],
+            ip=item["ip"],
+            current=item["id"] == current_user.session_id,
+        )
+        for item in await list_sessions(current_user.id)
+    ]
+
+
+@router.delete(
+    "/sessions/{session_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+)
+async def revoke_session(
+    session_id: str,
+    current_user: User = Depends(get_current_user),
+):
+    if not await revoke_sessions(current_user.id, [session_id]):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Session not found",
+        )
+
+
+@router.delete(
+    "/sessions",
+    status_code=status.HTTP_204_NO_CONTENT,
+)
+async def revoke_every_session(
+    current_user: User = Depends(get_current_user),
+):
+    await revoke_all_sessions(current_user.id)
+
+
 # --------------------------------------------------
 # Current user
 # --------------------------------------------------
@@ -60,6 +160,34 @@ async def login(
     response_model=UserRead,
 )
 async def me(
+    principal: dict = Depends(get_current_principal),
+):
+    # Projection of the principal; skips ORM and response validation
+    return user_read_response(principal)
+
+
+# --------------------------------------------------
+# Email verification
+# --------------------------------------------------
+@router.post(
+    "/verify-email/request",
+    response_model=EmailVerificationIssued,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def verify_email_request(
     current_user: User = Depends(get_current_user),
 ):
-    return current_user
+    expires_in = await request_email_verification(current_user)
+    return {"expires_in": expires_in}
+
+
+@router.post(
+    "/verify-email/confirm",
+    response_model=UserRead,
+)
+async def verify_email_confirm(
+    payload: EmailVerificationConfirm,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    return await confirm_email_verification(db, current_user, payload.code)
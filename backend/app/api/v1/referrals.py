@@ -0,0 +1,64 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.metrics import InstrumentedRoute
+from app.crud.referral_stats import get_referral_leaderboard, get_referral_stats
+from app.db.session import get_db
+from app.models.user import User
+from app.schemas.referral import ReferralLeaderboardEntry, ReferralStatsRead
+from app.services.auth import get_current_user
+
+
+router = APIRouter(
+    prefix="/referrals",
+    tags=["Referrals"],
+    route_class=InstrumentedRoute,
+)
+
+
+# --------------------------------------------------
+# Own stats
+# --------------------------------------------------
+@router.get(
+    "/me/stats",
+    response_model=ReferralStatsRead,
+)
+async def my_referral_stats(
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    stats = await get_referral_stats(db, current_user.id)
+    if stats is None:
+        return ReferralStatsRead()
+
+    return ReferralStatsRead(
+        direct_count=stats.direct_count,
+        indirect_count=stats.descendant_count - stats.direct_count,
+        descendant_count=stats.descendant_count,
+        depth=stats.depth,
+    )
+
+
+# --------------------------------------------------
+# Leaderboard
+# --------------------------------------------------
+@router.get(
+    "/leaderboard",
+    response_model=list[ReferralLeaderboardEntry],
+)
+async def referral_leaderboard(
+    limit: int = Query(10, ge=1, le=100),
+    db: AsyncSession = Depends(get_db),
+    _user: User = Depends(get_current_user),
+):
+    entries = await get_referral_leaderboard(db, limit)
+    return [
+        ReferralLeaderboardEntry(
+            rank=rank,
+            user_id=stats.user_id,
+            first_name=first_name,
+            direct_count=stats.direct_count,
+            descendant_count=stats.descendant_count,
+        )
+        for rank, (stats, first_name) in enumerate(entries, start=1)
+    ]
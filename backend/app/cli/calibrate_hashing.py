@@ -0,0 +1,136 @@
+"""
+Pick password-hashing cost parameters for this hardware.
+
+Times single hashes at increasing cost and reports the strongest
+setting whose median stays under the target latency, as
+environment lines ready for .env.
+
+Usage (from backend/):
+
+    python -m app.cli.calibrate_hashing --target-ms 250
+    python -m app.cli.calibrate_hashing --scheme argon2 --target-ms 300
+
+Run it on the machines that serve logins, with the API idle:
+the result is only as good as the CPU it was measured on.
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from typing import Any, Callable, Optional
+
+from passlib.context import CryptContext
+
+
+SAMPLE_PASSWORD = "Calibrate-Passw0rd!"
+
+
+def _median_ms(hash_fn: Callable[[str], str], samples: int) -> float:
+    timings = []
+    for _ in range(samples):
+        started = time.perf_counter()
+        hash_fn(SAMPLE_PASSWORD)
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def calibrate_bcrypt(
+    target_ms: float,
+    samples: int,
+    min_rounds: int = 10,
+    max_rounds: int = 16,
+) -> tuple[Optional[dict[str, Any]], list[dict[str, Any]]]:
+    best, trials = None, []
+    for rounds in range(min_rounds, max_rounds + 1):
+        context = CryptContext(schemes=["bcrypt"], bcrypt__rounds=rounds)
+        median = _median_ms(context.hash, samples)
+        trials.append({"rounds": rounds, "median_ms": median})
+        print(f"bcrypt rounds={rounds:<3} {median:8.1f} ms", file=sys.stderr)
+        if median > target_ms:
+            # Every extra round doubles the cost
+            break
+        best = {"PASSWORD_BCRYPT_ROUNDS": rounds}
+    return best, trials
+
+
+def calibrate_argon2(
+    target_ms: float,
+    samples: int,
+    parallelism: int,
+    min_memory_kib: int = 19456,
+    max_memory_kib: int = 1048576,
+) -> tuple[Optional[dict[str, Any]], list[dict[str, Any]]]:
+    """
+    Memory first (what makes GPU cracking expensive), doubling
+    until the target is hit; then time_cost on the chosen memory.
+    """
+    def measure(memory_kib: int, time_cost: int) -> float:
+        context = CryptContext(
+            schemes=["argon2"],
+            argon2__memory_cost=memory_kib,
+            argon2__time_cost=time_cost,
+            argon2__parallelism=parallelism,
+        )
+        median = _median_ms(context.hash, samples)
+        trials.append(
+            {"memory_kib": memory_kib, "time_cost": time_cost, "median_ms": median}
+        )
+        print(
+            f"argon2 m={memory_kib:<8} t={time_cost:<2} p={parallelism:<2} {median:8.1f} ms",
+            file=sys.stderr,
+        )
+        return median
+
+    trials: list[dict[str, Any]] = []
+    memory_kib, best_memory = min_memory_kib, None
+    while memory_kib <= max_memory_kib and measure(memory_kib, 2) <= target_ms:
+        best_memory = memory_kib
+        memory_kib *= 2
+    if best_memory is None:
+        return None, trials
+
+    time_cost, best_time = 2, 2
+    while time_cost < 10:
+        time_cost += 1
+        if measure(best_memory, time_cost) > target_ms:
+            break
+        best_time = time_cost
+
+    return {
+        "PASSWORD_HASH_SCHEMES": '["argon2","bcrypt"]',
+        "PASSWORD_ARGON2_MEMORY_COST_KIB": best_memory,
+        "PASSWORD_ARGON2_TIME_COST": best_time,
+        "PASSWORD_ARGON2_PARALLELISM": parallelism,
+    }, trials
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Calibrate password hashing cost.")
+    parser.add_argument("--scheme", choices=("bcrypt", "argon2"), default="bcrypt")
+    parser.add_argument("--target-ms", type=float, default=250.0,
+                        help="highest acceptable median time for one hash")
+    parser.add_argument("--samples", type=int, default=5)
+    parser.add_argument("--parallelism", type=int, default=4, help="argon2 lanes")
+    args = parser.parse_args()
+
+    if args.scheme == "bcrypt":
+        best, _trials = calibrate_bcrypt(args.target_ms, args.samples)
+    else:
+        try:
+            import argon2  # noqa: F401
+        except ImportError:
+            print("argon2 needs the argon2-cffi package: pip install argon2-cffi", file=sys.stderr)
+            sys.exit(2)
+        best, _trials = calibrate_argon2(args.target_ms, args.samples, args.parallelism)
+
+    if best is None:
+        print(f"Even the lowest {args.scheme} cost exceeds {args.target_ms} ms.", file=sys.stderr)
+        sys.exit(1)
+
+    for key, value in best.items():
+        print(f"{key}={value}")
+
+
+if __name__ == "__main__":
+    main()
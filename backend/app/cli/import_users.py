@@ -0,0 +1,58 @@
+"""
+Bulk-import users from a CSV or NDJSON file.
+
+Usage (from backend/):
+
+    python -m app.cli.import_users partners.csv
+    python -m app.cli.import_users partners.ndjson --batch-size 2000
+"""
+
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+from app.core.hashing import password_hasher
+from app.db.engines import dispose_engines
+from app.db.session import get_sessionmaker
+from app.services.user_import import IMPORT_FORMATS, aiter_sync, import_users
+
+
+def _detect_format(path: Path) -> str:
+    suffix = path.suffix.lower().lstrip(".")
+    if suffix in ("jsonl", "ndjson"):
+        return "ndjson"
+    return "csv"
+
+
+async def _run(path: Path, fmt: str, batch_size: int | None) -> int:
+    try:
+        with path.open(encoding="utf-8-sig", newline="") as handle:
+            async with get_sessionmaker()() as db:
+                report = await import_users(
+                    db,
+                    aiter_sync(handle),
+                    fmt=fmt,
+                    batch_size=batch_size,
+                )
+    finally:
+        password_hasher.shutdown()
+        await dispose_engines()
+
+    print(report.model_dump_json(indent=2))
+    return 1 if report.failed else 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Bulk-import users.")
+    parser.add_argument("path", type=Path)
+    parser.add_argument("--format", dest="fmt", choices=IMPORT_FORMATS)
+    parser.add_argument("--batch-size", type=int)
+    args = parser.parse_args()
+
+    fmt = args.fmt or _detect_format(args.path)
+    sys.exit(asyncio.run(_run(args.path, fmt, args.batch_size)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+from app.core.redis import get_redis, get_sync_redis
+
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+# --------------------------------------------------
+# In-process LRU + TTL
+# --------------------------------------------------
+class LRUTTLCache:
+    """
+    Bounded LRU cache whose entries also expire after a TTL.
+
+    Entries may carry their own expiry (``set(..., ttl=...)``),
+    which is clamped to the cache-wide TTL.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING:
+                self.misses += 1
+                return default
+
+            expires_at, value = entry
+            if expires_at <= now:
+                del self._data[key]
+                self.expirations += 1
+                self.misses += 1
+                return default
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        if self.max_entries <= 0:
+            return
+
+        ttl = self.ttl_seconds if ttl is None else min(ttl, self.ttl_seconds)
+        if ttl <= 0:
+            return
+
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "size": len(self._data),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+# --------------------------------------------------
+# Local LRU in front of shared Redis
+# --------------------------------------------------
+class TwoTierCache:
+    """
+    JSON-document cache: a per-process LRU+TTL tier backed by a
+    shared Redis tier.
+
+    Redis is treated as optional. On a Redis error the cache keeps
+    serving from the local tier (and the caller's source of truth)
+    and skips Redis for ``redis_backoff_seconds``.
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        *,
+        max_entries: int,
+        local_ttl_seconds: float,
+        redis_ttl_seconds: int,
+        enabled: bool = True,
+        redis_backoff_seconds: float = 5.0,
+    ) -> None:
+        self.namespace = namespace
+        self.enabled = enabled
+        self.redis_ttl_seconds = redis_ttl_seconds
+        self.redis_backoff_seconds = redis_backoff_seconds
+        self.local = LRUTTLCache(max_entries, local_ttl_seconds)
+
+        self._redis_disabled_until = 0.0
+
+        self.local_hits = 0
+        self.redis_hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.redis_errors = 0
+
+    def _key(self, key: str) -> str:
+        return f"{self.namespace}:{key}"
+
+    def _redis_available(self) -> bool:
+        return time.monotonic() >= self._redis_disabled_until
+
+    def _redis_failed(self, exc: Exception) -> None:
+        self.redis_errors += 1
+        self._redis_disabled_until = time.monotonic() + self.redis_backoff_seconds
+        logger.warning("%s cache: Redis unavailable (%s)", self.namespace, exc)
+
+    async def get(self, key: str) -> Optional[dict[str, Any]]:
+        if not self.enabled:
+            return None
+
+        value = self.local.get(key, _MISSING)
+        if value is not _MISSING:
+            self.local_hits += 1
+            return value
+
+        if self._redis_available():
+            try:
+                raw = await get_redis().get(self._key(key))
+            except Exception as exc:  # noqa: BLE001 - cache must never fail a request
+                self._redis_failed(exc)
+                raw = None
+
+            if raw is not None:
+                value = json.loads(raw)
+                self.local.set(key, value)
+                self.redis_hits += 1
+                return value
+
+        self.misses += 1
+        return None
+
+    async def set(self, key: str, value: dict[str, Any]) -> None:
+        if not self.enabled:
+            return
+
+        self.local.set(key, value)
+
+        if self._redis_available():
+            try:
+                await get_redis().set(
+                    self._key(key),
+                    json.dumps(value, separators=(",", ":")),
+                    ex=self.redis_ttl_seconds,
+                )
+            except Exception as exc:  # noqa: BLE001
+                self._redis_failed(exc)
+
+    async def invalidate(self, *keys: str) -> None:
+        if not keys:
+            return
+
+        self.invalidations += len(keys)
+        for key in keys:
+            self.local.delete(key)
+
+        if not self.enabled:
+            return
+
+        # Always attempt the shared delete, even while backing off:
+        # a missed invalidation would outlive the local TTL.
+        try:
+            await get_redis().delete(*(self._key(k) for k in keys))
+        except Exception as exc:  # noqa: BLE001
+            self._redis_failed(exc)
+
+    def invalidate_shared_sync(self, *keys: str) -> None:
+        """
+        Drop keys from the Redis tier only, for callers without an
+        event loop (Celery tasks). Other processes' local tiers
+        catch up within ``local_ttl_seconds``.
+        """
+        if not keys or not self.enabled:
+            return
+        try:
+            get_sync_redis().delete(*(self._key(k) for k in keys))
+        except Exception as exc:  # noqa: BLE001
+            self._redis_failed(exc)
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.local_hits + self.redis_hits + self.misses
+        return {
+            "namespace": self.namespace,
+            "enabled": self.enabled,
+            "local_hits": self.local_hits,
+            "redis_hits": self.redis_hits,
+            "misses": self.misses,
+            "hit_ratio": (
+                (self.local_hits + self.redis_hits) / lookups if lookups else 0.0
+            ),
+            "invalidations": self.invalidations,
+            "redis_errors": self.redis_errors,
+            "local": self.local.stats(),
+        }
@@ -1,3 +1,5 @@
+from typing import Optional
+
 from pydantic_settings import BaseSettings
 
 
@@ -13,11 +15,128 @@ class Settings(BaseSettings):
     # --------------------------------------------------
     SECRET_KEY: str
 
+    # --------------------------------------------------
+    # Password Hashing
+    # --------------------------------------------------
+    # Policy: the first scheme hashes new passwords; the others are
+    # still verified but marked for rehash. "argon2" needs the
+    # argon2-cffi package. Calibrate with app.cli.calibrate_hashing.
+    PASSWORD_HASH_SCHEMES: list[str] = ["bcrypt"]
+    PASSWORD_BCRYPT_ROUNDS: int = 12
+    PASSWORD_ARGON2_TIME_COST: int = 3
+    PASSWORD_ARGON2_MEMORY_COST_KIB: int = 65536
+    PASSWORD_ARGON2_PARALLELISM: int = 4
+
+    # Rehash (in the background) on login when a stored hash is
+    # below policy
+    PASSWORD_REHASH_ON_LOGIN: bool = True
+
+    # 0 = one worker process per CPU core
+    PASSWORD_HASH_WORKERS: int = 0
+
+    # Hash/verify jobs allowed in flight per API worker;
+    # further callers wait (and are measured) before submission
+    PASSWORD_HASH_MAX_IN_FLIGHT: int = 32
+
     # --------------------------------------------------
     # Database & Cache
     # --------------------------------------------------
     DATABASE_URL: str
     REDIS_URL: str
+    REDIS_SOCKET_TIMEOUT_SECONDS: float = 0.25
+
+    # --------------------------------------------------
+    # Database Connection Pool
+    # --------------------------------------------------
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT_SECONDS: float = 30.0
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+
+    # LIFO keeps a small hot set of connections and lets the
+    # rest go idle (and get recycled) during quiet periods
+    DB_POOL_USE_LIFO: bool = True
+
+    # Ping a connection on checkout only if it sat idle in the
+    # pool at least this long (0 = ping on every checkout)
+    DB_POOL_PING_IDLE_SECONDS: float = 30.0
+
+    # asyncpg prepared-statement cache per connection
+    DB_STATEMENT_CACHE_SIZE: int = 100
+
+    # PgBouncer transaction pooling: disable prepared-statement
+    # caching and use unique statement names
+    DB_PGBOUNCER_MODE: bool = False
+
+    # Log statements slower than this to "app.db.slow_query"
+    # (0 = off)
+    DB_SLOW_QUERY_SECONDS: float = 0.5
+
+    # Development: warn when one request runs the same statement
+    # shape this many times, a likely N+1 (0 = off)
+    DB_QUERY_REPEAT_WARNING: int = 0
+
+    # --------------------------------------------------
+    # Principal Cache (get_current_user)
+    # --------------------------------------------------
+    PRINCIPAL_CACHE_ENABLED: bool = True
+    PRINCIPAL_CACHE_MAX_ENTRIES: int = 10_000
+
+    # Local tier is per process, so keep it short: it bounds how
+    # long another worker can serve a principal after invalidation
+    PRINCIPAL_CACHE_LOCAL_TTL_SECONDS: float = 5.0
+    PRINCIPAL_CACHE_REDIS_TTL_SECONDS: int = 300
+
+    # --------------------------------------------------
+    # Access / Refresh Tokens
+    # --------------------------------------------------
+    TOKEN_CACHE_ENABLED: bool = True
+    TOKEN_CACHE_MAX_ENTRIES: int = 50_000
+    # Upper bound; each entry also expires with its token's exp
+    TOKEN_CACHE_TTL_SECONDS: float = 3600.0
+
+    ACCESS_TOKEN_EXPIRE_MINUTES: int = 60
+
+    # Rotating refresh tokens (app.services.sessions)
+    REFRESH_TOKEN_TTL_DAYS: int = 30
+    MAX_SESSIONS_PER_USER: int = 20
+
+    # Access tokens of a revoked session stop working within this
+    # (per-worker cache of live sessions)
+    SESSION_CHECK_CACHE_SECONDS: float = 5.0
+    SESSION_CHECK_CACHE_MAX_ENTRIES: int = 50_000
+
+    # --------------------------------------------------
+    # Rate Limiting (app.core.rate_limit)
+    # --------------------------------------------------
+    RATE_LIMIT_ENABLED: bool = True
+    # "<route>:<scope>" -> "<count>/<second|minute|hour|day>" or
+    # "<count>/<seconds>s"; set as JSON in the environment
+    RATE_LIMITS: dict[str, str] = {
+        "login:ip": "30/minute",
+        "login:email": "10/minute",
+        "register:ip": "30/hour",
+        "register:email": "5/hour",
+        "register:phone": "5/hour",
+    }
+    RATE_LIMIT_LOCAL_MAX_KEYS: int = 100_000
+    # Only behind a proxy that sets X-Forwarded-For itself
+    RATE_LIMIT_TRUST_FORWARDED_FOR: bool = False
+
+    # --------------------------------------------------
+    # Startup / Shutdown (app.services.warmup)
+    # --------------------------------------------------
+    STARTUP_WARMUP_ENABLED: bool = True
+    # Connections opened per worker before it reports ready
+    # (0 = DB_POOL_SIZE; never more than DB_POOL_SIZE)
+    STARTUP_WARM_DB_CONNECTIONS: int = 0
+    STARTUP_WARM_REDIS_CONNECTIONS: int = 4
+    STARTUP_WARMUP_TIMEOUT_SECONDS: float = 15.0
+
+    # --------------------------------------------------
+    # Metrics (Prometheus, served on /metrics)
+    # --------------------------------------------------
+    METRICS_ENABLED: bool = True
 
     # --------------------------------------------------
     # Celery
@@ -25,6 +144,52 @@ class Settings(BaseSettings):
     CELERY_BROKER_URL: str
     CELERY_RESULT_BACKEND: str
 
+    # --------------------------------------------------
+    # Email (SMTP)
+    # --------------------------------------------------
+    SMTP_HOST: str = "localhost"
+    SMTP_PORT: int = 25
+    SMTP_USERNAME: Optional[str] = None
+    SMTP_PASSWORD: Optional[str] = None
+    SMTP_STARTTLS: bool = False
+    SMTP_USE_SSL: bool = False
+    SMTP_TIMEOUT_SECONDS: float = 10.0
+    EMAIL_FROM: str = "POSTIKA <no-reply@localhost>"
+
+    # Delivery pipeline
+    EMAIL_BATCH_SIZE: int = 50
+    EMAIL_MAX_MESSAGES_PER_CONNECTION: int = 500
+    EMAIL_SMTP_IDLE_CHECK_SECONDS: float = 30.0
+    EMAIL_MAX_ATTEMPTS: int = 5
+    EMAIL_RETRY_BACKOFF_SECONDS: float = 10.0
+    EMAIL_RETRY_BACKOFF_MAX_SECONDS: float = 600.0
+    # A claimed batch not sent within this (worker killed) is
+    # queued again; keep it well above a batch's send time
+    EMAIL_CLAIM_LEASE_SECONDS: float = 300.0
+
+    # --------------------------------------------------
+    # Email Verification
+    # --------------------------------------------------
+    EMAIL_VERIFICATION_CODE_TTL_SECONDS: int = 900
+    EMAIL_VERIFICATION_MAX_ATTEMPTS: int = 5
+    EMAIL_VERIFICATION_RESEND_SECONDS: int = 60
+
+    # Optional Postgres audit trail (written by a Celery task)
+    EMAIL_VERIFICATION_AUDIT: bool = False
+    EMAIL_VERIFICATION_AUDIT_RETENTION_DAYS: int = 30
+
+    # --------------------------------------------------
+    # Audit Log (write-behind buffer, monthly partitions)
+    # --------------------------------------------------
+    AUDIT_LOG_ENABLED: bool = True
+    AUDIT_LOG_BATCH_SIZE: int = 500
+    AUDIT_LOG_FLUSH_INTERVAL_SECONDS: float = 1.0
+    AUDIT_LOG_MAX_BUFFERED: int = 50000
+    # Retry delay after failed flushes doubles up to this
+    AUDIT_LOG_MAX_BACKOFF_SECONDS: float = 60.0
+    AUDIT_LOG_PARTITIONS_AHEAD: int = 3
+    AUDIT_LOG_RETENTION_MONTHS: int = 12
+
     # --------------------------------------------------
     # Frontend / Media
     # --------------------------------------------------
@@ -36,12 +201,35 @@ class Settings(BaseSettings):
     # --------------------------------------------------
     TRIAL_PERIOD_DAYS: int = 7
 
+    # Trial-expiry sweeper (app.services.trials). Expired trials are
+    # moved to TRIAL_EXPIRED_TIER, or only flagged when it is unset.
+    TRIAL_EXPIRED_TIER: Optional[str] = "sungura"
+    TRIAL_SWEEP_BATCH_SIZE: int = 500
+    TRIAL_SWEEP_MAX_BATCHES: int = 20
+
     # v1 referral rule (ACTIVE)
     DEFAULT_REFERRAL_REWARD_KES: int = 500
 
     # legacy / future use (NOT USED in v1)
     REFERRAL_REWARD_NDOVU_KES: int = 500
 
+    # Codes are reserved from Postgres in blocks and handed out
+    # from memory. The secret keys the code permutation: never
+    # change it once codes have been issued (defaults to SECRET_KEY).
+    REFERRAL_CODE_BLOCK_SIZE: int = 100
+    REFERRAL_CODE_SECRET: Optional[str] = None
+
+    # Reward settlement (app.services.referral_settlement)
+    REFERRAL_SETTLEMENT_CHUNK_SIZE: int = 500
+    REFERRAL_SETTLEMENT_MAX_CHUNKS: int = 20
+    REFERRAL_SETTLEMENT_CONCURRENCY: int = 4
+
+    # --------------------------------------------------
+    # Bulk User Import
+    # --------------------------------------------------
+    USER_IMPORT_BATCH_SIZE: int = 1000
+    USER_IMPORT_MAX_REPORTED_FAILURES: int = 1000
+
     # --------------------------------------------------
     # Human Verification
     # --------------------------------------------------
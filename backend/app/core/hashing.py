@@ -0,0 +1,233 @@
+import asyncio
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+from app.core.config import settings
+from app.core import security
+from app.core.timings import record_stage
+
+
+# --------------------------------------------------
+# Worker-side functions
+# --------------------------------------------------
+# These run inside the pool processes. They return the
+# monotonic start time so the caller can measure how long
+# the job sat in the queue (CLOCK_MONOTONIC is system-wide).
+
+def _hash_job(password: str) -> tuple[str, float, float]:
+    started = time.monotonic()
+    hashed = security.hash_password(password)
+    return hashed, started, time.monotonic() - started
+
+
+def _verify_job(password: str, hashed: str) -> tuple[bool, float, float]:
+    started = time.monotonic()
+    ok = security.verify_password(password, hashed)
+    return ok, started, time.monotonic() - started
+
+
+def _hash_many_job(passwords: list[str]) -> tuple[list[str], float, float]:
+    started = time.monotonic()
+    hashed = [security.hash_password(password) for password in passwords]
+    return hashed, started, time.monotonic() - started
+
+
+def _warmup_job() -> int:
+    # Imports passlib and builds the context ahead of the first job
+    security.get_pwd_context()
+    return os.getpid()
+
+
+# --------------------------------------------------
+# Metrics
+# --------------------------------------------------
+@dataclass
+class HashingStats:
+    submitted: int = 0
+    completed: int = 0
+    failed: int = 0
+    in_flight: int = 0
+    waiting: int = 0
+    queue_wait_seconds_total: float = 0.0
+    queue_wait_seconds_max: float = 0.0
+    run_seconds_total: float = 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        done = self.completed or 1
+        return {
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "queue_wait_seconds_total": self.queue_wait_seconds_total,
+            "queue_wait_seconds_max": self.queue_wait_seconds_max,
+            "queue_wait_seconds_avg": self.queue_wait_seconds_total / done,
+            "run_seconds_total": self.run_seconds_total,
+            "run_seconds_avg": self.run_seconds_total / done,
+        }
+
+
+# --------------------------------------------------
+# Hasher
+# --------------------------------------------------
+class PasswordHasher:
+    """
+    Runs bcrypt hash/verify on a process pool so the event loop
+    never blocks on password CPU work.
+
+    The pool is created on first use. At most ``max_in_flight``
+    jobs are submitted at once per API worker; the rest wait on
+    a semaphore, and that wait is included in the queue metrics.
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        max_in_flight: Optional[int] = None,
+    ) -> None:
+        self._max_workers = max_workers
+        self._max_in_flight = max_in_flight
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._semaphore_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stats = HashingStats()
+
+    # ---------------- configuration ----------------
+
+    @property
+    def max_workers(self) -> int:
+        workers = self._max_workers
+        if workers is None:
+            workers = settings.PASSWORD_HASH_WORKERS
+        return workers or os.cpu_count() or 1
+
+    @property
+    def max_in_flight(self) -> int:
+        if self._max_in_flight is not None:
+            return self._max_in_flight
+        return settings.PASSWORD_HASH_MAX_IN_FLIGHT
+
+    # ---------------- lifecycle ----------------
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    # "spawn" avoids forking a process that already
+                    # holds an event loop, sockets and threads.
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.max_workers,
+                        mp_context=multiprocessing.get_context("spawn"),
+                    )
+        return self._executor
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_in_flight)
+            self._semaphore_loop = loop
+        return self._semaphore
+
+    async def warm_up(self) -> None:
+        """
+        Start every worker process ahead of the first request.
+        """
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        await asyncio.gather(
+            *(
+                loop.run_in_executor(executor, _warmup_job)
+                for _ in range(self.max_workers)
+            )
+        )
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=not wait)
+
+    # ---------------- execution ----------------
+
+    async def _run(self, fn: Callable[..., tuple], *args: Any) -> Any:
+        stats = self._stats
+        enqueued = time.monotonic()
+
+        semaphore = self._get_semaphore()
+        stats.waiting += 1
+        try:
+            await semaphore.acquire()
+        finally:
+            stats.waiting -= 1
+
+        stats.submitted += 1
+        stats.in_flight += 1
+        try:
+            loop = asyncio.get_running_loop()
+            result, started, run_seconds = await loop.run_in_executor(
+                self._get_executor(), fn, *args
+            )
+        except BaseException:
+            stats.failed += 1
+            raise
+        finally:
+            stats.in_flight -= 1
+            semaphore.release()
+            # Wall time the request waited, queueing included
+            record_stage("hashing", time.monotonic() - enqueued)
+
+        wait = max(0.0, started - enqueued)
+        stats.completed += 1
+        stats.queue_wait_seconds_total += wait
+        stats.queue_wait_seconds_max = max(stats.queue_wait_seconds_max, wait)
+        stats.run_seconds_total += run_seconds
+        return result
+
+    async def hash(self, password: str) -> str:
+        return await self._run(_hash_job, password)
+
+    async def verify(self, password: str, hashed: str) -> bool:
+        return await self._run(_verify_job, password, hashed)
+
+    async def hash_many(self, passwords: list[str], chunk_size: int = 16) -> list[str]:
+        """
+        Hash a batch across all workers in chunks: one IPC round trip
+        per chunk rather than per password. Chunks stay small so
+        interactive hash/verify jobs interleave with them instead of
+        queueing behind one long batch.
+        """
+        chunks = [
+            passwords[i:i + chunk_size]
+            for i in range(0, len(passwords), chunk_size)
+        ]
+        results = await asyncio.gather(
+            *(self._run(_hash_many_job, chunk) for chunk in chunks)
+        )
+        return [hashed for chunk in results for hashed in chunk]
+
+    def stats(self) -> dict[str, Any]:
+        data = self._stats.as_dict()
+        data["max_workers"] = self.max_workers
+        data["max_in_flight"] = self.max_in_flight
+        return data
+
+
+password_hasher = PasswordHasher()
+
+
+# --------------------------------------------------
+# Async API
+# --------------------------------------------------
+async def hash_password_async(password: str) -> str:
+    return await password_hasher.hash(password)
+
+
+async def verify_password_async(password: str, hashed: str) -> bool:
+    return await password_hasher.verify(password, hashed)
@@ -0,0 +1,15 @@
+# --------------------------------------------------
+# Process state
+# --------------------------------------------------
+class Lifecycle:
+    """
+    Readiness of one worker: ``ready`` flips once startup warm-up is
+    done. In-flight requests at shutdown are uvicorn's job (it stops
+    accepting, then waits for them before lifespan shutdown runs).
+    """
+
+    def __init__(self) -> None:
+        self.ready = False
+
+
+lifecycle = Lifecycle()
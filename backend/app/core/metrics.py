@@ -0,0 +1,143 @@
+import asyncio
+import functools
+import time
+from typing import Any, Callable
+
+from fastapi.routing import APIRoute
+from prometheus_client import Counter, Histogram
+
+from app.core.timings import RequestTimings, request_timings
+
+
+# --------------------------------------------------
+# Instruments
+# --------------------------------------------------
+# Route labels are path templates ("/api/v1/auth/sessions/{session_id}"),
+# never raw paths, so label cardinality stays bounded.
+
+_LATENCY_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+_STAGE_BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25,
+    0.5, 1.0, 2.5,
+)
+
+REQUESTS = Counter(
+    "http_requests",
+    "HTTP requests by route and status code.",
+    ("method", "route", "status"),
+)
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Time from receiving a request to sending the end of its response.",
+    ("method", "route"),
+    buckets=_LATENCY_BUCKETS,
+)
+STAGE_DURATION = Histogram(
+    "http_request_stage_duration_seconds",
+    "Time a request spent in each stage (db, hashing, token, serialization).",
+    ("route", "stage"),
+    buckets=_STAGE_BUCKETS,
+)
+DB_QUERIES = Histogram(
+    "http_request_db_queries",
+    "Database statements executed per request.",
+    ("route",),
+    buckets=(0, 1, 2, 3, 4, 6, 8, 12, 20, 50),
+)
+
+UNMATCHED_ROUTE = "unmatched"
+
+
+# --------------------------------------------------
+# Serialization time
+# --------------------------------------------------
+class InstrumentedRoute(APIRoute):
+    """
+    Route class that labels the request with its path template and
+    measures response serialization: everything between the
+    endpoint returning and the Response being ready (response_model
+    validation, encoding, rendering).
+    """
+
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs: Any) -> None:
+        if asyncio.iscoroutinefunction(endpoint):
+            endpoint = _mark_endpoint_done(endpoint)
+        super().__init__(path, endpoint, **kwargs)
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+        route = self.path_format
+
+        async def timed_handler(request):
+            timings = request_timings.get()
+            if timings is not None:
+                timings.route = route
+            response = await handler(request)
+            if timings is not None and timings.endpoint_done:
+                timings.add("serialization", time.perf_counter() - timings.endpoint_done)
+            return response
+
+        return timed_handler
+
+
+def _mark_endpoint_done(endpoint: Callable[..., Any]) -> Callable[..., Any]:
+    # functools.wraps keeps the signature FastAPI builds the
+    # dependency graph from
+    @functools.wraps(endpoint)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        try:
+            return await endpoint(*args, **kwargs)
+        finally:
+            timings = request_timings.get()
+            if timings is not None:
+                timings.endpoint_done = time.perf_counter()
+
+    return wrapper
+
+
+# --------------------------------------------------
+# Middleware
+# --------------------------------------------------
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware (no BaseHTTPMiddleware task hop): one
+    context variable per request, stage times accumulated in a
+    plain dict, and the histograms observed once at the end.
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings = RequestTimings()
+        token = request_timings.set(timings)
+        status_code = 500
+        started = time.perf_counter()
+
+        async def send_wrapper(message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            request_timings.reset(token)
+            self._observe(scope["method"], status_code, elapsed, timings)
+
+    @staticmethod
+    def _observe(method: str, status_code: int, elapsed: float, timings: RequestTimings) -> None:
+        route = timings.route or UNMATCHED_ROUTE
+        REQUESTS.labels(method, route, str(status_code)).inc()
+        REQUEST_DURATION.labels(method, route).observe(elapsed)
+        DB_QUERIES.labels(route).observe(timings.db_queries)
+        for stage, seconds in timings.stages.items():
+            STAGE_DURATION.labels(route, stage).observe(seconds)
@@ -0,0 +1,262 @@
+import hashlib
+import logging
+import re
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from app.core.cache import LRUTTLCache
+from app.core.config import settings
+from app.core.redis import get_redis
+
+
+logger = logging.getLogger(__name__)
+
+
+# --------------------------------------------------
+# Rules
+# --------------------------------------------------
+_UNITS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+_RATE = re.compile(r"^\s*(\d+)\s*/\s*(?:(\d+)\s*s|(second|minute|hour|day))\s*$")
+
+
+@dataclass(frozen=True)
+class Rate:
+    limit: int
+    window_seconds: int
+
+    @classmethod
+    def parse(cls, value: str) -> "Rate":
+        """
+        "10/minute", "5/hour", "100/day" or "30/90s".
+        """
+        match = _RATE.match(value)
+        if not match or int(match[1]) < 1:
+            raise ValueError(f"invalid rate limit: {value!r}")
+        window = int(match[2]) if match[2] else _UNITS[match[3]]
+        return cls(limit=int(match[1]), window_seconds=window)
+
+    @property
+    def per_second(self) -> float:
+        return self.limit / self.window_seconds
+
+
+def parse_rules(raw: dict[str, str]) -> dict[tuple[str, str], Rate]:
+    """
+    ``{"login:ip": "20/minute"}`` -> ``{("login", "ip"): Rate(20, 60)}``
+    """
+    rules = {}
+    for name, value in raw.items():
+        route, _, scope = name.partition(":")
+        if not scope:
+            raise ValueError(f"rate limit name must be '<route>:<scope>': {name!r}")
+        rules[(route, scope)] = Rate.parse(value)
+    return rules
+
+
+# --------------------------------------------------
+# Shared sliding window (Redis)
+# --------------------------------------------------
+# One sorted set per key holds the timestamps (ms, Redis clock) of
+# the hits inside the window. All keys of a request are checked
+# first and only recorded if every one of them allows the hit, so
+# a request blocked by its IP does not burn its email budget.
+# Returns {0, 0} when allowed, else {1-based index of the key that
+# blocks longest, ms until it frees a slot}.
+_SLIDING_WINDOW = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local blocked, wait = 0, 0
+for i, key in ipairs(KEYS) do
+    local limit = tonumber(ARGV[2 * i])
+    local window = tonumber(ARGV[2 * i + 1])
+    redis.call('ZREMRANGEBYSCORE', key, '-inf', now - window)
+    if redis.call('ZCARD', key) >= limit then
+        local oldest = redis.call('ZRANGE', key, 0, 0, 'WITHSCORES')
+        local key_wait = tonumber(oldest[2]) + window - now
+        if key_wait > wait then
+            blocked, wait = i, key_wait
+        end
+    end
+end
+if blocked > 0 then
+    return {blocked, wait}
+end
+for i, key in ipairs(KEYS) do
+    redis.call('ZADD', key, now, ARGV[1])
+    redis.call('PEXPIRE', key, tonumber(ARGV[2 * i + 1]))
+end
+return {0, 0}
+"""
+
+
+@dataclass
+class RateLimitResult:
+    allowed: bool
+    retry_after: float = 0.0
+    # Which "<route>:<scope>" rule rejected the request
+    rule: Optional[str] = None
+
+
+# --------------------------------------------------
+# Limiter
+# --------------------------------------------------
+class RateLimiter:
+    """
+    Sliding-window limits in Redis behind an in-process pre-filter.
+
+    Locally, every key has a token bucket with the rule's capacity
+    and refill rate. One process can never legitimately exceed the
+    shared limit on its own, so an empty bucket is a safe reject
+    without a Redis call. A key Redis has rejected is also
+    remembered locally until its window frees a slot, so repeated
+    attempts from a blocked client stay in-process.
+
+    Redis errors fail open (the local buckets still apply) and
+    skip Redis for ``redis_backoff_seconds``.
+    """
+
+    def __init__(
+        self,
+        rules: dict[tuple[str, str], Rate],
+        *,
+        enabled: bool = True,
+        max_local_keys: int = 100_000,
+        redis_backoff_seconds: float = 5.0,
+    ) -> None:
+        self.rules = rules
+        self.enabled = enabled
+        self.redis_backoff_seconds = redis_backoff_seconds
+
+        longest = max((rate.window_seconds for rate in rules.values()), default=1)
+        # key -> [tokens, last refill (monotonic), blocked until (monotonic)]
+        self.local = LRUTTLCache(max_local_keys, longest)
+
+        self._script = None
+        self._redis_disabled_until = 0.0
+
+        self.allowed = 0
+        self.local_rejects = 0
+        self.redis_rejects = 0
+        self.redis_errors = 0
+
+    @staticmethod
+    def _key(route: str, scope: str, value: str) -> str:
+        # Emails and phone numbers are not stored in Redis as-is
+        digest = hashlib.blake2b(value.strip().lower().encode(), digest_size=12)
+        return f"rl:{route}:{scope}:{digest.hexdigest()}"
+
+    # ---------------- local pre-filter ----------------
+    def _local_check(
+        self,
+        keys: list[tuple[str, str, Rate]],
+        now: float,
+    ) -> Optional[RateLimitResult]:
+        states = []
+        for key, rule, rate in keys:
+            state = self.local.get(key)
+            if state is None:
+                state = [float(rate.limit), now, 0.0]
+            else:
+                state[0] = min(
+                    float(rate.limit),
+                    state[0] + (now - state[1]) * rate.per_second,
+                )
+                state[1] = now
+
+            if state[2] > now:
+                return RateLimitResult(False, state[2] - now, rule)
+            if state[0] < 1.0:
+                return RateLimitResult(False, (1.0 - state[0]) / rate.per_second, rule)
+            states.append(state)
+
+        for (key, _rule, rate), state in zip(keys, states):
+            state[0] -= 1.0
+            self.local.set(key, state, ttl=rate.window_seconds)
+        return None
+
+    def _block_locally(self, key: str, rate: Rate, until: float) -> None:
+        state = self.local.get(key) or [0.0, until, 0.0]
+        state[2] = until
+        self.local.set(key, state, ttl=rate.window_seconds)
+
+    # ---------------- shared window ----------------
+    async def _redis_check(
+        self,
+        keys: list[tuple[str, str, Rate]],
+    ) -> Optional[tuple[int, float]]:
+        if time.monotonic() < self._redis_disabled_until:
+            return None
+
+        client = get_redis()
+        if self._script is None or self._script.registered_client is not client:
+            self._script = client.register_script(_SLIDING_WINDOW)
+
+        args: list[Any] = [uuid.uuid4().hex]
+        for _key, _rule, rate in keys:
+            args.extend((rate.limit, rate.window_seconds * 1000))
+
+        try:
+            index, wait_ms = await self._script(
+                keys=[key for key, _rule, _rate in keys],
+                args=args,
+            )
+        except Exception as exc:  # noqa: BLE001 - fail open
+            self.redis_errors += 1
+            self._redis_disabled_until = time.monotonic() + self.redis_backoff_seconds
+            logger.warning("Rate limiter: Redis unavailable (%s)", exc)
+            return None
+
+        if not int(index):
+            return None
+        return int(index) - 1, int(wait_ms) / 1000
+
+    async def hit(self, route: str, **identifiers: Optional[str]) -> RateLimitResult:
+        """
+        Count one attempt at ``route`` for each identifier that has a
+        rule (e.g. ``ip=..., email=...``); None values are ignored.
+        """
+        if not self.enabled:
+            return RateLimitResult(True)
+
+        keys = [
+            (self._key(route, scope, value), f"{route}:{scope}", self.rules[(route, scope)])
+            for scope, value in identifiers.items()
+            if value and (route, scope) in self.rules
+        ]
+        if not keys:
+            return RateLimitResult(True)
+
+        rejected = self._local_check(keys, time.monotonic())
+        if rejected is not None:
+            self.local_rejects += 1
+            return rejected
+
+        blocked = await self._redis_check(keys)
+        if blocked is not None:
+            index, retry_after = blocked
+            key, rule, rate = keys[index]
+            self._block_locally(key, rate, time.monotonic() + retry_after)
+            self.redis_rejects += 1
+            return RateLimitResult(False, retry_after, rule)
+
+        self.allowed += 1
+        return RateLimitResult(True)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "allowed": self.allowed,
+            "local_rejects": self.local_rejects,
+            "redis_rejects": self.redis_rejects,
+            "redis_errors": self.redis_errors,
+            "local": self.local.stats(),
+        }
+
+
+rate_limiter = RateLimiter(
+    parse_rules(settings.RATE_LIMITS),
+    enabled=settings.RATE_LIMIT_ENABLED,
+    max_local_keys=settings.RATE_LIMIT_LOCAL_MAX_KEYS,
+)
@@ -0,0 +1,49 @@
+from typing import Optional
+
+import redis
+import redis.asyncio as aioredis
+
+from app.core.config import settings
+
+
+# --------------------------------------------------
+# Shared async client (one connection pool per process)
+# --------------------------------------------------
+_client: Optional[aioredis.Redis] = None
+
+
+def get_redis() -> aioredis.Redis:
+    global _client
+    if _client is None:
+        _client = aioredis.from_url(
+            settings.REDIS_URL,
+            decode_responses=True,
+            socket_timeout=settings.REDIS_SOCKET_TIMEOUT_SECONDS,
+            socket_connect_timeout=settings.REDIS_SOCKET_TIMEOUT_SECONDS,
+            health_check_interval=30,
+        )
+    return _client
+
+
+async def close_redis() -> None:
+    global _client
+    client, _client = _client, None
+    if client is not None:
+        await client.aclose()
+
+
+# --------------------------------------------------
+# Shared sync client (Celery workers, CLI scripts)
+# --------------------------------------------------
+_sync_client: Optional[redis.Redis] = None
+
+
+def get_sync_redis() -> redis.Redis:
+    global _sync_client
+    if _sync_client is None:
+        _sync_client = redis.Redis.from_url(
+            settings.REDIS_URL,
+            decode_responses=True,
+            health_check_interval=30,
+        )
+    return _sync_client
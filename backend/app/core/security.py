@@ -1,43 +1,111 @@
+import hashlib
+import threading
+import time
 from datetime import datetime, timedelta
-from typing import Any, Optional
-
-from jose import jwt, JWTError
-from passlib.context import CryptContext
-from fastapi.security import OAuth2PasswordBearer
+from typing import TYPE_CHECKING, Any, Optional
 
+from app.core.cache import LRUTTLCache
 from app.core.config import settings
+from app.core.timings import timed_stage
+
+# passlib, python-jose and fastapi are imported on first use: Celery
+# workers and the hash pool import this module without needing them
+# all (see benchmarks/import_time.py)
+if TYPE_CHECKING:
+    from jose.backends.base import Key
+    from passlib.context import CryptContext
+
 
 # --------------------------------------------------
 # Password hashing
 # --------------------------------------------------
-pwd_context = CryptContext(
-    schemes=["bcrypt"],
-    deprecated="auto",
-)
+def password_policy(
+    schemes: Optional[list[str]] = None,
+    **overrides: Any,
+) -> dict[str, Any]:
+    """
+    CryptContext keyword arguments for the configured policy.
+
+    Minimum costs equal the targets, so any hash made with weaker
+    parameters (or a non-default scheme) reports ``needs_update``.
+    """
+    schemes = schemes or settings.PASSWORD_HASH_SCHEMES
+    policy: dict[str, Any] = {
+        "schemes": schemes,
+        "deprecated": "auto",
+        "bcrypt__rounds": settings.PASSWORD_BCRYPT_ROUNDS,
+        "bcrypt__min_rounds": settings.PASSWORD_BCRYPT_ROUNDS,
+    }
+    if "argon2" in schemes:
+        policy.update(
+            argon2__time_cost=settings.PASSWORD_ARGON2_TIME_COST,
+            argon2__memory_cost=settings.PASSWORD_ARGON2_MEMORY_COST_KIB,
+            argon2__parallelism=settings.PASSWORD_ARGON2_PARALLELISM,
+        )
+    policy.update(overrides)
+    return policy
+
+
+_pwd_context: Optional["CryptContext"] = None
+_pwd_context_lock = threading.Lock()
+
+
+def get_pwd_context() -> "CryptContext":
+    global _pwd_context
+    if _pwd_context is None:
+        with _pwd_context_lock:
+            if _pwd_context is None:
+                from passlib.context import CryptContext
+
+                _pwd_context = CryptContext(**password_policy())
+    return _pwd_context
 
 
 def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
+    return get_pwd_context().hash(password)
 
 
 def verify_password(password: str, hashed: str) -> bool:
-    return pwd_context.verify(password, hashed)
+    return get_pwd_context().verify(password, hashed)
+
+
+def password_needs_update(hashed: str) -> bool:
+    """
+    Cheap (parses the hash, no hashing): True when ``hashed`` was
+    made by a deprecated scheme or below the configured cost.
+    """
+    return get_pwd_context().needs_update(hashed)
 
 
 # --------------------------------------------------
 # OAuth2 / JWT
 # --------------------------------------------------
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
-
 ALGORITHM = "HS256"
 
+_signing_key: Optional["Key"] = None
+
+
+def prepare_keys() -> "Key":
+    """
+    Build the HMAC key object once instead of on every encode and
+    decode. Called at startup; also done lazily on first use.
+    """
+    global _signing_key
+    if _signing_key is None:
+        from jose import jwk
+
+        _signing_key = jwk.construct(settings.SECRET_KEY, ALGORITHM)
+    return _signing_key
+
 
 def create_access_token(
     subject: str,
-    expires_minutes: int = 60,
+    expires_minutes: Optional[int] = None,
     extra_claims: Optional[dict[str, Any]] = None,
 ) -> str:
-    expire = datetime.utcnow() + timedelta(minutes=expires_minutes)
+    expire = datetime.utcnow() + timedelta(
+        minutes=expires_minutes or settings.ACCESS_TOKEN_EXPIRE_MINUTES
+    )
 
     payload: dict[str, Any] = {
         "sub": subject,
@@ -49,19 +117,71 @@ def create_access_token(
     if extra_claims:
         payload.update(extra_claims)
 
-    return jwt.encode(
-        payload,
-        settings.SECRET_KEY,
-        algorithm=ALGORITHM,
-    )
+    from jose import jwt
+
+    with timed_stage("token"):
+        return jwt.encode(
+            payload,
+            prepare_keys(),
+            algorithm=ALGORITHM,
+        )
+
+
+# --------------------------------------------------
+# Verified-claims cache
+# --------------------------------------------------
+# Clients resend the same token for its whole life, so verified
+# claims are kept per token digest. An entry never outlives the
+# token's ``exp``, so an expired token is always re-verified (and
+# rejected) by jose.
+verified_claims_cache = LRUTTLCache(
+    settings.TOKEN_CACHE_MAX_ENTRIES if settings.TOKEN_CACHE_ENABLED else 0,
+    settings.TOKEN_CACHE_TTL_SECONDS,
+)
+
+
+def _token_digest(token: str) -> bytes:
+    return hashlib.blake2b(token.encode(), digest_size=20).digest()
 
 
 def decode_access_token(token: str) -> dict[str, Any]:
+    with timed_stage("token"):
+        return _decode_access_token(token)
+
+
+def _decode_access_token(token: str) -> dict[str, Any]:
+    digest = _token_digest(token)
+    claims = verified_claims_cache.get(digest)
+    if claims is not None:
+        return dict(claims)
+
+    from jose import JWTError, jwt
+
     try:
-        return jwt.decode(
+        claims = jwt.decode(
             token,
-            settings.SECRET_KEY,
+            prepare_keys(),
             algorithms=[ALGORITHM],
         )
     except JWTError as exc:
         raise ValueError("Invalid or expired token") from exc
+
+    exp = claims.get("exp")
+    if isinstance(exp, (int, float)):
+        verified_claims_cache.set(digest, claims, ttl=exp - time.time())
+    return dict(claims)
+
+
+# --------------------------------------------------
+# Lazy module attributes
+# --------------------------------------------------
+def __getattr__(name: str) -> Any:
+    if name == "oauth2_scheme":
+        from fastapi.security import OAuth2PasswordBearer
+
+        scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
+        globals()[name] = scheme
+        return scheme
+    if name == "pwd_context":
+        return get_pwd_context()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
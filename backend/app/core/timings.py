@@ -0,0 +1,90 @@
+"""
+Per-request stage timings, kept free of web and metrics imports so
+security, hashing and the engines can record into them from any
+process (API, Celery, hash pool) at no import cost.
+"""
+
+import time
+from contextvars import ContextVar
+from typing import Any, Optional
+
+from sqlalchemy import Engine, event
+
+
+# --------------------------------------------------
+# Per-request timings
+# --------------------------------------------------
+class RequestTimings:
+    __slots__ = ("route", "stages", "db_queries", "endpoint_done")
+
+    def __init__(self) -> None:
+        self.route: Optional[str] = None
+        self.stages: dict[str, float] = {}
+        self.db_queries = 0
+        self.endpoint_done = 0.0
+
+    def add(self, stage: str, seconds: float) -> None:
+        self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+
+
+# Set by MetricsMiddleware for the duration of a request. Tasks
+# spawned by the request copy the context and so share the object.
+request_timings: ContextVar[Optional[RequestTimings]] = ContextVar(
+    "request_timings", default=None
+)
+
+
+def current_timings() -> Optional[RequestTimings]:
+    return request_timings.get()
+
+
+def record_stage(stage: str, seconds: float) -> None:
+    """
+    Add ``seconds`` to ``stage`` of the current request; a no-op
+    outside a request (Celery, CLI, startup).
+    """
+    timings = request_timings.get()
+    if timings is not None:
+        timings.add(stage, seconds)
+
+
+class timed_stage:
+    """
+    ``with timed_stage("token"): ...``
+    """
+
+    __slots__ = ("stage", "started")
+
+    def __init__(self, stage: str) -> None:
+        self.stage = stage
+
+    def __enter__(self) -> "timed_stage":
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        record_stage(self.stage, time.perf_counter() - self.started)
+
+
+# --------------------------------------------------
+# Database time
+# --------------------------------------------------
+def install_query_timing(engine: Engine) -> None:
+    """
+    Count statements and their time against the current request.
+    For an AsyncEngine pass ``engine.sync_engine``; the events run
+    in the request's context (SQLAlchemy's greenlets inherit it).
+    """
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany) -> None:
+        if request_timings.get() is not None:
+            conn.info["metrics_query_started"] = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany) -> None:
+        started = conn.info.pop("metrics_query_started", None)
+        timings = request_timings.get()
+        if started is not None and timings is not None:
+            timings.db_queries += 1
+            timings.add("db", time.perf_counter() - started)
@@ -0,0 +1,96 @@
+import base64
+import json
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Optional
+
+from sqlalchemy import select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.audit_log import AuditLog
+
+
+# -----------------------------------
+# Keyset cursor
+# -----------------------------------
+# Pages are ordered newest first by (created_at, id); the cursor is
+# the sort key of the last row returned. Every filter has an index
+# ending in that key, so any page is one index range scan.
+def encode_cursor(created_at: datetime, id: int) -> str:
+    raw = json.dumps([created_at.isoformat(), id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """
+    Raises ValueError on anything that is not a cursor we issued.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), int(id)
+    except (TypeError, ValueError) as exc:
+        raise ValueError("Invalid cursor") from exc
+
+
+@dataclass
+class AuditLogFilter:
+    actor_id: Optional[uuid.UUID] = None
+    resource_type: Optional[str] = None
+    resource_id: Optional[str] = None
+    action_type: Optional[str] = None
+    since: Optional[datetime] = None
+    until: Optional[datetime] = None
+    metadata_contains: Optional[dict[str, Any]] = None
+
+
+# -----------------------------------
+# Queries
+# -----------------------------------
+async def list_audit_logs(
+    db: AsyncSession,
+    filters: AuditLogFilter,
+    *,
+    cursor: Optional[str] = None,
+    limit: int = 50,
+) -> tuple[list[AuditLog], Optional[str]]:
+    """
+    One page of audit logs, newest first, and the cursor of the
+    next page (None when this is the last one).
+    """
+    stmt = select(AuditLog)
+
+    if filters.actor_id is not None:
+        stmt = stmt.where(AuditLog.actor_id == filters.actor_id)
+    if filters.resource_type is not None:
+        stmt = stmt.where(AuditLog.resource_type == filters.resource_type)
+    if filters.resource_id is not None:
+        stmt = stmt.where(AuditLog.resource_id == filters.resource_id)
+    if filters.action_type is not None:
+        stmt = stmt.where(AuditLog.action_type == filters.action_type)
+    # Time bounds also prune partitions
+    if filters.since is not None:
+        stmt = stmt.where(AuditLog.created_at >= filters.since)
+    if filters.until is not None:
+        stmt = stmt.where(AuditLog.created_at < filters.until)
+    if filters.metadata_contains:
+        # @> with jsonb_path_ops GIN
+        stmt = stmt.where(AuditLog.metadata_.contains(filters.metadata_contains))
+
+    if cursor is not None:
+        created_at, id = decode_cursor(cursor)
+        stmt = stmt.where(tuple_(AuditLog.created_at, AuditLog.id) < (created_at, id))
+
+    stmt = stmt.order_by(
+        AuditLog.created_at.desc(),
+        AuditLog.id.desc(),
+    ).limit(limit + 1)
+
+    rows = list((await db.execute(stmt)).scalars())
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(last.created_at, last.id)
@@ -0,0 +1,99 @@
+import uuid
+from typing import Optional
+
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.referral_stats import ReferralStats
+from app.models.user import User
+
+
+# Referral chains are acyclic (a referrer always signs up first);
+# the bound only guards the recursion against bad data.
+_MAX_DEPTH = 1000
+
+
+# -----------------------------------
+# Incremental maintenance
+# -----------------------------------
+# For each new user with a referrer: walk up the ancestor chain once
+# (O(depth)), give the user its own row with its depth, and add 1 to
+# the descendant count of every ancestor (and to the direct count of
+# the immediate referrer). Users without a referrer need no row.
+_APPLY_SIGNUPS = text(
+    """
+    WITH RECURSIVE chain(user_id, ancestor_id, distance) AS (
+        SELECT id, referred_by_id, 1
+        FROM users
+        WHERE id = ANY(:user_ids) AND referred_by_id IS NOT NULL
+        UNION ALL
+        SELECT c.user_id, p.referred_by_id, c.distance + 1
+        FROM chain c
+        JOIN users p ON p.id = c.ancestor_id
+        WHERE p.referred_by_id IS NOT NULL AND c.distance < :max_depth
+    ),
+    own AS (
+        INSERT INTO referral_stats (user_id, direct_count, descendant_count, depth)
+        SELECT user_id, 0, 0, max(distance)
+        FROM chain
+        GROUP BY user_id
+        ON CONFLICT (user_id) DO NOTHING
+    )
+    INSERT INTO referral_stats (user_id, direct_count, descendant_count, depth)
+    SELECT ancestor_id, count(*) FILTER (WHERE distance = 1), count(*), 0
+    FROM chain
+    GROUP BY ancestor_id
+    ON CONFLICT (user_id) DO UPDATE SET
+        direct_count = referral_stats.direct_count + EXCLUDED.direct_count,
+        descendant_count = referral_stats.descendant_count + EXCLUDED.descendant_count,
+        updated_at = now()
+    """
+)
+
+
+async def apply_referral_signups(
+    db: AsyncSession,
+    user_ids: list[uuid.UUID],
+) -> None:
+    """
+    Fold newly inserted users into referral_stats. Must run exactly
+    once per user, right after the insert. Does not commit.
+    """
+    if not user_ids:
+        return
+    await db.execute(
+        _APPLY_SIGNUPS,
+        {"user_ids": list(user_ids), "max_depth": _MAX_DEPTH},
+    )
+
+
+# -----------------------------------
+# Reads
+# -----------------------------------
+async def get_referral_stats(
+    db: AsyncSession,
+    user_id: uuid.UUID,
+) -> Optional[ReferralStats]:
+    return await db.get(ReferralStats, user_id)
+
+
+async def get_referral_leaderboard(
+    db: AsyncSession,
+    limit: int = 10,
+) -> list[tuple[ReferralStats, str]]:
+    """
+    Top referrers with their first name. Reads the first ``limit``
+    entries of ix_referral_stats_leaderboard.
+    """
+    result = await db.execute(
+        select(ReferralStats, User.first_name)
+        .join(User, User.id == ReferralStats.user_id)
+        .where(ReferralStats.direct_count > 0)
+        .order_by(
+            ReferralStats.direct_count.desc(),
+            ReferralStats.descendant_count.desc(),
+            ReferralStats.user_id,
+        )
+        .limit(limit)
+    )
+    return [(stats, first_name) for stats, first_name in result.all()]
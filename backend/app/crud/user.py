@@ -1,25 +1,150 @@
+import enum
+import uuid
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import TYPE_CHECKING, Any, Callable, Optional
 
-from sqlalchemy import select
+from sqlalchemy import func, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import aliased, joinedload, load_only
+from sqlalchemy.orm.attributes import set_committed_value
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.user import User, TierEnum
-from app.schemas.user import UserCreate
+from app.core.cache import TwoTierCache
 from app.core.config import settings
-from app.core.security import hash_password
+from app.core.hashing import hash_password_async
+
+if TYPE_CHECKING:
+    # pydantic/email-validator are not needed by Celery workers
+    from app.schemas.user import UserCreate
+
+
+# -----------------------------------
+# Principal cache
+# -----------------------------------
+# Keyed by the JWT subject (email). The password hash never
+# leaves Postgres, so it is excluded from the cached document.
+
+PRINCIPAL_COLUMNS: tuple[str, ...] = tuple(
+    column.key
+    for column in User.__table__.columns
+    if column.key != "hashed_password"
+)
+
+
+def _column_decoder(python_type: type) -> Callable[[Any], Any]:
+    if python_type is uuid.UUID:
+        return uuid.UUID
+    if python_type is datetime:
+        return datetime.fromisoformat
+    if issubclass(python_type, enum.Enum):
+        return python_type
+    return lambda value: value
+
+
+_PRINCIPAL_DECODERS: dict[str, Callable[[Any], Any]] = {
+    column.key: _column_decoder(column.type.python_type)
+    for column in User.__table__.columns
+    if column.key in PRINCIPAL_COLUMNS
+}
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, enum.Enum):
+        return value.value
+    return value
+
+
+def user_to_principal(user: User) -> dict[str, Any]:
+    return {
+        key: _encode_value(getattr(user, key))
+        for key in PRINCIPAL_COLUMNS
+    }
+
+
+def user_from_principal(data: dict[str, Any]) -> User:
+    """
+    Rebuild a *transient* User from a cached principal.
+
+    The instance is not attached to any session: reload it
+    before passing it to the mutations below.
+    """
+    values = {
+        key: None if data.get(key) is None else decode(data[key])
+        for key, decode in _PRINCIPAL_DECODERS.items()
+    }
+    return User(**values)
+
+
+principal_cache = TwoTierCache(
+    "principal",
+    enabled=settings.PRINCIPAL_CACHE_ENABLED,
+    max_entries=settings.PRINCIPAL_CACHE_MAX_ENTRIES,
+    local_ttl_seconds=settings.PRINCIPAL_CACHE_LOCAL_TTL_SECONDS,
+    redis_ttl_seconds=settings.PRINCIPAL_CACHE_REDIS_TTL_SECONDS,
+)
 
 
 # -----------------------------------
 # Queries
 # -----------------------------------
 
+class UserLoad(str, enum.Enum):
+    """
+    Loading profiles for the user queries below.
+
+    AUTH           credentials and status only (login, existence checks)
+    PRINCIPAL      every column except the password hash (token auth)
+    DEFAULT        every column, referrer not loaded
+    WITH_REFERRER  every column plus the referrer in the same query
+    """
+
+    AUTH = "auth"
+    PRINCIPAL = "principal"
+    DEFAULT = "default"
+    WITH_REFERRER = "with_referrer"
+
+
+_AUTH_COLUMNS = (
+    User.id,
+    User.email,
+    User.hashed_password,
+    User.is_active,
+)
+
+_LOAD_OPTIONS: dict[UserLoad, tuple] = {
+    UserLoad.AUTH: (
+        load_only(*_AUTH_COLUMNS, raiseload=True),
+    ),
+    UserLoad.PRINCIPAL: (
+        load_only(
+            *(getattr(User, key) for key in PRINCIPAL_COLUMNS),
+            raiseload=True,
+        ),
+    ),
+    UserLoad.DEFAULT: (),
+    UserLoad.WITH_REFERRER: (
+        joinedload(User.referrer),
+    ),
+}
+
+
+def _select_user(load: UserLoad):
+    return select(User).options(*_LOAD_OPTIONS[load])
+
+
 async def get_user_by_id(
     db: AsyncSession,
-    user_id: int,
+    user_id: uuid.UUID,
+    *,
+    load: UserLoad = UserLoad.DEFAULT,
 ) -> Optional[User]:
     result = await db.execute(
-        select(User).where(User.id == user_id)
+        _select_user(load).where(User.id == user_id)
     )
     return result.scalar_one_or_none()
 
@@ -27,9 +152,11 @@ async def get_user_by_id(
 async def get_user_by_email(
     db: AsyncSession,
     email: str,
+    *,
+    load: UserLoad = UserLoad.DEFAULT,
 ) -> Optional[User]:
     result = await db.execute(
-        select(User).where(User.email == email)
+        _select_user(load).where(User.email == email)
     )
     return result.scalar_one_or_none()
 
@@ -37,51 +164,241 @@ async def get_user_by_email(
 async def get_user_by_phone(
     db: AsyncSession,
     phone_number: str,
+    *,
+    load: UserLoad = UserLoad.DEFAULT,
 ) -> Optional[User]:
     result = await db.execute(
-        select(User).where(User.phone_number == phone_number)
+        _select_user(load).where(User.phone_number == phone_number)
     )
     return result.scalar_one_or_none()
 
 
+_PRINCIPAL_ROW = select(*(User.__table__.c[key] for key in PRINCIPAL_COLUMNS))
+
+
+def principal_lookup(email: str):
+    """
+    The principal row select (also run at startup to prime the
+    statement caches).
+    """
+    return _PRINCIPAL_ROW.where(User.email == email)
+
+
+async def get_principal_data(
+    db: AsyncSession,
+    email: str,
+) -> Optional[dict[str, Any]]:
+    """
+    The encoded principal (JSON-ready values, as cached).
+
+    Served from the cache, else from a plain column select: no ORM
+    instance is built on either path.
+    """
+    cached = await principal_cache.get(email)
+    if cached is not None:
+        return cached
+
+    result = await db.execute(principal_lookup(email))
+    row = result.first()
+    if row is None:
+        return None
+
+    data = {key: _encode_value(value) for key, value in row._mapping.items()}
+    await principal_cache.set(email, data)
+    return data
+
+
+async def get_user_principal(
+    db: AsyncSession,
+    email: str,
+) -> Optional[User]:
+    data = await get_principal_data(db, email)
+    return None if data is None else user_from_principal(data)
+
+
 # -----------------------------------
 # Create user
 # -----------------------------------
 
+def new_user_values(
+    payload: "UserCreate",
+    *,
+    hashed_password: str,
+    referral_code: Optional[str] = None,
+    referred_by_id: Optional[uuid.UUID] = None,
+    now: Optional[datetime] = None,
+) -> dict[str, Any]:
+    """
+    Column values for a new signup, shared by create_user and
+    the bulk import path.
+    """
+    now = now or datetime.utcnow()
+
+    return {
+        "email": payload.email,
+        "first_name": payload.first_name,
+        "last_name": payload.last_name,
+        "country_code": payload.country_code,
+        "phone_number": payload.phone_number,
+        "hashed_password": hashed_password,
+        "tier": payload.tier or TierEnum.sungura,
+        "referral_code": referral_code,
+        "referred_by_id": referred_by_id,
+        "accepts_notifications": payload.accepts_notifications,
+        "accepted_terms": payload.accepted_terms,
+        "trial_starts_at": now,
+        "trial_expires_at": now + timedelta(days=settings.TRIAL_PERIOD_DAYS),
+        "is_active": True,
+        "is_email_verified": False,
+    }
+
+
 async def create_user(
     db: AsyncSession,
-    payload: UserCreate,
+    payload: "UserCreate",
     *,
     hashed_password: str,
-    referral_code: Optional[str] = None,
-    referred_by_id: Optional[int] = None,
-) -> User:
-    now = datetime.utcnow()
-
-    user = User(
-        email=payload.email,
-        first_name=payload.first_name,
-        last_name=payload.last_name,
-        country_code=payload.country_code,
-        phone_number=payload.phone_number,
+    referral_code: str,
+    commit: bool = True,
+) -> Optional[User]:
+    """
+    Insert a signup in a single statement.
+
+    ``INSERT ... ON CONFLICT DO NOTHING RETURNING`` both detects a
+    duplicate email/phone (no row comes back) and returns the new
+    row, so there is no pre-check SELECT and no refresh. The
+    referrer is resolved from ``payload.referral_code`` by a
+    subquery inside the same statement.
+
+    Returns None on conflict. Commits unless ``commit`` is False
+    (the caller then has more to write in the same transaction).
+    """
+    values = new_user_values(
+        payload,
         hashed_password=hashed_password,
-        tier=payload.tier or TierEnum.sungura,
         referral_code=referral_code,
-        referred_by_id=referred_by_id,
-        accepts_notifications=payload.accepts_notifications,
-        accepted_terms=payload.accepted_terms,
-        trial_starts_at=now,
-        trial_expires_at=now + timedelta(days=settings.TRIAL_PERIOD_DAYS),
-        is_active=True,
-        is_email_verified=False,
     )
+    values["id"] = uuid.uuid4()
+    values["role"] = "client"
 
-    db.add(user)
-    await db.commit()
-    await db.refresh(user)
+    if payload.referral_code:
+        referrer = aliased(User)
+        values["referred_by_id"] = (
+            select(referrer.id)
+            .where(referrer.referral_code == payload.referral_code)
+            .scalar_subquery()
+        )
+
+    result = await db.scalars(
+        pg_insert(User)
+        .values(**values)
+        .on_conflict_do_nothing()
+        .returning(User),
+        execution_options={"populate_existing": True},
+    )
+    user = result.one_or_none()
+    if commit:
+        await db.commit()
     return user
 
 
+async def find_signup_conflict(
+    db: AsyncSession,
+    *,
+    email: str,
+    phone_number: str,
+) -> Optional[str]:
+    """
+    Name the unique field ("email" or "phone_number") that made
+    create_user return None. Only runs on the conflict path.
+    """
+    result = await db.execute(
+        select(User.email, User.phone_number)
+        .where((User.email == email) | (User.phone_number == phone_number))
+        .limit(1)
+    )
+    row = result.first()
+    if row is None:
+        return None
+    return "email" if row.email == email else "phone_number"
+
+
+async def find_import_conflicts(
+    db: AsyncSession,
+    rows: list[dict[str, Any]],
+) -> dict[str, str]:
+    """
+    Batch counterpart of find_signup_conflict: map each email in
+    ``rows`` to the unique field ("email" or "phone_number") an
+    existing user already holds. Emails absent from the result
+    conflicted on something else (a referral code).
+    """
+    if not rows:
+        return {}
+
+    emails = {row["email"] for row in rows}
+    phones = {row["phone_number"] for row in rows}
+    result = await db.execute(
+        select(User.email, User.phone_number).where(
+            User.email.in_(emails) | User.phone_number.in_(phones)
+        )
+    )
+    taken_emails, taken_phones = set(), set()
+    for row in result:
+        taken_emails.add(row.email)
+        taken_phones.add(row.phone_number)
+
+    conflicts = {}
+    for row in rows:
+        if row["email"] in taken_emails:
+            conflicts[row["email"]] = "email"
+        elif row["phone_number"] in taken_phones:
+            conflicts[row["email"]] = "phone_number"
+    return conflicts
+
+
+async def bulk_insert_users(
+    db: AsyncSession,
+    rows: list[dict[str, Any]],
+) -> set[str]:
+    """
+    Insert many users in one multi-row INSERT.
+
+    Rows that hit a unique constraint (email, phone number or
+    referral code) are skipped rather than aborting the batch.
+    Returns the emails that were actually inserted. Does not
+    commit.
+    """
+    if not rows:
+        return set()
+
+    # Every dict in a multi-VALUES insert must carry the same keys
+    for row in rows:
+        row.setdefault("id", uuid.uuid4())
+        row.setdefault("role", "client")
+
+    result = await db.execute(
+        pg_insert(User)
+        .values(rows)
+        .on_conflict_do_nothing()
+        .returning(User.email)
+    )
+    return set(result.scalars())
+
+
+async def get_user_ids_by_referral_codes(
+    db: AsyncSession,
+    codes: set[str],
+) -> dict[str, uuid.UUID]:
+    if not codes:
+        return {}
+
+    result = await db.execute(
+        select(User.referral_code, User.id).where(User.referral_code.in_(codes))
+    )
+    return {code: user_id for code, user_id in result.all()}
+
+
 # -----------------------------------
 # Mutations
 # -----------------------------------
@@ -90,9 +407,21 @@ async def set_email_verified(
     db: AsyncSession,
     user: User,
 ) -> User:
-    user.is_email_verified = True
+    """
+    Flag the user as verified with a single UPDATE by id.
+
+    Works for session-bound users and for transient principals
+    rebuilt from the cache alike.
+    """
+    await db.execute(
+        update(User)
+        .where(User.id == user.id)
+        .values(is_email_verified=True)
+        .execution_options(synchronize_session=False)
+    )
     await db.commit()
-    await db.refresh(user)
+    set_committed_value(user, "is_email_verified", True)
+    await principal_cache.invalidate(user.email)
     return user
 
 
@@ -101,18 +430,45 @@ async def set_password(
     user: User,
     new_password: str,
 ) -> User:
-    user.hashed_password = hash_password(new_password)
+    user.hashed_password = await hash_password_async(new_password)
     await db.commit()
     await db.refresh(user)
+    await principal_cache.invalidate(user.email)
     return user
 
 
+async def replace_password_hash(
+    db: AsyncSession,
+    user_id: uuid.UUID,
+    *,
+    old_hash: str,
+    new_hash: str,
+) -> bool:
+    """
+    Swap a hash only if it is still ``old_hash``, so a password
+    change that lands first is never overwritten. Commits.
+    """
+    result = await db.execute(
+        update(User)
+        .where(User.id == user_id, User.hashed_password == old_hash)
+        .values(hashed_password=new_hash)
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+    return result.rowcount == 1
+
+
 async def upgrade_tier(
     db: AsyncSession,
     user: User,
     new_tier: TierEnum,
 ) -> User:
     user.tier = new_tier
+    # A paid upgrade ends the trial: the expiry sweeper must not
+    # later move the user back to TRIAL_EXPIRED_TIER
+    if user.trial_ended_at is None:
+        user.trial_ended_at = func.now()
     await db.commit()
     await db.refresh(user)
+    await principal_cache.invalidate(user.email)
     return user
@@ -0,0 +1,220 @@
+import time
+import uuid
+import threading
+from typing import Any, Optional
+
+from sqlalchemy import Engine, create_engine, event, exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.core.config import settings
+from app.core.timings import install_query_timing
+from app.db.query_tracker import install_query_tracking
+
+
+# --------------------------------------------------
+# Pool instrumentation
+# --------------------------------------------------
+class PoolMetrics:
+    def __init__(self) -> None:
+        self.checkouts = 0
+        self.checkout_wait_seconds_total = 0.0
+        self.checkout_wait_seconds_max = 0.0
+        self.checkout_timeouts = 0
+        self.liveness_pings = 0
+        self.liveness_failures = 0
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "checkouts": self.checkouts,
+            "checkout_wait_seconds_total": self.checkout_wait_seconds_total,
+            "checkout_wait_seconds_max": self.checkout_wait_seconds_max,
+            "checkout_wait_seconds_avg": (
+                self.checkout_wait_seconds_total / self.checkouts
+                if self.checkouts
+                else 0.0
+            ),
+            "checkout_timeouts": self.checkout_timeouts,
+            "liveness_pings": self.liveness_pings,
+            "liveness_failures": self.liveness_failures,
+        }
+
+
+pool_metrics = PoolMetrics()
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """
+    Queue pool that records how long callers wait for a connection.
+    """
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            pool_metrics.checkout_timeouts += 1
+            raise
+        finally:
+            wait = time.perf_counter() - started
+            pool_metrics.checkouts += 1
+            pool_metrics.checkout_wait_seconds_total += wait
+            if wait > pool_metrics.checkout_wait_seconds_max:
+                pool_metrics.checkout_wait_seconds_max = wait
+
+
+def _install_liveness_check(engine: AsyncEngine, idle_seconds: float) -> None:
+    """
+    Ping a connection on checkout only when it has been idle for
+    ``idle_seconds``; busy connections skip the round trip.
+
+    A failed ping raises DisconnectionError, which makes the pool
+    discard the connection and retry with a fresh one.
+    """
+    sync_engine = engine.sync_engine
+
+    @event.listens_for(sync_engine, "checkin")
+    def _on_checkin(dbapi_connection, connection_record) -> None:
+        connection_record.info["checked_in_at"] = time.monotonic()
+
+    @event.listens_for(sync_engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy) -> None:
+        checked_in_at = connection_record.info.get("checked_in_at")
+        if checked_in_at is None:
+            return  # brand-new connection
+        if time.monotonic() - checked_in_at < idle_seconds:
+            return
+
+        pool_metrics.liveness_pings += 1
+        try:
+            sync_engine.dialect.do_ping(dbapi_connection)
+        except Exception as error:
+            pool_metrics.liveness_failures += 1
+            raise exc.DisconnectionError() from error
+
+
+# --------------------------------------------------
+# Engine
+# --------------------------------------------------
+def _connect_args(database_url: str) -> dict[str, Any]:
+    if not make_url(database_url).drivername.endswith("asyncpg"):
+        return {}
+
+    if settings.DB_PGBOUNCER_MODE:
+        return {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid.uuid4()}__",
+        }
+
+    return {"prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE}
+
+
+def _build_async_engine() -> AsyncEngine:
+    ping_idle = settings.DB_POOL_PING_IDLE_SECONDS
+
+    async_engine = create_async_engine(
+        settings.DATABASE_URL,
+        poolclass=InstrumentedAsyncQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+        pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+        pool_use_lifo=settings.DB_POOL_USE_LIFO,
+        pool_pre_ping=ping_idle <= 0,
+        connect_args=_connect_args(settings.DATABASE_URL),
+    )
+
+    if ping_idle > 0:
+        _install_liveness_check(async_engine, ping_idle)
+    if settings.METRICS_ENABLED:
+        install_query_timing(async_engine.sync_engine)
+    install_query_tracking(async_engine.sync_engine)
+
+    return async_engine
+
+
+def sync_database_url(database_url: str) -> str:
+    """
+    Derive the psycopg2 URL for sync consumers (Celery jobs,
+    CLI scripts) from the asyncpg DATABASE_URL.
+    """
+    url = make_url(database_url)
+    query = dict(url.query)
+    if query.pop("ssl", None) == "require":
+        query["sslmode"] = "require"
+    return url.set(
+        drivername="postgresql+psycopg2",
+        query=query,
+    ).render_as_string(hide_password=False)
+
+
+def _build_sync_engine() -> Engine:
+    sync_engine = create_engine(
+        sync_database_url(settings.DATABASE_URL),
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+        pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+        pool_pre_ping=True,
+    )
+    install_query_tracking(sync_engine)
+    return sync_engine
+
+
+# --------------------------------------------------
+# Registry
+# --------------------------------------------------
+# Engines (and their pools) are created on first use, so a
+# process only ever opens the kind of connections it needs:
+# API workers get an async pool, Celery workers a sync one.
+
+_async_engine: Optional[AsyncEngine] = None
+_sync_engine: Optional[Engine] = None
+_lock = threading.Lock()
+
+
+def get_async_engine() -> AsyncEngine:
+    global _async_engine
+    if _async_engine is None:
+        with _lock:
+            if _async_engine is None:
+                _async_engine = _build_async_engine()
+    return _async_engine
+
+
+def get_sync_engine() -> Engine:
+    global _sync_engine
+    if _sync_engine is None:
+        with _lock:
+            if _sync_engine is None:
+                _sync_engine = _build_sync_engine()
+    return _sync_engine
+
+
+async def dispose_engines() -> None:
+    """
+    Close pooled connections. Engines stay registered and
+    reconnect lazily if used again.
+    """
+    if _async_engine is not None:
+        await _async_engine.dispose()
+    if _sync_engine is not None:
+        _sync_engine.dispose()
+
+
+def pool_stats() -> dict[str, Any]:
+    if _async_engine is None:
+        return {"initialized": False, **pool_metrics.as_dict()}
+
+    pool = _async_engine.sync_engine.pool
+    return {
+        "initialized": True,
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": max(0, pool.overflow()),
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        **pool_metrics.as_dict(),
+    }
@@ -0,0 +1,95 @@
+"""
+Monthly range partitions.
+
+Partitions are named ``{table}_pYYYY_MM`` and cover
+``[first of month, first of next month)``. Expired months are
+detached and dropped, which is instant compared to DELETE.
+"""
+
+import re
+from datetime import date, datetime, timezone
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+
+def month_start(value: date) -> date:
+    return date(value.year, value.month, 1)
+
+
+def add_months(value: date, months: int) -> date:
+    index = value.year * 12 + value.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table: str, month: date) -> str:
+    return f"{table}_p{month:%Y_%m}"
+
+
+def list_monthly_partitions(conn: Connection, table: str) -> dict[date, str]:
+    rows = conn.execute(
+        text(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = CAST(:table AS regclass)"
+        ),
+        {"table": table},
+    )
+    pattern = re.compile(rf"^{re.escape(table)}_p(\d{{4}})_(\d{{2}})$")
+    partitions = {}
+    for (name,) in rows:
+        match = pattern.match(name)
+        if match:
+            partitions[date(int(match[1]), int(match[2]), 1)] = name
+    return partitions
+
+
+def ensure_monthly_partitions(
+    conn: Connection,
+    table: str,
+    *,
+    months_ahead: int,
+    start: Optional[date] = None,
+) -> list[str]:
+    """
+    Create the partitions from ``start`` (default: this month)
+    through ``months_ahead`` months later. Returns the new ones.
+    """
+    first = month_start(start or datetime.now(timezone.utc).date())
+    existing = list_monthly_partitions(conn, table)
+
+    created = []
+    for offset in range(months_ahead + 1):
+        month = add_months(first, offset)
+        if month in existing:
+            continue
+        name = partition_name(table, month)
+        conn.execute(
+            text(
+                f'CREATE TABLE IF NOT EXISTS "{name}" PARTITION OF "{table}" '
+                f"FOR VALUES FROM ('{month.isoformat()}') "
+                f"TO ('{add_months(month, 1).isoformat()}')"
+            )
+        )
+        created.append(name)
+    return created
+
+
+def drop_monthly_partitions_before(
+    conn: Connection,
+    table: str,
+    cutoff: date,
+) -> list[str]:
+    """
+    Drop every partition whose whole month is before ``cutoff``.
+    """
+    cutoff = month_start(cutoff)
+    dropped = []
+    for month, name in sorted(list_monthly_partitions(conn, table).items()):
+        if month >= cutoff:
+            break
+        conn.execute(text(f'ALTER TABLE "{table}" DETACH PARTITION "{name}"'))
+        conn.execute(text(f'DROP TABLE "{name}"'))
+        dropped.append(name)
+    return dropped
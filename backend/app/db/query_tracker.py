@@ -0,0 +1,285 @@
+"""
+Query tracking for budgets, N+1 detection and the slow-query log.
+
+Every statement executed on an engine with ``install_query_tracking``
+is reported to the trackers active in the current context (request,
+task or test), with its time and a fingerprint of the statement with
+literals and bind parameters stripped. The same fingerprint executed
+over and over within one unit of work is the signature of an N+1
+(a lazy load in a loop, a per-row lookup).
+
+In a test::
+
+    with query_budget(3):
+        await client.get("/api/v1/auth/me", headers=headers)
+
+    @query_budget(2, max_repeats=1)
+    async def test_referral_stats(client): ...
+
+Exceeding the budget raises QueryBudgetExceeded (an AssertionError)
+listing the statements that ran.
+"""
+
+import asyncio
+import functools
+import hashlib
+import logging
+import re
+import time
+from collections import defaultdict
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+
+from sqlalchemy import Engine, event
+
+from app.core.config import settings
+
+
+logger = logging.getLogger(__name__)
+slow_query_logger = logging.getLogger("app.db.slow_query")
+
+
+# --------------------------------------------------
+# Fingerprints
+# --------------------------------------------------
+_STRING = re.compile(r"'(?:[^']|'')*'")
+# $1 (asyncpg), %(name)s / %s (psycopg2), :name (not ::casts)
+_PARAM = re.compile(r"\$\d+|%\(\w+\)s|%s|(?<!:):\w+")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+# IN (?, ?, ?) and multi-row VALUES collapse to one shape
+_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_ROWS = re.compile(r"(\((?:\?|\.\.\.)\))(?:\s*,\s*\((?:\?|\.\.\.)\))+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_statement(statement: str) -> str:
+    normalized = _STRING.sub("?", statement)
+    normalized = _PARAM.sub("?", normalized)
+    normalized = _NUMBER.sub("?", normalized)
+    normalized = _LIST.sub("(...)", normalized)
+    normalized = _ROWS.sub(r"\1, ...", normalized)
+    return _WHITESPACE.sub(" ", normalized).strip()
+
+
+def fingerprint(normalized: str) -> str:
+    return hashlib.blake2b(normalized.encode(), digest_size=8).hexdigest()
+
+
+# --------------------------------------------------
+# Tracker
+# --------------------------------------------------
+@dataclass
+class QueryRecord:
+    statement: str
+    seconds: float
+    executemany: bool = False
+    normalized: str = field(init=False)
+    fingerprint: str = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.normalized = normalize_statement(self.statement)
+        self.fingerprint = fingerprint(self.normalized)
+
+
+_trackers: ContextVar[tuple["QueryTracker", ...]] = ContextVar(
+    "query_trackers", default=()
+)
+
+
+class QueryTracker:
+    """
+    Collects the statements executed while it is active. Trackers
+    nest: each active one sees every statement.
+    """
+
+    def __init__(self, label: Optional[str] = None) -> None:
+        self.label = label
+        self.records: list[QueryRecord] = []
+        self._token = None
+
+    def __enter__(self) -> "QueryTracker":
+        self._token = _trackers.set(_trackers.get() + (self,))
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        _trackers.reset(self._token)
+        self._token = None
+
+    def _add(self, record: QueryRecord) -> None:
+        self.records.append(record)
+
+    @property
+    def count(self) -> int:
+        return len(self.records)
+
+    @property
+    def total_seconds(self) -> float:
+        return sum(record.seconds for record in self.records)
+
+    def repeats(self, min_count: int = 2) -> dict[str, list[QueryRecord]]:
+        """
+        Fingerprints executed at least ``min_count`` times.
+        """
+        groups: dict[str, list[QueryRecord]] = defaultdict(list)
+        for record in self.records:
+            groups[record.fingerprint].append(record)
+        return {fp: group for fp, group in groups.items() if len(group) >= min_count}
+
+    def report(self) -> str:
+        lines = [
+            f"{self.count} statements, {self.total_seconds * 1000:.1f} ms"
+            + (f" ({self.label})" if self.label else "")
+        ]
+        for i, record in enumerate(self.records, 1):
+            lines.append(
+                f"  {i:>3}. [{record.fingerprint}] {record.seconds * 1000:7.2f} ms  "
+                f"{record.normalized[:200]}"
+            )
+        for fp, group in self.repeats().items():
+            lines.append(f"  repeated x{len(group)}: [{fp}] {group[0].normalized[:200]}")
+        return "\n".join(lines)
+
+
+# --------------------------------------------------
+# Budgets
+# --------------------------------------------------
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+class query_budget(QueryTracker):
+    """
+    Tracker that fails on exit when more than ``max_queries``
+    statements ran, or (with ``max_repeats``) when one fingerprint
+    ran more than ``max_repeats`` times. Works as a context manager
+    and as a decorator for sync and async functions.
+    """
+
+    def __init__(
+        self,
+        max_queries: int,
+        *,
+        max_repeats: Optional[int] = None,
+        label: Optional[str] = None,
+    ) -> None:
+        super().__init__(label)
+        self.max_queries = max_queries
+        self.max_repeats = max_repeats
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        super().__exit__(exc_type, exc, tb)
+        if exc_type is None:
+            self.check()
+
+    def check(self) -> None:
+        problems = []
+        if self.count > self.max_queries:
+            problems.append(f"ran {self.count} statements, budget is {self.max_queries}")
+        if self.max_repeats is not None:
+            repeated = self.repeats(self.max_repeats + 1)
+            if repeated:
+                problems.append(
+                    f"{len(repeated)} statement(s) repeated more than "
+                    f"{self.max_repeats} time(s) (possible N+1)"
+                )
+        if problems:
+            raise QueryBudgetExceeded("; ".join(problems) + "\n" + self.report())
+
+    def __call__(self, fn: Callable[..., Any]) -> Callable[..., Any]:
+        # A fresh budget per call, so the decorated function can run
+        # more than once (and concurrently)
+        def fresh() -> "query_budget":
+            return query_budget(
+                self.max_queries,
+                max_repeats=self.max_repeats,
+                label=self.label or fn.__qualname__,
+            )
+
+        if asyncio.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                with fresh():
+                    return await fn(*args, **kwargs)
+
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with fresh():
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+
+# --------------------------------------------------
+# Engine events
+# --------------------------------------------------
+def install_query_tracking(engine: Engine) -> None:
+    """
+    Report statements to the active trackers and log the slow ones.
+    For an AsyncEngine pass ``engine.sync_engine``. With no tracker
+    active and the slow-query log off, the events return at once.
+    """
+    slow_seconds = settings.DB_SLOW_QUERY_SECONDS
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany) -> None:
+        if slow_seconds > 0 or _trackers.get():
+            conn.info["tracker_query_started"] = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany) -> None:
+        started = conn.info.pop("tracker_query_started", None)
+        if started is None:
+            return
+        elapsed = time.perf_counter() - started
+
+        trackers = _trackers.get()
+        record = None
+        if trackers:
+            record = QueryRecord(statement, elapsed, executemany)
+            for tracker in trackers:
+                tracker._add(record)
+
+        if 0 < slow_seconds <= elapsed:
+            record = record or QueryRecord(statement, elapsed, executemany)
+            slow_query_logger.warning(
+                "Slow query %.1f ms [%s] %s",
+                elapsed * 1000,
+                record.fingerprint,
+                record.normalized,
+            )
+
+
+# --------------------------------------------------
+# Per-request repeat warnings
+# --------------------------------------------------
+class QueryTrackingMiddleware:
+    """
+    Development aid: tracks every request and logs a warning when
+    one statement shape ran ``repeat_threshold`` times or more.
+    """
+
+    def __init__(self, app, repeat_threshold: int) -> None:
+        self.app = app
+        self.repeat_threshold = repeat_threshold
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with QueryTracker(label=f"{scope['method']} {scope['path']}") as tracker:
+            await self.app(scope, receive, send)
+
+        repeated = tracker.repeats(self.repeat_threshold)
+        if repeated:
+            logger.warning(
+                "Possible N+1 in %s: %s",
+                tracker.label,
+                "; ".join(
+                    f"x{len(group)} {group[0].normalized[:200]}"
+                    for group in repeated.values()
+                ),
+            )
@@ -1,28 +1,44 @@
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Optional
 
-from sqlalchemy.ext.asyncio import (
-    AsyncSession,
-    async_sessionmaker,
-    create_async_engine,
-)
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 
-from app.core.config import settings
+from app.db.engines import get_async_engine, get_sync_engine
 
-# Create async engine
-engine = create_async_engine(
-    settings.DATABASE_URL,
-    pool_pre_ping=True,
-)
 
-# Async session factory
-AsyncSessionLocal = async_sessionmaker(
-    bind=engine,
-    class_=AsyncSession,
-    expire_on_commit=False,
-)
+# --------------------------------------------------
+# Session factories (bound on first use)
+# --------------------------------------------------
+_async_sessionmaker: Optional[async_sessionmaker[AsyncSession]] = None
+_sync_sessionmaker: Optional[sessionmaker[Session]] = None
+
+
+def get_sessionmaker() -> async_sessionmaker[AsyncSession]:
+    global _async_sessionmaker
+    if _async_sessionmaker is None:
+        _async_sessionmaker = async_sessionmaker(
+            bind=get_async_engine(),
+            class_=AsyncSession,
+            expire_on_commit=False,
+        )
+    return _async_sessionmaker
+
+
+def get_sync_sessionmaker() -> sessionmaker[Session]:
+    """
+    Sync sessions for Celery tasks and CLI scripts.
+    """
+    global _sync_sessionmaker
+    if _sync_sessionmaker is None:
+        _sync_sessionmaker = sessionmaker(
+            bind=get_sync_engine(),
+            autoflush=False,
+            expire_on_commit=False,
+        )
+    return _sync_sessionmaker
+
 
 # Dependency for FastAPI routes
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
-    async with AsyncSessionLocal() as session:
+    async with get_sessionmaker()() as session:
         yield session
-
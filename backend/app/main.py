@@ -1,14 +1,48 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 
 from app.core.config import settings
+from app.core.lifecycle import lifecycle
+from app.core.metrics import MetricsMiddleware
+from app.core.security import prepare_keys
+from app.db.query_tracker import QueryTrackingMiddleware
 from app.api.v1.auth import router as auth_router
+from app.api.v1.admin import router as admin_router
+from app.api.v1.referrals import router as referrals_router
+from app.api.metrics import router as metrics_router
+from app.services.audit import audit_buffer
+from app.services.auth import wait_for_rehashes
+from app.services.warmup import close_resources, warm_up
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if settings.STARTUP_WARMUP_ENABLED:
+        await warm_up()
+    else:
+        prepare_keys()
+    audit_buffer.start()
+    lifecycle.ready = True
+
+    yield
+
+    # uvicorn has already stopped accepting and let running
+    # requests finish
+    lifecycle.ready = False
+    await wait_for_rehashes()
+    # Buffered audit events must reach the database before exit
+    await audit_buffer.stop()
+    await close_resources()
 
 
 def create_application() -> FastAPI:
     app = FastAPI(
         title=settings.APP_NAME,
         version="1.0.0",
+        lifespan=lifespan,
     )
 
     # --------------------------------------------------
@@ -22,6 +56,18 @@ def create_application() -> FastAPI:
         allow_headers=["*"],
     )
 
+    if settings.DB_QUERY_REPEAT_WARNING > 0:
+        app.add_middleware(
+            QueryTrackingMiddleware,
+            repeat_threshold=settings.DB_QUERY_REPEAT_WARNING,
+        )
+
+    # --------------------------------------------------
+    # Metrics (outermost, so it times everything below)
+    # --------------------------------------------------
+    if settings.METRICS_ENABLED:
+        app.add_middleware(MetricsMiddleware)
+
     # --------------------------------------------------
     # API Routers
     # --------------------------------------------------
@@ -30,6 +76,19 @@ def create_application() -> FastAPI:
         prefix="/api/v1",
     )
 
+    app.include_router(
+        admin_router,
+        prefix="/api/v1",
+    )
+
+    app.include_router(
+        referrals_router,
+        prefix="/api/v1",
+    )
+
+    if settings.METRICS_ENABLED:
+        app.include_router(metrics_router)
+
     # --------------------------------------------------
     # Health check
     # --------------------------------------------------
@@ -40,6 +99,13 @@ def create_application() -> FastAPI:
             "message": "POSTIKA backend is live",
         }
 
+    @app.get("/health/ready", tags=["Health"])
+    async def ready():
+        # 503 until warm-up is done
+        if not lifecycle.ready:
+            return JSONResponse({"status": "starting"}, status_code=503)
+        return {"status": "ready"}
+
     return app
 
 
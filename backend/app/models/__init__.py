@@ -1 +1,5 @@
 from app.models.user import User
+from app.models.referral import Referral
+from app.models.email_verification import EmailVerification
+from app.models.audit_log import AuditLog
+from app.models.referral_stats import ReferralStats
@@ -2,9 +2,13 @@ import uuid
 from datetime import datetime
 
 from sqlalchemy import (
+    BigInteger,
     String,
     DateTime,
     ForeignKey,
+    Identity,
+    Index,
+    text,
 )
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import Mapped, mapped_column
@@ -14,14 +18,66 @@ from app.db.base import Base
 
 
 class AuditLog(Base):
+    """
+    Range-partitioned by month on ``created_at``.
+
+    Partitions are created ahead of time and dropped whole once out
+    of retention (app.db.partitions, app.tasks.audit_tasks). Rows
+    are written in batches by app.services.audit, never one by one.
+    """
+
     __tablename__ = "audit_logs"
+    __table_args__ = (
+        # Rows arrive in time order, so a BRIN index stays tiny
+        Index(
+            "ix_audit_logs_created_at_brin",
+            "created_at",
+            postgresql_using="brin",
+        ),
+        # Keyset pagination (app.crud.audit_log): each filter has an
+        # index ending in the (created_at, id) sort key, so a page
+        # is an index range scan wherever the cursor points.
+        Index(
+            "ix_audit_logs_actor_created",
+            "actor_id",
+            text("created_at DESC"),
+            text("id DESC"),
+        ),
+        Index(
+            "ix_audit_logs_resource_created",
+            "resource_type",
+            "resource_id",
+            text("created_at DESC"),
+            text("id DESC"),
+        ),
+        Index(
+            "ix_audit_logs_action_created",
+            "action_type",
+            text("created_at DESC"),
+            text("id DESC"),
+        ),
+        Index(
+            "ix_audit_logs_metadata_gin",
+            "metadata",
+            postgresql_using="gin",
+            postgresql_ops={"metadata": "jsonb_path_ops"},
+        ),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
 
     # --------------------------------------------------
-    # Primary Key
+    # Primary Key (must include the partition key)
     # --------------------------------------------------
     id: Mapped[int] = mapped_column(
+        BigInteger,
+        Identity(),
+        primary_key=True,
+    )
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
         primary_key=True,
-        autoincrement=True,
+        server_default=func.now(),
     )
 
     # --------------------------------------------------
@@ -31,7 +87,6 @@ class AuditLog(Base):
         UUID(as_uuid=True),
         ForeignKey("users.id", ondelete="SET NULL"),
         nullable=True,
-        index=True,
     )
 
     # --------------------------------------------------
@@ -52,16 +107,11 @@ class AuditLog(Base):
         nullable=False,
     )
 
-    metadata: Mapped[dict] = mapped_column(
+    # "metadata" is reserved on declarative classes
+    metadata_: Mapped[dict] = mapped_column(
+        "metadata",
         JSONB,
         nullable=False,
         default=dict,
-    )
-
-    # --------------------------------------------------
-    # Timestamp
-    # --------------------------------------------------
-    created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True),
-        server_default=func.now(),
+        server_default="{}",
     )
@@ -1,5 +1,6 @@
 import uuid
 from datetime import datetime
+from typing import Optional
 
 from sqlalchemy import (
     String,
@@ -38,9 +39,11 @@ class EmailVerification(Base):
     # --------------------------------------------------
     # Verification Code
     # --------------------------------------------------
-    code: Mapped[str] = mapped_column(
+    # Live codes are held in Redis (app.services.verification); this
+    # table is an optional audit trail and leaves the code empty.
+    code: Mapped[Optional[str]] = mapped_column(
         String(6),
-        nullable=False,
+        nullable=True,
     )
 
     expires_at: Mapped[datetime] = mapped_column(
@@ -60,4 +63,5 @@ class EmailVerification(Base):
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         server_default=func.now(),
+        index=True,
     )
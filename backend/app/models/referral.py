@@ -5,7 +5,9 @@ from sqlalchemy import (
     Boolean,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
+    text,
 )
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column
@@ -16,6 +18,15 @@ from app.db.base import Base
 
 class Referral(Base):
     __tablename__ = "referrals"
+    __table_args__ = (
+        # Settlement queue: only rows still waiting to be paid
+        Index(
+            "ix_referrals_unpaid_triggered",
+            "triggered_at",
+            "id",
+            postgresql_where=text("NOT reward_paid AND triggered_at IS NOT NULL"),
+        ),
+    )
 
     # --------------------------------------------------
     # Primary Key
@@ -63,6 +74,12 @@ class Referral(Base):
         nullable=True,
     )
 
+    # Set together with reward_paid by the settlement job
+    paid_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+    )
+
     # --------------------------------------------------
     # Timestamps
     # --------------------------------------------------
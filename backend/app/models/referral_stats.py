@@ -0,0 +1,70 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import (
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    text,
+)
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+
+from app.db.base import Base
+
+
+class ReferralStats(Base):
+    """
+    Precomputed position of a user in the referral tree.
+
+    Maintained incrementally at signup (app.crud.referral_stats);
+    users with no row have no referrals and no referrer.
+    """
+
+    __tablename__ = "referral_stats"
+    __table_args__ = (
+        Index(
+            "ix_referral_stats_leaderboard",
+            text("direct_count DESC"),
+            text("descendant_count DESC"),
+            "user_id",
+        ),
+    )
+
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+
+    # --------------------------------------------------
+    # Counts
+    # --------------------------------------------------
+    # Users who signed up with this user's code
+    direct_count: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0,
+    )
+
+    # Everyone below this user in the tree, direct ones included
+    descendant_count: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0,
+    )
+
+    # Number of referrers above this user (0 = not referred)
+    depth: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0,
+    )
+
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+    )
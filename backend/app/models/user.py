@@ -3,17 +3,24 @@ import uuid
 from datetime import datetime
 
 from sqlalchemy import (
+    Sequence,
     String,
     Boolean,
     DateTime,
     Enum,
     ForeignKey,
+    Index,
+    text,
 )
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql import func
 
-from app.database import Base  # ✅ FIXED: single authoritative Base
+from app.db.base import Base
+
+
+# Source of referral code numbers (see app.services.referral_codes)
+referral_code_seq = Sequence("referral_code_seq", metadata=Base.metadata)
 
 
 class TierEnum(str, enum.Enum):
@@ -24,6 +31,15 @@ class TierEnum(str, enum.Enum):
 
 class User(Base):
     __tablename__ = "users"
+    __table_args__ = (
+        # Trial-expiry sweeper queue (app.services.trials): only
+        # trials not yet processed are indexed
+        Index(
+            "ix_users_trial_pending",
+            "trial_expires_at",
+            postgresql_where=text("trial_ended_at IS NULL"),
+        ),
+    )
 
     # --------------------------------------------------
     # Primary Key
@@ -83,6 +99,9 @@ class User(Base):
 
     trial_starts_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
     trial_expires_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    # Set by the sweeper once the trial is over; handlers read this
+    # (or the tier) instead of comparing trial_expires_at per request
+    trial_ended_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
 
     # --------------------------------------------------
     # Referral
@@ -100,10 +119,12 @@ class User(Base):
         nullable=True,
     )
 
+    # Never loaded implicitly: callers opt in through the CRUD
+    # load profiles (see app.crud.user.UserLoad).
     referrer = relationship(
         "User",
         remote_side="User.id",
-        lazy="joined",
+        lazy="raise_on_sql",
     )
 
     # --------------------------------------------------
@@ -0,0 +1,74 @@
+"""
+Read models: responses built straight from column values.
+
+The principal is already a dict of JSON-ready values (cached, or
+selected as a plain row), so a response is a key projection of it:
+no ORM instance, no Pydantic validation, one JSON encode.
+"""
+
+from datetime import datetime
+from typing import Any
+
+from fastapi.responses import JSONResponse, Response
+
+from app.core.timings import timed_stage
+from app.crud.user import PRINCIPAL_COLUMNS
+from app.models.user import User
+from app.schemas.user import UserRead
+
+try:
+    import orjson
+except ImportError:  # optional speed-up
+    orjson = None
+
+
+# Kept in step with the documented response_model
+USER_READ_FIELDS: tuple[str, ...] = tuple(UserRead.model_fields)
+
+if not set(USER_READ_FIELDS) <= set(PRINCIPAL_COLUMNS):
+    raise RuntimeError("UserRead exposes a field the principal does not carry")
+
+
+# The principal stores datetimes as isoformat() ("...+00:00");
+# Pydantic serializes UTC as "...Z", which is what UserRead sent
+_DATETIME_FIELDS = frozenset(
+    field
+    for field in USER_READ_FIELDS
+    if User.__table__.c[field].type.python_type is datetime
+)
+
+
+def _utc_as_z(value: Any) -> Any:
+    if isinstance(value, str) and value.endswith("+00:00"):
+        return value[:-6] + "Z"
+    return value
+
+
+def user_read(principal: dict[str, Any]) -> dict[str, Any]:
+    return {
+        field: (
+            _utc_as_z(principal.get(field))
+            if field in _DATETIME_FIELDS
+            else principal.get(field)
+        )
+        for field in USER_READ_FIELDS
+    }
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSONResponse using orjson when it is installed. Content must
+    already be JSON-ready (str/int/bool/None, lists and dicts).
+    """
+
+    def render(self, content: Any) -> bytes:
+        # Rendered inside the endpoint, so InstrumentedRoute would
+        # not see it
+        with timed_stage("serialization"):
+            if orjson is not None:
+                return orjson.dumps(content)
+            return super().render(content)
+
+
+def user_read_response(principal: dict[str, Any]) -> Response:
+    return FastJSONResponse(user_read(principal))
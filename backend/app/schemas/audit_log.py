@@ -0,0 +1,29 @@
+import uuid
+from datetime import datetime
+from typing import Any, Optional
+
+from pydantic import BaseModel, Field
+
+
+# -------------------------
+# API response
+# -------------------------
+class AuditLogRead(BaseModel):
+    id: int
+    created_at: datetime
+    actor_id: Optional[uuid.UUID]
+    action_type: str
+    resource_type: str
+    resource_id: str
+    metadata: dict[str, Any] = Field(validation_alias="metadata_")
+
+    class Config:
+        from_attributes = True
+
+
+class AuditLogPage(BaseModel):
+    items: list[AuditLogRead]
+    next_cursor: Optional[str] = Field(
+        None,
+        description="Pass as ?cursor= for the next page; null on the last page",
+    )
@@ -0,0 +1,21 @@
+import uuid
+
+from pydantic import BaseModel
+
+
+# -------------------------
+# Referral stats
+# -------------------------
+class ReferralStatsRead(BaseModel):
+    direct_count: int = 0
+    indirect_count: int = 0
+    descendant_count: int = 0
+    depth: int = 0
+
+
+class ReferralLeaderboardEntry(BaseModel):
+    rank: int
+    user_id: uuid.UUID
+    first_name: str
+    direct_count: int
+    descendant_count: int
@@ -1,3 +1,4 @@
+import uuid
 from datetime import datetime
 from typing import Optional
 from pydantic import BaseModel, EmailStr, Field
@@ -46,19 +47,55 @@ class UserLogin(BaseModel):
     password: str
 
 
+# -------------------------
+# Tokens / sessions
+# -------------------------
+class TokenPair(BaseModel):
+    access_token: str
+    # None when the session store was unavailable at login
+    refresh_token: Optional[str] = None
+    token_type: str = "bearer"
+    expires_in: int
+
+
+class RefreshRequest(BaseModel):
+    refresh_token: str = Field(..., max_length=256)
+
+
+class SessionRead(BaseModel):
+    id: str
+    created_at: datetime
+    last_used_at: datetime
+    user_agent: Optional[str] = None
+    ip: Optional[str] = None
+    current: bool = False
+
+
+# -------------------------
+# Email verification
+# -------------------------
+class EmailVerificationConfirm(BaseModel):
+    code: str = Field(..., pattern=r"^\d{6}$")
+
+
+class EmailVerificationIssued(BaseModel):
+    expires_in: int
+
+
 # -------------------------
 # Internal DB representation
 # -------------------------
 class UserInDB(UserBase):
-    id: int
+    id: uuid.UUID
     is_active: bool
     is_email_verified: bool
     tier: TierEnum
     referral_code: str
-    referred_by_id: Optional[int]
+    referred_by_id: Optional[uuid.UUID]
 
     trial_starts_at: datetime
     trial_expires_at: datetime
+    trial_ended_at: Optional[datetime] = None
 
     created_at: datetime
     updated_at: datetime
@@ -71,14 +108,44 @@ class UserInDB(UserBase):
 # API response (safe)
 # -------------------------
 class UserRead(BaseModel):
-    id: int
+    id: uuid.UUID
     email: EmailStr
     first_name: str
     last_name: str
     tier: TierEnum
     is_email_verified: bool
     trial_expires_at: datetime
+    trial_ended_at: Optional[datetime] = None
     created_at: datetime
 
     class Config:
         from_attributes = True
+
+
+# -------------------------
+# Bulk import
+# -------------------------
+class UserImportFailure(BaseModel):
+    line: int
+    email: Optional[str] = None
+    error: str
+
+
+class UserImportReport(BaseModel):
+    total_rows: int = 0
+    inserted: int = 0
+    failed: int = 0
+    elapsed_seconds: float = 0.0
+    failures: list[UserImportFailure] = Field(
+        default_factory=list,
+        description="First failures only; see `failed` for the total",
+    )
+    password_reset_required: int = 0
+    password_reset_emails: list[str] = Field(
+        default_factory=list,
+        description=(
+            "Users imported without a password: they must reset it "
+            "before they can log in. First entries only; see "
+            "`password_reset_required` for the total"
+        ),
+    )
@@ -0,0 +1,253 @@
+import asyncio
+import json
+import logging
+import time
+import uuid
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+from app.core.config import settings
+from app.db.engines import get_async_engine
+
+
+logger = logging.getLogger(__name__)
+
+
+# Column order of the COPY payload
+AUDIT_COLUMNS = (
+    "created_at",
+    "actor_id",
+    "action_type",
+    "resource_type",
+    "resource_id",
+    "metadata",
+)
+
+
+@dataclass
+class AuditStats:
+    recorded: int = 0
+    written: int = 0
+    dropped: int = 0
+    flushes: int = 0
+    failed_flushes: int = 0
+    last_flush_seconds: float = 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "recorded": self.recorded,
+            "written": self.written,
+            "dropped": self.dropped,
+            "flushes": self.flushes,
+            "failed_flushes": self.failed_flushes,
+            "last_flush_seconds": self.last_flush_seconds,
+        }
+
+
+# --------------------------------------------------
+# Write-behind buffer
+# --------------------------------------------------
+class AuditBuffer:
+    """
+    In-process queue of audit events, written with COPY.
+
+    ``record()`` never does I/O: it appends to a bounded deque (the
+    oldest events are dropped, and counted, if the database stays
+    unreachable). A background task flushes when ``batch_size``
+    events are waiting or every ``flush_interval`` seconds, and
+    ``stop()`` flushes whatever is left.
+
+    Event timestamps are taken at ``record()`` time, so batching
+    does not shift rows between monthly partitions.
+
+    After a failed flush the buffer backs off: wakeups are ignored
+    and the next attempt waits for the timer, doubling from
+    ``flush_interval`` up to ``max_backoff`` while failures repeat.
+    """
+
+    def __init__(
+        self,
+        *,
+        batch_size: int,
+        flush_interval: float,
+        max_buffered: int,
+        max_backoff: float = 60.0,
+        enabled: bool = True,
+    ) -> None:
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_backoff = max_backoff
+        self.enabled = enabled
+
+        self._events: deque[tuple] = deque(maxlen=max_buffered)
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self._closing = False
+        self._failures = 0
+        self._retry_at = 0.0
+        self._stats = AuditStats()
+
+    # ---------------- producers ----------------
+    def record(
+        self,
+        action_type: str,
+        resource_type: str,
+        resource_id: Any,
+        *,
+        actor_id: Optional[uuid.UUID] = None,
+        metadata: Optional[dict[str, Any]] = None,
+    ) -> None:
+        if not self.enabled:
+            return
+
+        if len(self._events) == self._events.maxlen:
+            self._stats.dropped += 1
+        self._events.append(
+            (
+                datetime.now(timezone.utc),
+                actor_id,
+                action_type,
+                resource_type,
+                str(resource_id),
+                json.dumps(metadata or {}, default=str),
+            )
+        )
+        self._stats.recorded += 1
+
+        if (
+            len(self._events) >= self.batch_size
+            and self._wakeup is not None
+            and not self._failures
+        ):
+            self._wakeup.set()
+
+    # ---------------- flushing ----------------
+    async def _write(self, rows: list[tuple]) -> None:
+        async with get_async_engine().connect() as conn:
+            raw = await conn.get_raw_connection()
+            # COPY runs outside the adapter's transaction and commits
+            # on its own
+            await raw.driver_connection.copy_records_to_table(
+                "audit_logs",
+                records=rows,
+                columns=AUDIT_COLUMNS,
+            )
+
+    async def flush(self) -> int:
+        """
+        Write everything buffered so far. On failure the batch goes
+        back to the front of the buffer for the next attempt.
+        """
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+
+        written = 0
+        async with self._flush_lock:
+            while self._events:
+                rows = [
+                    self._events.popleft()
+                    for _ in range(min(self.batch_size, len(self._events)))
+                ]
+                started = time.perf_counter()
+                try:
+                    await self._write(rows)
+                except Exception:
+                    self._stats.failed_flushes += 1
+                    self._failures += 1
+                    backoff = min(
+                        self.flush_interval * 2 ** (self._failures - 1),
+                        self.max_backoff,
+                    )
+                    self._retry_at = time.monotonic() + backoff
+                    logger.exception(
+                        "Audit log flush of %d events failed; retrying in %.1fs",
+                        len(rows),
+                        backoff,
+                    )
+                    room = self._events.maxlen - len(self._events)
+                    self._stats.dropped += max(len(rows) - room, 0)
+                    self._events.extendleft(reversed(rows[:room]))
+                    break
+
+                self._failures = 0
+                written += len(rows)
+                self._stats.written += len(rows)
+                self._stats.flushes += 1
+                self._stats.last_flush_seconds = time.perf_counter() - started
+        return written
+
+    async def _run(self) -> None:
+        while not self._closing:
+            timeout = max(self.flush_interval, self._retry_at - time.monotonic())
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            if self._closing or time.monotonic() < self._retry_at:
+                # Backing off (stop() does the final flush itself)
+                continue
+            if self._events:
+                await self.flush()
+
+    # ---------------- lifecycle ----------------
+    def start(self) -> None:
+        if not self.enabled or self._task is not None:
+            return
+        self._wakeup = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._task = asyncio.get_running_loop().create_task(
+            self._run(), name="audit-log-flusher"
+        )
+
+    async def stop(self) -> None:
+        """
+        Stop the flusher and write out the remaining events. The
+        task is woken rather than cancelled so an in-flight COPY
+        completes.
+        """
+        task, self._task = self._task, None
+        if task is not None:
+            self._closing = True
+            self._wakeup.set()
+            await task
+        self._wakeup = None
+        self._closing = False
+        if self._events:
+            await self.flush()
+
+    def stats(self) -> dict[str, Any]:
+        return {**self._stats.as_dict(), "buffered": len(self._events)}
+
+
+audit_buffer = AuditBuffer(
+    batch_size=settings.AUDIT_LOG_BATCH_SIZE,
+    flush_interval=settings.AUDIT_LOG_FLUSH_INTERVAL_SECONDS,
+    max_buffered=settings.AUDIT_LOG_MAX_BUFFERED,
+    max_backoff=settings.AUDIT_LOG_MAX_BACKOFF_SECONDS,
+    enabled=settings.AUDIT_LOG_ENABLED,
+)
+
+
+def audit(
+    action_type: str,
+    resource_type: str,
+    resource_id: Any,
+    *,
+    actor_id: Optional[uuid.UUID] = None,
+    metadata: Optional[dict[str, Any]] = None,
+) -> None:
+    """
+    Record an audit event. Returns immediately; the row is written
+    by the next batch flush.
+    """
+    audit_buffer.record(
+        action_type,
+        resource_type,
+        resource_id,
+        actor_id=actor_id,
+        metadata=metadata,
+    )
@@ -1,17 +1,79 @@
-from fastapi import Depends, HTTPException, status
+import asyncio
+import logging
+import math
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from fastapi import Depends, HTTPException, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.schemas.user import UserCreate
 from app.models.user import User
-from app.crud.user import get_user_by_email, create_user
+from app.crud.user import (
+    UserLoad,
+    get_user_by_email,
+    get_principal_data,
+    get_user_principal,
+    create_user,
+    find_signup_conflict,
+    replace_password_hash,
+    set_email_verified,
+)
+from app.crud.referral_stats import apply_referral_signups
+from app.core.config import settings
+from app.core.hashing import hash_password_async, verify_password_async
+from app.core.rate_limit import rate_limiter
 from app.core.security import (
-    hash_password,
-    verify_password,
     create_access_token,
     decode_access_token,
     oauth2_scheme,
+    password_needs_update,
 )
-from app.db.session import get_db
+from app.db.session import get_db, get_sessionmaker
+from app.services.audit import audit
+from app.services.referral_codes import referral_code_allocator
+from app.services.sessions import (
+    RotateStatus,
+    open_session,
+    revoke_sessions,
+    rotate_refresh_token,
+    session_is_live,
+)
+from app.services.verification import VerifyResult, issue_code, verify_code
+
+
+logger = logging.getLogger(__name__)
+
+
+# --------------------------------------------------
+# Rate limiting
+# --------------------------------------------------
+def client_ip(request: Request) -> Optional[str]:
+    if settings.RATE_LIMIT_TRUST_FORWARDED_FOR:
+        forwarded = request.headers.get("x-forwarded-for")
+        if forwarded:
+            return forwarded.split(",")[0].strip()
+    return request.client.host if request.client else None
+
+
+async def enforce_rate_limit(
+    request: Request,
+    route: str,
+    **identifiers: Optional[str],
+) -> None:
+    """
+    Count an attempt at ``route`` by client IP and the given
+    identifiers. Called before any password hashing so rejected
+    attempts cost no bcrypt time.
+    """
+    result = await rate_limiter.hit(route, ip=client_ip(request), **identifiers)
+    if not result.allowed:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many attempts, try again later",
+            headers={"Retry-After": str(max(math.ceil(result.retry_after), 1))},
+        )
 
 
 # --------------------------------------------------
@@ -21,19 +83,49 @@ async def register_user(
     db: AsyncSession,
     payload: UserCreate,
 ) -> User:
-    existing = await get_user_by_email(db, payload.email)
-    if existing:
-        raise HTTPException(
-            status_code=status.HTTP_409_CONFLICT,
-            detail="User with this email already exists",
-        )
+    # A referred signup also updates its referrers' stats, and both
+    # writes must commit together. A plain signup is one
+    # self-contained statement, so it runs in autocommit and skips
+    # the BEGIN/COMMIT round trips.
+    referred = bool(payload.referral_code)
+    if not referred:
+        await db.connection(execution_options={"isolation_level": "AUTOCOMMIT"})
 
     user = await create_user(
         db=db,
         payload=payload,
-        hashed_password=hash_password(payload.password),
+        hashed_password=await hash_password_async(payload.password),
+        referral_code=await referral_code_allocator.next_code(db),
+        commit=not referred,
     )
 
+    if user is None:
+        field = await find_signup_conflict(
+            db,
+            email=payload.email,
+            phone_number=payload.phone_number,
+        )
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=(
+                "User with this phone number already exists"
+                if field == "phone_number"
+                else "User with this email already exists"
+            ),
+        )
+
+    if user.referred_by_id is not None:
+        await apply_referral_signups(db, [user.id])
+    if referred:
+        await db.commit()
+
+    audit(
+        "user.register",
+        "user",
+        user.id,
+        actor_id=user.id,
+        metadata={"referred": user.referred_by_id is not None},
+    )
     return user
 
 
@@ -45,15 +137,18 @@ async def authenticate_user(
     *,
     email: str,
     password: str,
+    user_agent: Optional[str] = None,
+    ip: Optional[str] = None,
 ) -> User:
-    user = await get_user_by_email(db, email)
+    user = await get_user_by_email(db, email, load=UserLoad.AUTH)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password",
         )
 
-    if not verify_password(password, user.hashed_password):
+    if not await verify_password_async(password, user.hashed_password):
+        audit("auth.login_failed", "user", user.id, actor_id=user.id)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password",
@@ -65,22 +160,126 @@ async def authenticate_user(
             detail="User account is inactive",
         )
 
-    # Attach JWT dynamically (not persisted)
-    user.access_token = create_access_token(subject=user.email)
+    if settings.PASSWORD_REHASH_ON_LOGIN and password_needs_update(user.hashed_password):
+        schedule_rehash(user.id, user.hashed_password, password)
+
+    # Attach tokens dynamically (not persisted). Sessions live in
+    # Redis; without it the login still succeeds, with an access
+    # token only (no refresh token, no sid claim).
+    try:
+        session_id, user.refresh_token = await open_session(
+            user.id,
+            user.email,
+            user_agent=user_agent,
+            ip=ip,
+        )
+    except Exception as exc:  # noqa: BLE001 - fail open
+        logger.warning("Login without a session for user %s: %s", user.id, exc)
+        session_id, user.refresh_token = None, None
+
+    user.access_token = create_access_token(
+        subject=user.email,
+        extra_claims={"sid": session_id} if session_id else None,
+    )
+    audit("auth.login", "user", user.id, actor_id=user.id, metadata={"sid": session_id})
     return user
 
 
+# --------------------------------------------------
+# Transparent rehash
+# --------------------------------------------------
+# Strong references: the event loop only keeps weak ones to tasks
+_rehash_tasks: set[asyncio.Task] = set()
+
+
+async def _rehash_password(user_id: uuid.UUID, old_hash: str, password: str) -> None:
+    try:
+        new_hash = await hash_password_async(password)
+        async with get_sessionmaker()() as db:
+            replaced = await replace_password_hash(
+                db,
+                user_id,
+                old_hash=old_hash,
+                new_hash=new_hash,
+            )
+    except Exception:  # noqa: BLE001 - retried on the next login
+        logger.exception("Rehashing the password of user %s failed", user_id)
+        return
+
+    if replaced:
+        audit("auth.password_rehashed", "user", user_id, actor_id=user_id)
+
+
+def schedule_rehash(user_id: uuid.UUID, old_hash: str, password: str) -> None:
+    """
+    Upgrade a below-policy hash after the login response is sent;
+    the login itself never pays for the second hash.
+    """
+    task = asyncio.get_running_loop().create_task(
+        _rehash_password(user_id, old_hash, password)
+    )
+    _rehash_tasks.add(task)
+    task.add_done_callback(_rehash_tasks.discard)
+
+
+async def wait_for_rehashes() -> None:
+    if _rehash_tasks:
+        await asyncio.gather(*_rehash_tasks, return_exceptions=True)
+
+
+# --------------------------------------------------
+# Refresh (rotating refresh tokens)
+# --------------------------------------------------
+async def refresh_session(
+    db: AsyncSession,
+    refresh_token: str,
+) -> dict:
+    """
+    Trade a refresh token for a new access/refresh pair. Costs a
+    Redis script call and a (usually cached) principal lookup
+    instead of a password verify.
+    """
+    rotated = await rotate_refresh_token(refresh_token)
+
+    if rotated.status is RotateStatus.reused:
+        audit(
+            "auth.refresh_reuse_detected",
+            "session",
+            rotated.session_id,
+            actor_id=rotated.user_id,
+        )
+    if rotated.status is not RotateStatus.rotated:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid refresh token",
+        )
+
+    user = await get_user_principal(db, rotated.email)
+    if user is None or not user.is_active:
+        await revoke_sessions(rotated.user_id, [rotated.session_id])
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid refresh token",
+        )
+
+    return {
+        "access_token": create_access_token(
+            subject=user.email,
+            extra_claims={"sid": rotated.session_id},
+        ),
+        "refresh_token": rotated.refresh_token,
+        "token_type": "bearer",
+        "expires_in": settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+    }
+
+
 # --------------------------------------------------
 # Current user dependency
 # --------------------------------------------------
-async def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db: AsyncSession = Depends(get_db),
-) -> User:
+async def _token_claims(token: str) -> dict:
     try:
         payload = decode_access_token(token)
-        email: str | None = payload.get("sub")
-        if not email:
+        if not payload.get("sub"):
             raise ValueError("Missing subject")
     except Exception:
         raise HTTPException(
@@ -89,11 +288,135 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    user = await get_user_by_email(db, email)
+    # Revoking a session (or refresh-token reuse) ends its access
+    # tokens too, not only the refresh token
+    sid = payload.get("sid")
+    if sid and not await session_is_live(sid):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Session has been revoked",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return payload
+
+
+async def get_current_user(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_db),
+) -> User:
+    payload = await _token_claims(token)
+
+    user = await get_user_principal(db, payload["sub"])
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found",
         )
 
+    # Session the token was issued for (None for pre-session tokens)
+    user.session_id = payload.get("sid")
+    return user
+
+
+async def get_current_principal(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_db),
+) -> dict:
+    """
+    Like get_current_user, but returns the encoded principal dict
+    without building a User (for read-only endpoints).
+    """
+    payload = await _token_claims(token)
+
+    principal = await get_principal_data(db, payload["sub"])
+    if principal is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User not found",
+        )
+    return principal
+
+
+# --------------------------------------------------
+# Admin-only dependency
+# --------------------------------------------------
+async def get_current_admin(
+    current_user: User = Depends(get_current_user),
+) -> User:
+    if current_user.role != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin privileges required",
+        )
+
+    return current_user
+
+
+# --------------------------------------------------
+# Email verification
+# --------------------------------------------------
+# The hot path only touches Redis; the Postgres audit trail (if
+# enabled) and the email itself go through Celery.
+_VERIFY_ERRORS = {
+    VerifyResult.invalid: (status.HTTP_400_BAD_REQUEST, "Invalid verification code"),
+    VerifyResult.expired: (status.HTTP_410_GONE, "Verification code expired or not requested"),
+    VerifyResult.too_many_attempts: (
+        status.HTTP_429_TOO_MANY_REQUESTS,
+        "Too many attempts, request a new code",
+    ),
+}
+
+
+async def request_email_verification(user: User) -> int:
+    """
+    Issue a code and queue the email. Returns the code lifetime
+    in seconds.
+    """
+    from app.tasks.email_tasks import send_verification_code_task
+    from app.tasks.verification_tasks import record_code_issued_task
+
+    if user.is_email_verified:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Email already verified",
+        )
+
+    issued = await issue_code(user.id)
+    if issued.code is None:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Verification code recently sent",
+            headers={"Retry-After": str(issued.retry_after)},
+        )
+
+    ttl = settings.EMAIL_VERIFICATION_CODE_TTL_SECONDS
+    # Publishing to the broker is blocking I/O
+    await asyncio.to_thread(send_verification_code_task.delay, user.email, issued.code)
+    if settings.EMAIL_VERIFICATION_AUDIT:
+        expires_at = datetime.now(timezone.utc) + timedelta(seconds=ttl)
+        await asyncio.to_thread(
+            record_code_issued_task.delay, str(user.id), expires_at.isoformat()
+        )
+    return ttl
+
+
+async def confirm_email_verification(
+    db: AsyncSession,
+    user: User,
+    code: str,
+) -> User:
+    from app.tasks.verification_tasks import record_code_used_task
+
+    if user.is_email_verified:
+        return user
+
+    result = await verify_code(user.id, code)
+    if result is not VerifyResult.verified:
+        status_code, detail = _VERIFY_ERRORS[result]
+        raise HTTPException(status_code=status_code, detail=detail)
+
+    user = await set_email_verified(db, user)
+    audit("user.email_verified", "user", user.id, actor_id=user.id)
+    if settings.EMAIL_VERIFICATION_AUDIT:
+        await asyncio.to_thread(record_code_used_task.delay, str(user.id))
     return user
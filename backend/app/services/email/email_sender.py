@@ -0,0 +1,143 @@
+import smtplib
+import threading
+import time
+from email.message import EmailMessage
+from typing import Optional
+
+from app.core.config import settings
+
+
+# SMTPException subclasses OSError: anything other than a server
+# reply to this message means the session itself is unusable.
+def is_connection_error(exc: BaseException) -> bool:
+    return isinstance(exc, OSError) and not isinstance(
+        exc,
+        (smtplib.SMTPResponseException, smtplib.SMTPRecipientsRefused),
+    )
+
+
+def build_message(to: str, subject: str, body: str) -> EmailMessage:
+    message = EmailMessage()
+    message["From"] = settings.EMAIL_FROM
+    message["To"] = to
+    message["Subject"] = subject
+    message.set_content(body)
+    return message
+
+
+# --------------------------------------------------
+# Pooled connection
+# --------------------------------------------------
+class SMTPConnection:
+    """
+    One long-lived SMTP session reused across messages.
+
+    The connection is opened lazily and checked with NOOP only
+    after sitting idle. It is rotated after
+    ``EMAIL_MAX_MESSAGES_PER_CONNECTION`` messages and reopened
+    once, transparently, if the server dropped it.
+    """
+
+    def __init__(self) -> None:
+        self._smtp: Optional[smtplib.SMTP] = None
+        self._last_used = 0.0
+        self._sent = 0
+
+        self.connections_opened = 0
+
+    def _open(self) -> smtplib.SMTP:
+        smtp_class = smtplib.SMTP_SSL if settings.SMTP_USE_SSL else smtplib.SMTP
+        smtp = smtp_class(
+            settings.SMTP_HOST,
+            settings.SMTP_PORT,
+            timeout=settings.SMTP_TIMEOUT_SECONDS,
+        )
+        if settings.SMTP_STARTTLS and not settings.SMTP_USE_SSL:
+            smtp.starttls()
+        if settings.SMTP_USERNAME:
+            smtp.login(settings.SMTP_USERNAME, settings.SMTP_PASSWORD or "")
+
+        self._sent = 0
+        self.connections_opened += 1
+        return smtp
+
+    def _is_alive(self, smtp: smtplib.SMTP) -> bool:
+        try:
+            return smtp.noop()[0] == 250
+        except OSError:
+            return False
+
+    def _get(self) -> smtplib.SMTP:
+        smtp = self._smtp
+        if smtp is not None:
+            stale = self._sent >= settings.EMAIL_MAX_MESSAGES_PER_CONNECTION
+            idle = time.monotonic() - self._last_used
+            if stale or (
+                idle >= settings.EMAIL_SMTP_IDLE_CHECK_SECONDS
+                and not self._is_alive(smtp)
+            ):
+                self.close()
+                smtp = None
+
+        if smtp is None:
+            smtp = self._smtp = self._open()
+        return smtp
+
+    def send(self, message: EmailMessage) -> None:
+        for attempt in (1, 2):
+            smtp = self._get()
+            try:
+                smtp.send_message(message)
+            except OSError as exc:
+                if is_connection_error(exc):
+                    self.close()
+                    if attempt == 1:
+                        continue
+                    raise
+
+                # Message-level rejection: keep the session usable
+                try:
+                    smtp.rset()
+                except OSError:
+                    self.close()
+                raise
+
+            self._sent += 1
+            self._last_used = time.monotonic()
+            return
+
+    def close(self) -> None:
+        smtp, self._smtp = self._smtp, None
+        if smtp is None:
+            return
+        try:
+            smtp.quit()
+        except (smtplib.SMTPException, OSError):
+            smtp.close()
+
+
+_local = threading.local()
+
+
+def get_connection() -> SMTPConnection:
+    """
+    The calling thread's pooled SMTP connection (one per Celery
+    worker process under the prefork pool).
+    """
+    connection = getattr(_local, "connection", None)
+    if connection is None:
+        connection = _local.connection = SMTPConnection()
+    return connection
+
+
+def close_connection() -> None:
+    connection = getattr(_local, "connection", None)
+    if connection is not None:
+        connection.close()
+
+
+# --------------------------------------------------
+# Public API
+# --------------------------------------------------
+def send_email(to: str, subject: str, body: str) -> None:
+    get_connection().send(build_message(to, subject, body))
@@ -0,0 +1,302 @@
+import json
+import logging
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+import redis
+
+from app.core.config import settings
+from app.core.redis import get_sync_redis
+from app.services.email.email_sender import (
+    build_message,
+    get_connection,
+    is_connection_error,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+# --------------------------------------------------
+# Redis layout
+# --------------------------------------------------
+# email:outbox    HASH   dedup key -> message JSON (pending messages)
+# email:queue     LIST   dedup keys ready to send
+# email:inflight  ZSET   dedup keys claimed by a worker, scored by the
+#                        time their lease expires
+# email:retry     ZSET   dedup keys waiting for a retry, scored by due time
+# email:dead      LIST   messages that exhausted their attempts (capped)
+#
+# A message stays in the outbox hash from enqueue until it is sent
+# or dead-lettered. Claiming only leases it: a worker that dies
+# mid-batch leaves its keys in email:inflight, and the next
+# deliver_pending() re-queues them once the lease has expired
+# (EMAIL_CLAIM_LEASE_SECONDS). Delivery is therefore at least once.
+#
+# Enqueuing again under the same dedup key while it is pending
+# replaces its content instead of adding a second message, so
+# repeated verification requests collapse into one email that
+# carries the latest code. Content replaced while a worker holds
+# the lease is queued again when that worker releases the key.
+
+OUTBOX_KEY = "email:outbox"
+QUEUE_KEY = "email:queue"
+INFLIGHT_KEY = "email:inflight"
+RETRY_KEY = "email:retry"
+DEAD_KEY = "email:dead"
+DEAD_LETTER_LIMIT = 1000
+
+_ENQUEUE = """
+if redis.call('HSET', KEYS[1], ARGV[1], ARGV[2]) == 1 then
+    redis.call('RPUSH', KEYS[2], ARGV[1])
+    return 1
+end
+return 0
+"""
+
+_CLAIM = """
+local keys = redis.call('LPOP', KEYS[1], ARGV[1])
+if not keys then
+    return {}
+end
+local messages = {}
+for _, key in ipairs(keys) do
+    local message = redis.call('HGET', KEYS[2], key)
+    if message then
+        redis.call('ZADD', KEYS[3], ARGV[2], key)
+        table.insert(messages, message)
+    end
+end
+return messages
+"""
+
+# Due retries and expired leases go back onto the queue
+_PROMOTE_DUE = """
+local counts = {}
+for i, source in ipairs({KEYS[1], KEYS[2]}) do
+    local keys = redis.call('ZRANGEBYSCORE', source, '-inf', ARGV[1], 'LIMIT', 0, ARGV[2])
+    for _, key in ipairs(keys) do
+        redis.call('ZREM', source, key)
+        redis.call('RPUSH', KEYS[3], key)
+    end
+    counts[i] = #keys
+end
+return counts
+"""
+
+# Sent: drop the message unless a newer one took its key, which is
+# then queued (unless the lease expired and it was queued already)
+_ACK = """
+local leased = redis.call('ZREM', KEYS[2], ARGV[1])
+local current = redis.call('HGET', KEYS[1], ARGV[1])
+if current == ARGV[2] then
+    redis.call('HDEL', KEYS[1], ARGV[1])
+    return 1
+end
+if current and leased == 1 then
+    redis.call('RPUSH', KEYS[3], ARGV[1])
+end
+return 0
+"""
+
+# Failed: schedule a retry (ARGV[4] = due time) or, with ARGV[5]
+# set, dead-letter it. A lost lease means the key was re-queued
+# already; a newer message under the key is queued instead.
+_RELEASE = """
+if redis.call('ZREM', KEYS[2], ARGV[1]) == 0 then
+    return 0
+end
+local current = redis.call('HGET', KEYS[1], ARGV[1])
+if current ~= ARGV[2] then
+    if current then
+        redis.call('RPUSH', KEYS[3], ARGV[1])
+    end
+elseif ARGV[5] ~= '' then
+    redis.call('HDEL', KEYS[1], ARGV[1])
+else
+    redis.call('HSET', KEYS[1], ARGV[1], ARGV[3])
+    redis.call('ZADD', KEYS[4], ARGV[4], ARGV[1])
+end
+if ARGV[5] ~= '' then
+    redis.call('LPUSH', KEYS[5], ARGV[5])
+    redis.call('LTRIM', KEYS[5], 0, tonumber(ARGV[6]) - 1)
+end
+return 1
+"""
+
+
+_scripts: dict[str, Any] = {}
+
+
+def _script(client: redis.Redis, source: str):
+    script = _scripts.get(source)
+    if script is None or script.registered_client is not client:
+        script = _scripts[source] = client.register_script(source)
+    return script
+
+
+# --------------------------------------------------
+# Enqueue
+# --------------------------------------------------
+def enqueue_email(
+    to: str,
+    subject: str,
+    body: str,
+    *,
+    dedup_key: Optional[str] = None,
+) -> bool:
+    """
+    Queue a message for batched delivery.
+
+    Returns False when a pending message with the same dedup key
+    was replaced rather than a new one queued.
+    """
+    message = {
+        "key": dedup_key or f"msg:{uuid.uuid4().hex}",
+        "to": to,
+        "subject": subject,
+        "body": body,
+        "attempts": 0,
+    }
+    client = get_sync_redis()
+    created = _script(client, _ENQUEUE)(
+        keys=[OUTBOX_KEY, QUEUE_KEY],
+        args=[message["key"], json.dumps(message)],
+    )
+    return bool(created)
+
+
+# --------------------------------------------------
+# Delivery
+# --------------------------------------------------
+@dataclass
+class DeliveryReport:
+    sent: int = 0
+    retried: int = 0
+    dead: int = 0
+    batches: int = 0
+    promoted: int = 0
+    reclaimed: int = 0
+    elapsed_seconds: float = 0.0
+    errors: list[str] = field(default_factory=list)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "sent": self.sent,
+            "retried": self.retried,
+            "dead": self.dead,
+            "batches": self.batches,
+            "promoted": self.promoted,
+            "reclaimed": self.reclaimed,
+            "elapsed_seconds": self.elapsed_seconds,
+            "errors": self.errors[:20],
+        }
+
+
+def _backoff(attempts: int) -> float:
+    delay = settings.EMAIL_RETRY_BACKOFF_SECONDS * 2 ** (attempts - 1)
+    return min(delay, settings.EMAIL_RETRY_BACKOFF_MAX_SECONDS)
+
+
+def _release(client: redis.Redis, raw: str, message: dict, exc: Exception, report: DeliveryReport) -> None:
+    message["attempts"] += 1
+    report.errors.append(f"{message['to']}: {exc}")
+
+    dead_entry = ""
+    if message["attempts"] >= settings.EMAIL_MAX_ATTEMPTS:
+        report.dead += 1
+        logger.error(
+            "Dropping email to %s after %d attempts: %s",
+            message["to"], message["attempts"], exc,
+        )
+        dead_entry = json.dumps({**message, "error": str(exc)})
+    else:
+        report.retried += 1
+
+    _script(client, _RELEASE)(
+        keys=[OUTBOX_KEY, INFLIGHT_KEY, QUEUE_KEY, RETRY_KEY, DEAD_KEY],
+        args=[
+            message["key"],
+            raw,
+            json.dumps(message),
+            time.time() + _backoff(message["attempts"]),
+            dead_entry,
+            DEAD_LETTER_LIMIT,
+        ],
+    )
+
+
+def deliver_pending(
+    *,
+    batch_size: Optional[int] = None,
+    max_batches: int = 20,
+) -> DeliveryReport:
+    """
+    Drain the queue in batches over this worker's pooled SMTP
+    connection. Due retries and expired leases are moved back onto
+    the queue first. Each message is leased while it is sent and
+    removed only once it was sent or dead-lettered.
+    """
+    started = time.perf_counter()
+    batch_size = batch_size or settings.EMAIL_BATCH_SIZE
+    client = get_sync_redis()
+    connection = get_connection()
+    report = DeliveryReport()
+
+    report.promoted, report.reclaimed = _script(client, _PROMOTE_DUE)(
+        keys=[RETRY_KEY, INFLIGHT_KEY, QUEUE_KEY],
+        args=[time.time(), batch_size * max_batches],
+    )
+    if report.reclaimed:
+        logger.warning("Re-queued %d emails whose claim expired", report.reclaimed)
+
+    claim = _script(client, _CLAIM)
+    ack = _script(client, _ACK)
+    for _ in range(max_batches):
+        raw_messages = claim(
+            keys=[QUEUE_KEY, OUTBOX_KEY, INFLIGHT_KEY],
+            args=[batch_size, time.time() + settings.EMAIL_CLAIM_LEASE_SECONDS],
+        )
+        if not raw_messages:
+            break
+
+        report.batches += 1
+        messages = [(raw, json.loads(raw)) for raw in raw_messages]
+        for index, (raw, message) in enumerate(messages):
+            try:
+                connection.send(
+                    build_message(message["to"], message["subject"], message["body"])
+                )
+            except Exception as exc:  # noqa: BLE001 - retried with backoff
+                if not is_connection_error(exc):
+                    _release(client, raw, message, exc, report)
+                    continue
+
+                # Server unreachable: back off the rest of the batch
+                # instead of paying a connect timeout per message.
+                for pending_raw, pending in messages[index:]:
+                    _release(client, pending_raw, pending, exc, report)
+                report.elapsed_seconds = time.perf_counter() - started
+                return report
+            else:
+                ack(keys=[OUTBOX_KEY, INFLIGHT_KEY, QUEUE_KEY], args=[message["key"], raw])
+                report.sent += 1
+
+        if len(raw_messages) < batch_size:
+            break
+
+    report.elapsed_seconds = time.perf_counter() - started
+    return report
+
+
+def outbox_stats() -> dict[str, int]:
+    client = get_sync_redis()
+    pipe = client.pipeline()
+    pipe.llen(QUEUE_KEY)
+    pipe.zcard(INFLIGHT_KEY)
+    pipe.zcard(RETRY_KEY)
+    pipe.llen(DEAD_KEY)
+    queued, in_flight, retrying, dead = pipe.execute()
+    return {"queued": queued, "in_flight": in_flight, "retrying": retrying, "dead": dead}
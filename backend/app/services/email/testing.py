@@ -0,0 +1,137 @@
+"""
+In-process SMTP stand-in for local runs and benchmarks.
+
+    with LocalSMTPServer() as server:
+        settings.SMTP_HOST, settings.SMTP_PORT = server.host, server.port
+        send_email(...)
+        assert server.messages[0].rcpt_tos == [...]
+
+Implements just enough of RFC 5321 for smtplib (HELO/EHLO, MAIL,
+RCPT, DATA, RSET, NOOP, QUIT). Nothing is relayed.
+"""
+
+import socketserver
+import threading
+from dataclasses import dataclass, field
+from typing import Optional
+
+
+@dataclass
+class ReceivedMessage:
+    mail_from: str
+    rcpt_tos: list[str] = field(default_factory=list)
+    data: bytes = b""
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    server: "_SMTPServer"
+
+    def _reply(self, line: str) -> None:
+        self.wfile.write(line.encode() + b"\r\n")
+
+    def handle(self) -> None:
+        self.server.connections += 1
+        self._reply("220 localhost POSTIKA test SMTP")
+        envelope: Optional[ReceivedMessage] = None
+
+        while True:
+            raw = self.rfile.readline()
+            if not raw:
+                return
+            line = raw.decode("utf-8", "replace").rstrip("\r\n")
+            verb, _, arg = line.partition(" ")
+            verb = verb.upper()
+
+            if verb == "EHLO":
+                self._reply("250-localhost")
+                self._reply("250 8BITMIME")
+            elif verb == "HELO":
+                self._reply("250 localhost")
+            elif verb == "MAIL":
+                envelope = ReceivedMessage(mail_from=arg.partition(":")[2].strip(" <>"))
+                self._reply("250 OK")
+            elif verb == "RCPT":
+                if envelope is None:
+                    self._reply("503 Need MAIL first")
+                    continue
+                envelope.rcpt_tos.append(arg.partition(":")[2].strip(" <>"))
+                self._reply("250 OK")
+            elif verb == "DATA":
+                if envelope is None or not envelope.rcpt_tos:
+                    self._reply("503 Need RCPT first")
+                    continue
+                self._reply("354 End data with <CR><LF>.<CR><LF>")
+                chunks = []
+                while True:
+                    data_line = self.rfile.readline()
+                    if not data_line or data_line in (b".\r\n", b".\n"):
+                        break
+                    if data_line.startswith(b".."):
+                        data_line = data_line[1:]
+                    chunks.append(data_line)
+                envelope.data = b"".join(chunks)
+                self.server.record(envelope)
+                envelope = None
+                self._reply("250 OK queued")
+            elif verb == "RSET":
+                envelope = None
+                self._reply("250 OK")
+            elif verb == "NOOP":
+                self._reply("250 OK")
+            elif verb == "QUIT":
+                self._reply("221 Bye")
+                return
+            else:
+                self._reply("502 Command not implemented")
+
+
+class _SMTPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, address: tuple[str, int]) -> None:
+        super().__init__(address, _SMTPHandler)
+        self.messages: list[ReceivedMessage] = []
+        self.connections = 0
+        self._lock = threading.Lock()
+
+    def record(self, message: ReceivedMessage) -> None:
+        with self._lock:
+            self.messages.append(message)
+
+
+class LocalSMTPServer:
+    def __init__(self, host: str = "127.0.0.1", port: int = 0) -> None:
+        self._server = _SMTPServer((host, port))
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def host(self) -> str:
+        return self._server.server_address[0]
+
+    @property
+    def port(self) -> int:
+        return self._server.server_address[1]
+
+    @property
+    def messages(self) -> list[ReceivedMessage]:
+        return self._server.messages
+
+    @property
+    def connections(self) -> int:
+        return self._server.connections
+
+    def start(self) -> "LocalSMTPServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "LocalSMTPServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
@@ -0,0 +1,123 @@
+import asyncio
+import hashlib
+import hmac
+from collections import deque
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+
+
+# --------------------------------------------------
+# Encoding
+# --------------------------------------------------
+# A sequence number is pushed through a keyed Feistel permutation
+# of the 60-bit space and written as 12 Crockford base32 chars.
+# The permutation is a bijection, so distinct numbers always give
+# distinct codes (no collision retries), while consecutive numbers
+# give unrelated-looking codes.
+
+CODE_LENGTH = 12
+ALPHABET = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+
+_HALF_BITS = 30
+_HALF_MASK = (1 << _HALF_BITS) - 1
+_ROUNDS = 4
+
+
+def _key() -> bytes:
+    secret = settings.REFERRAL_CODE_SECRET or settings.SECRET_KEY
+    return hashlib.sha256(f"referral-code:{secret}".encode()).digest()
+
+
+def _permute(number: int, key: bytes) -> int:
+    left, right = number >> _HALF_BITS, number & _HALF_MASK
+    for round_no in range(_ROUNDS):
+        digest = hmac.new(
+            key,
+            bytes([round_no]) + right.to_bytes(4, "big"),
+            hashlib.sha256,
+        ).digest()
+        left, right = right, left ^ (int.from_bytes(digest[:4], "big") & _HALF_MASK)
+    return (left << _HALF_BITS) | right
+
+
+def encode_referral_code(number: int, key: Optional[bytes] = None) -> str:
+    if not 0 <= number < 1 << (2 * _HALF_BITS):
+        raise ValueError("referral code number out of range")
+
+    value = _permute(number, key or _key())
+    chars = []
+    for _ in range(CODE_LENGTH):
+        chars.append(ALPHABET[value & 31])
+        value >>= 5
+    return "".join(reversed(chars))
+
+
+# --------------------------------------------------
+# Allocator
+# --------------------------------------------------
+class ReferralCodeAllocator:
+    """
+    Hands out referral codes from an in-memory block of numbers
+    reserved from ``referral_code_seq``.
+
+    One ``nextval`` round trip reserves a whole block, so most
+    signups allocate a code without touching the database. Numbers
+    left unused when a process exits are simply skipped.
+    """
+
+    def __init__(self, block_size: Optional[int] = None) -> None:
+        self._block_size = block_size
+        self._numbers: deque[int] = deque()
+        self._key: Optional[bytes] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self._lock_loop: Optional[asyncio.AbstractEventLoop] = None
+
+        self.blocks_reserved = 0
+        self.codes_issued = 0
+
+    @property
+    def block_size(self) -> int:
+        return self._block_size or settings.REFERRAL_CODE_BLOCK_SIZE
+
+    def _get_lock(self) -> asyncio.Lock:
+        loop = asyncio.get_running_loop()
+        if self._lock is None or self._lock_loop is not loop:
+            self._lock = asyncio.Lock()
+            self._lock_loop = loop
+        return self._lock
+
+    async def _reserve(self, db: AsyncSession, count: int) -> None:
+        result = await db.execute(
+            text(
+                "SELECT nextval('referral_code_seq') "
+                "FROM generate_series(1, :count)"
+            ),
+            {"count": count},
+        )
+        self._numbers.extend(result.scalars())
+        self.blocks_reserved += 1
+
+    async def take(self, db: AsyncSession, count: int = 1) -> list[str]:
+        if self._key is None:
+            self._key = _key()
+
+        async with self._get_lock():
+            if len(self._numbers) < count:
+                await self._reserve(
+                    db,
+                    max(self.block_size, count - len(self._numbers)),
+                )
+            numbers = [self._numbers.popleft() for _ in range(count)]
+
+        self.codes_issued += count
+        return [encode_referral_code(n, self._key) for n in numbers]
+
+    async def next_code(self, db: AsyncSession) -> str:
+        return (await self.take(db, 1))[0]
+
+
+referral_code_allocator = ReferralCodeAllocator()
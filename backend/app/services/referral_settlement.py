@@ -0,0 +1,141 @@
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from sqlalchemy import String, cast, func, insert, literal, select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import get_sync_sessionmaker
+from app.models.audit_log import AuditLog
+from app.models.referral import Referral
+
+
+logger = logging.getLogger(__name__)
+
+
+# Matches the partial index ix_referrals_unpaid_triggered
+_UNPAID = (
+    ~Referral.reward_paid,
+    Referral.triggered_at.is_not(None),
+)
+
+
+@dataclass
+class SettlementReport:
+    settled: int = 0
+    amount_kes: int = 0
+    chunks: int = 0
+    elapsed_seconds: float = 0.0
+    backlog: int = 0
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "settled": self.settled,
+            "amount_kes": self.amount_kes,
+            "chunks": self.chunks,
+            "elapsed_seconds": self.elapsed_seconds,
+            "settled_per_second": (
+                self.settled / self.elapsed_seconds if self.elapsed_seconds else 0.0
+            ),
+            "backlog": self.backlog,
+        }
+
+
+def settlement_backlog(session: Session) -> int:
+    """
+    Triggered referrals still unpaid (an index-only count).
+    """
+    return session.scalar(select(func.count()).select_from(Referral).where(*_UNPAID))
+
+
+def settle_chunk(session: Session, chunk_size: int) -> tuple[int, int]:
+    """
+    Claim and pay up to ``chunk_size`` referrals in one statement.
+
+    Rows locked by another worker are skipped, not waited on, so
+    any number of workers can run this concurrently. Paying is the
+    unpaid -> paid transition itself (plus its audit rows, in the
+    same transaction), so a retried or duplicated run can never pay
+    a referral twice. Returns (count, total KES).
+    """
+    claim = (
+        select(Referral.id)
+        .where(*_UNPAID)
+        .order_by(Referral.triggered_at, Referral.id)
+        .limit(chunk_size)
+        .with_for_update(skip_locked=True)
+    )
+    claimed = (
+        update(Referral)
+        .where(Referral.id.in_(claim), ~Referral.reward_paid)
+        .values(reward_paid=True, paid_at=func.now())
+        .returning(
+            Referral.id,
+            Referral.referrer_id,
+            Referral.referred_id,
+            Referral.reward_amount_kes,
+        )
+        .cte("claimed")
+    )
+
+    stmt = select(
+        func.count(),
+        func.coalesce(func.sum(claimed.c.reward_amount_kes), 0),
+    ).select_from(claimed)
+
+    if settings.AUDIT_LOG_ENABLED:
+        logged = insert(AuditLog.__table__).from_select(
+            ["actor_id", "action_type", "resource_type", "resource_id", "metadata"],
+            select(
+                claimed.c.referrer_id,
+                literal("referral.reward_paid"),
+                literal("referral"),
+                cast(claimed.c.id, String),
+                func.jsonb_build_object(
+                    "referred_id", claimed.c.referred_id,
+                    "amount_kes", claimed.c.reward_amount_kes,
+                ),
+            ),
+        )
+        stmt = stmt.add_cte(logged.cte("logged"))
+
+    count, amount = session.execute(stmt).one()
+    session.commit()
+    return count, amount
+
+
+def settle_rewards(
+    *,
+    chunk_size: Optional[int] = None,
+    max_chunks: Optional[int] = None,
+) -> SettlementReport:
+    """
+    Settle chunk after chunk until the queue is drained (for this
+    worker) or ``max_chunks`` is reached.
+    """
+    chunk_size = chunk_size or settings.REFERRAL_SETTLEMENT_CHUNK_SIZE
+    max_chunks = max_chunks or settings.REFERRAL_SETTLEMENT_MAX_CHUNKS
+    report = SettlementReport()
+    started = time.perf_counter()
+
+    with get_sync_sessionmaker()() as session:
+        for _ in range(max_chunks):
+            count, amount = settle_chunk(session, chunk_size)
+            if not count:
+                break
+            report.chunks += 1
+            report.settled += count
+            report.amount_kes += amount
+            if count < chunk_size:
+                break
+
+        report.elapsed_seconds = time.perf_counter() - started
+        report.backlog = settlement_backlog(session)
+
+    logger.info(
+        "Settled %d referral rewards (%d KES) in %.2fs, backlog %d",
+        report.settled, report.amount_kes, report.elapsed_seconds, report.backlog,
+    )
+    return report
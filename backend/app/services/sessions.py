@@ -0,0 +1,268 @@
+import enum
+import hashlib
+import logging
+import secrets
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from app.core.cache import LRUTTLCache
+from app.core.config import settings
+from app.core.redis import get_redis
+
+
+logger = logging.getLogger(__name__)
+
+
+# --------------------------------------------------
+# Redis layout
+# --------------------------------------------------
+# session:{sid}          HASH  user_id, email, token (hash of the
+#                              current refresh secret), created_at,
+#                              last_used_at, user_agent, ip
+#                              TTL = REFRESH_TOKEN_TTL_DAYS, renewed
+#                              on every rotation
+# user_sessions:{uid}    ZSET  sid -> created_at
+#
+# A refresh token is "{sid}.{secret}"; only a hash of the secret is
+# stored. Each refresh replaces the secret (rotation). Presenting a
+# secret that is no longer current means the token was copied, so
+# the whole session is revoked (reuse detection).
+#
+# Access tokens carry the session id ("sid"); get_current_user
+# rejects them once their session is gone (session_is_live), so
+# revoking a session also ends its access token within
+# SESSION_CHECK_CACHE_SECONDS.
+
+_SESSION_KEY = "session:{sid}"
+_USER_SESSIONS_KEY = "user_sessions:{user_id}"
+
+_ROTATE = """
+local user_id = redis.call('HGET', KEYS[1], 'user_id')
+if not user_id then
+    return {-1}
+end
+if redis.call('HGET', KEYS[1], 'token') ~= ARGV[1] then
+    redis.call('DEL', KEYS[1])
+    return {-2, user_id}
+end
+redis.call('HSET', KEYS[1], 'token', ARGV[2], 'last_used_at', ARGV[3])
+redis.call('EXPIRE', KEYS[1], ARGV[4])
+return {1, user_id, redis.call('HGET', KEYS[1], 'email')}
+"""
+
+
+class RotateStatus(str, enum.Enum):
+    rotated = "rotated"
+    unknown = "unknown"
+    reused = "reused"
+
+
+@dataclass
+class RotateResult:
+    status: RotateStatus
+    session_id: Optional[str] = None
+    user_id: Optional[uuid.UUID] = None
+    email: Optional[str] = None
+    refresh_token: Optional[str] = None
+
+
+def _hash_secret(secret: str) -> str:
+    return hashlib.sha256(secret.encode()).hexdigest()
+
+
+def _new_secret() -> str:
+    return secrets.token_urlsafe(32)
+
+
+def _ttl_seconds() -> int:
+    return settings.REFRESH_TOKEN_TTL_DAYS * 86400
+
+
+# Positive answers only: a revoked session is never cached as live
+_live_sessions = LRUTTLCache(
+    settings.SESSION_CHECK_CACHE_MAX_ENTRIES,
+    settings.SESSION_CHECK_CACHE_SECONDS,
+)
+
+# After a Redis error the session check is skipped (fail open) for
+# this long, like TwoTierCache and RateLimiter, so a partition does
+# not cost every authenticated request a socket timeout
+_SESSION_CHECK_BACKOFF_SECONDS = 5.0
+_session_check_disabled_until = 0.0
+
+
+def split_refresh_token(token: str) -> Optional[tuple[str, str]]:
+    sid, _, secret = token.partition(".")
+    if not sid or not secret:
+        return None
+    return sid, secret
+
+
+# --------------------------------------------------
+# Sessions
+# --------------------------------------------------
+async def open_session(
+    user_id: uuid.UUID,
+    email: str,
+    *,
+    user_agent: Optional[str] = None,
+    ip: Optional[str] = None,
+) -> tuple[str, str]:
+    """
+    Start a session. Returns (session id, refresh token). The
+    oldest sessions beyond MAX_SESSIONS_PER_USER are revoked.
+    """
+    client = get_redis()
+    sid = secrets.token_urlsafe(12)
+    secret = _new_secret()
+    now = int(time.time())
+    user_key = _USER_SESSIONS_KEY.format(user_id=user_id)
+
+    pipe = client.pipeline(transaction=True)
+    pipe.hset(
+        _SESSION_KEY.format(sid=sid),
+        mapping={
+            "user_id": str(user_id),
+            "email": email,
+            "token": _hash_secret(secret),
+            "created_at": now,
+            "last_used_at": now,
+            "user_agent": (user_agent or "")[:200],
+            "ip": ip or "",
+        },
+    )
+    pipe.expire(_SESSION_KEY.format(sid=sid), _ttl_seconds())
+    pipe.zadd(user_key, {sid: now})
+    pipe.expire(user_key, _ttl_seconds())
+    pipe.zrange(user_key, 0, -settings.MAX_SESSIONS_PER_USER - 1)
+    *_, evicted = await pipe.execute()
+
+    if evicted:
+        await revoke_sessions(user_id, evicted)
+    return sid, f"{sid}.{secret}"
+
+
+async def rotate_refresh_token(token: str) -> RotateResult:
+    parts = split_refresh_token(token)
+    if parts is None:
+        return RotateResult(RotateStatus.unknown)
+    sid, secret = parts
+
+    client = get_redis()
+    new_secret = _new_secret()
+    result = await client.eval(
+        _ROTATE,
+        1,
+        _SESSION_KEY.format(sid=sid),
+        _hash_secret(secret),
+        _hash_secret(new_secret),
+        int(time.time()),
+        _ttl_seconds(),
+    )
+
+    code = int(result[0])
+    if code == -1:
+        return RotateResult(RotateStatus.unknown, session_id=sid)
+    if code == -2:
+        _live_sessions.delete(sid)
+        user_id = uuid.UUID(result[1])
+        await client.zrem(_USER_SESSIONS_KEY.format(user_id=user_id), sid)
+        return RotateResult(RotateStatus.reused, session_id=sid, user_id=user_id)
+    return RotateResult(
+        RotateStatus.rotated,
+        session_id=sid,
+        user_id=uuid.UUID(result[1]),
+        email=result[2],
+        refresh_token=f"{sid}.{new_secret}",
+    )
+
+
+async def list_sessions(user_id: uuid.UUID) -> list[dict[str, Any]]:
+    """
+    Live sessions, newest first. Entries whose session expired are
+    pruned from the index on the way.
+    """
+    client = get_redis()
+    user_key = _USER_SESSIONS_KEY.format(user_id=user_id)
+    sids = await client.zrevrange(user_key, 0, -1)
+    if not sids:
+        return []
+
+    pipe = client.pipeline(transaction=False)
+    for sid in sids:
+        pipe.hgetall(_SESSION_KEY.format(sid=sid))
+    rows = await pipe.execute()
+
+    sessions, expired = [], []
+    for sid, data in zip(sids, rows):
+        if not data:
+            expired.append(sid)
+            continue
+        sessions.append(
+            {
+                "id": sid,
+                "created_at": int(data["created_at"]),
+                "last_used_at": int(data["last_used_at"]),
+                "user_agent": data.get("user_agent") or None,
+                "ip": data.get("ip") or None,
+            }
+        )
+    if expired:
+        await client.zrem(user_key, *expired)
+    return sessions
+
+
+async def revoke_sessions(user_id: uuid.UUID, session_ids: list[str]) -> int:
+    """
+    Revoke the given sessions of ``user_id``; ids belonging to
+    someone else are ignored. Returns how many were revoked.
+    """
+    client = get_redis()
+    user_key = _USER_SESSIONS_KEY.format(user_id=user_id)
+
+    pipe = client.pipeline(transaction=False)
+    for sid in session_ids:
+        pipe.zscore(user_key, sid)
+    owned = [sid for sid, score in zip(session_ids, await pipe.execute()) if score is not None]
+    if not owned:
+        return 0
+
+    pipe = client.pipeline(transaction=True)
+    pipe.delete(*(_SESSION_KEY.format(sid=sid) for sid in owned))
+    pipe.zrem(user_key, *owned)
+    await pipe.execute()
+    for sid in owned:
+        _live_sessions.delete(sid)
+    return len(owned)
+
+
+async def revoke_all_sessions(user_id: uuid.UUID) -> int:
+    client = get_redis()
+    sids = await client.zrange(_USER_SESSIONS_KEY.format(user_id=user_id), 0, -1)
+    return await revoke_sessions(user_id, sids) if sids else 0
+
+
+async def session_is_live(sid: str) -> bool:
+    """
+    Whether the session an access token was issued for still
+    exists. One EXISTS per SESSION_CHECK_CACHE_SECONDS per session;
+    Redis errors fail open, like the principal cache, and skip the
+    check for _SESSION_CHECK_BACKOFF_SECONDS.
+    """
+    global _session_check_disabled_until
+
+    if _live_sessions.get(sid):
+        return True
+    if time.monotonic() < _session_check_disabled_until:
+        return True
+    try:
+        live = bool(await get_redis().exists(_SESSION_KEY.format(sid=sid)))
+    except Exception as exc:  # noqa: BLE001 - fail open
+        _session_check_disabled_until = time.monotonic() + _SESSION_CHECK_BACKOFF_SECONDS
+        logger.warning("Session check: Redis unavailable (%s)", exc)
+        return True
+    if live:
+        _live_sessions.set(sid, True)
+    return live
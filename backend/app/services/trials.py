@@ -0,0 +1,153 @@
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.crud.user import principal_cache
+from app.db.session import get_sync_sessionmaker
+from app.models.audit_log import AuditLog
+from app.models.user import TierEnum, User
+from app.services.email.outbox import enqueue_email
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class TrialSweepReport:
+    expired: int = 0
+    downgraded: int = 0
+    batches: int = 0
+    elapsed_seconds: float = 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "expired": self.expired,
+            "downgraded": self.downgraded,
+            "batches": self.batches,
+            "elapsed_seconds": self.elapsed_seconds,
+        }
+
+
+def _expired_tier() -> Optional[TierEnum]:
+    tier = settings.TRIAL_EXPIRED_TIER
+    return TierEnum(tier) if tier else None
+
+
+def expire_trials_batch(session: Session, batch_size: int) -> list[Any]:
+    """
+    End up to ``batch_size`` trials whose expiry has passed.
+
+    The candidates come from the partial index on unprocessed
+    trials and are locked with SKIP LOCKED, so the cost tracks
+    the number of expiring users and concurrent sweepers never
+    process the same row. Returns (id, email, previous_tier, tier)
+    rows. Does not commit.
+    """
+    claimed = (
+        select(User.id, User.tier.label("previous_tier"))
+        .where(
+            User.trial_ended_at.is_(None),
+            User.trial_expires_at <= func.now(),
+        )
+        .order_by(User.trial_expires_at)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+        .cte("claimed")
+    )
+
+    values: dict[str, Any] = {"trial_ended_at": func.now()}
+    tier = _expired_tier()
+    if tier is not None:
+        values["tier"] = tier
+
+    result = session.execute(
+        update(User)
+        .where(User.id == claimed.c.id)
+        .values(**values)
+        .returning(User.id, User.email, claimed.c.previous_tier, User.tier)
+        .execution_options(synchronize_session=False)
+    )
+    return result.all()
+
+
+def _record_events(session: Session, rows: list[Any]) -> None:
+    if not settings.AUDIT_LOG_ENABLED:
+        return
+    session.execute(
+        insert(AuditLog.__table__),
+        [
+            {
+                "actor_id": None,
+                "action_type": "user.trial_expired",
+                "resource_type": "user",
+                "resource_id": str(row.id),
+                "metadata": {
+                    "previous_tier": row.previous_tier.value,
+                    "tier": row.tier.value,
+                },
+            }
+            for row in rows
+        ],
+    )
+
+
+def _notify(rows: list[Any]) -> None:
+    for row in rows:
+        # Keyed per user: a re-run cannot queue the email twice
+        enqueue_email(
+            to=row.email,
+            subject="Your POSTIKA trial has ended",
+            body=(
+                "Your free trial has ended. "
+                "Upgrade any time to keep your premium features."
+            ),
+            dedup_key=f"trial-expired:{row.id}",
+        )
+
+
+def sweep_expired_trials(
+    *,
+    batch_size: Optional[int] = None,
+    max_batches: Optional[int] = None,
+) -> TrialSweepReport:
+    """
+    Expire trials batch by batch. Each batch commits with its audit
+    events, then invalidates the cached principals and queues the
+    notification emails.
+    """
+    batch_size = batch_size or settings.TRIAL_SWEEP_BATCH_SIZE
+    max_batches = max_batches or settings.TRIAL_SWEEP_MAX_BATCHES
+    report = TrialSweepReport()
+    started = time.perf_counter()
+
+    with get_sync_sessionmaker()() as session:
+        for _ in range(max_batches):
+            rows = expire_trials_batch(session, batch_size)
+            if not rows:
+                session.rollback()
+                break
+
+            _record_events(session, rows)
+            session.commit()
+
+            principal_cache.invalidate_shared_sync(*(row.email for row in rows))
+            _notify(rows)
+
+            report.batches += 1
+            report.expired += len(rows)
+            report.downgraded += sum(row.previous_tier != row.tier for row in rows)
+            if len(rows) < batch_size:
+                break
+
+    report.elapsed_seconds = time.perf_counter() - started
+    if report.expired:
+        logger.info(
+            "Expired %d trials (%d downgraded) in %.2fs",
+            report.expired, report.downgraded, report.elapsed_seconds,
+        )
+    return report
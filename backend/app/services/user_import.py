@@ -0,0 +1,245 @@
+import codecs
+import csv
+import json
+import time
+from datetime import datetime
+from typing import Any, AsyncIterable, AsyncIterator, Iterable, Optional
+
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.hashing import password_hasher
+from app.crud.referral_stats import apply_referral_signups
+from app.crud.user import (
+    bulk_insert_users,
+    find_import_conflicts,
+    get_user_ids_by_referral_codes,
+    new_user_values,
+)
+from app.models.user import User
+from app.schemas.user import UserCreate, UserImportFailure, UserImportReport
+from app.services.referral_codes import referral_code_allocator
+from app.utils.passwords import generate_password
+
+
+IMPORT_FORMATS = ("csv", "ndjson")
+
+# asyncpg caps a statement at 32767 bind parameters
+_MAX_BIND_PARAMS = 32767
+_COLUMNS_PER_ROW = len(User.__table__.columns)
+
+
+# --------------------------------------------------
+# Streaming input
+# --------------------------------------------------
+async def aiter_lines(chunks: AsyncIterable[bytes]) -> AsyncIterator[str]:
+    """
+    Split a byte stream (e.g. ``request.stream()``) into text lines
+    without buffering the whole body.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line.rstrip("\r")
+
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending.rstrip("\r")
+
+
+async def aiter_sync(lines: Iterable[str]) -> AsyncIterator[str]:
+    for line in lines:
+        yield line.rstrip("\r\n")
+
+
+async def iter_records(
+    lines: AsyncIterable[str],
+    fmt: str,
+) -> AsyncIterator[tuple[int, Any]]:
+    """
+    Yield ``(line_number, record_or_error)`` for CSV (header row
+    required) or NDJSON input. Records never span lines.
+    """
+    header: Optional[list[str]] = None
+    line_no = 0
+
+    async for line in lines:
+        line_no += 1
+        if not line.strip():
+            continue
+
+        if fmt == "ndjson":
+            try:
+                yield line_no, json.loads(line)
+            except json.JSONDecodeError as exc:
+                yield line_no, ValueError(f"invalid JSON: {exc.msg}")
+            continue
+
+        values = next(csv.reader([line]))
+        if header is None:
+            header = [name.strip() for name in values]
+            continue
+        if len(values) != len(header):
+            yield line_no, ValueError(
+                f"expected {len(header)} columns, got {len(values)}"
+            )
+            continue
+        # Empty CSV cells mean "not provided"
+        yield line_no, {k: v for k, v in zip(header, values) if v != ""}
+
+
+# --------------------------------------------------
+# Import
+# --------------------------------------------------
+def _validation_message(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(p) for p in err['loc']) or 'row'}: {err['msg']}"
+        for err in exc.errors()
+    )
+
+
+class _Importer:
+    def __init__(self, db: AsyncSession, batch_size: int) -> None:
+        self.db = db
+        self.batch_size = max(1, min(batch_size, _MAX_BIND_PARAMS // _COLUMNS_PER_ROW))
+        self.report = UserImportReport()
+        self.batch: list[tuple[int, UserCreate, str]] = []
+
+    def fail(self, line: int, email: Optional[str], error: str) -> None:
+        self.report.failed += 1
+        if len(self.report.failures) < settings.USER_IMPORT_MAX_REPORTED_FAILURES:
+            self.report.failures.append(
+                UserImportFailure(line=line, email=email, error=error)
+            )
+
+    def needs_password_reset(self, email: str) -> None:
+        self.report.password_reset_required += 1
+        if len(self.report.password_reset_emails) < settings.USER_IMPORT_MAX_REPORTED_FAILURES:
+            self.report.password_reset_emails.append(email)
+
+    async def add(self, line: int, record: Any) -> None:
+        self.report.total_rows += 1
+
+        if isinstance(record, Exception):
+            self.fail(line, None, str(record))
+            return
+        if not isinstance(record, dict):
+            self.fail(line, None, "record must be an object")
+            return
+
+        try:
+            payload = UserCreate.model_validate(record)
+        except ValidationError as exc:
+            self.fail(line, record.get("email"), _validation_message(exc))
+            return
+
+        self.batch.append((line, payload, payload.password or generate_password()))
+        if len(self.batch) >= self.batch_size:
+            await self.flush()
+
+    async def flush(self) -> None:
+        batch, self.batch = self.batch, []
+        if not batch:
+            return
+
+        hashes = await password_hasher.hash_many([password for _, _, password in batch])
+
+        referrers = await get_user_ids_by_referral_codes(
+            self.db,
+            {p.referral_code for _, p, _ in batch if p.referral_code},
+        )
+
+        now = datetime.utcnow()
+        codes = await referral_code_allocator.take(self.db, len(batch))
+        rows: list[dict[str, Any]] = []
+        lines: dict[str, int] = {}
+        generated: set[str] = set()
+
+        for (line, payload, _), hashed, code in zip(batch, hashes, codes):
+            if payload.email in lines:
+                self.fail(line, payload.email, "duplicate email in import")
+                continue
+
+            referred_by_id = None
+            if payload.referral_code:
+                referred_by_id = referrers.get(payload.referral_code)
+                if referred_by_id is None:
+                    self.fail(line, payload.email, "unknown referral code")
+                    continue
+
+            rows.append(
+                new_user_values(
+                    payload,
+                    hashed_password=hashed,
+                    referral_code=code,
+                    referred_by_id=referred_by_id,
+                    now=now,
+                )
+            )
+            lines[payload.email] = line
+            if payload.password is None:
+                generated.add(payload.email)
+
+        inserted = await bulk_insert_users(self.db, rows)
+        await apply_referral_signups(
+            self.db,
+            [
+                row["id"]
+                for row in rows
+                if row["email"] in inserted and row.get("referred_by_id")
+            ],
+        )
+        await self.db.commit()
+
+        self.report.inserted += len(inserted)
+        # The generated password is never shown to anyone
+        for email in sorted(generated & inserted):
+            self.needs_password_reset(email)
+
+        skipped = [row for row in rows if row["email"] not in inserted]
+        conflicts = await find_import_conflicts(self.db, skipped)
+        for row in skipped:
+            field = conflicts.get(row["email"])
+            if field == "email":
+                error = "email already exists"
+            elif field == "phone_number":
+                error = "phone number already exists"
+            else:
+                error = "referral code collision; retry the row"
+            self.fail(lines[row["email"]], row["email"], error)
+
+
+async def import_users(
+    db: AsyncSession,
+    lines: AsyncIterable[str],
+    *,
+    fmt: str,
+    batch_size: Optional[int] = None,
+) -> UserImportReport:
+    """
+    Stream CSV/NDJSON signups into ``users``.
+
+    Rows are validated one by one and inserted in batches with
+    passwords hashed in parallel on the hashing pool. A bad or
+    conflicting row is reported and skipped; it never aborts the
+    batch. Each batch commits on its own. Rows without a password
+    get an unusable random one and are listed in the report as
+    needing a password reset.
+    """
+    if fmt not in IMPORT_FORMATS:
+        raise ValueError(f"unsupported format: {fmt}")
+
+    started = time.perf_counter()
+    importer = _Importer(db, batch_size or settings.USER_IMPORT_BATCH_SIZE)
+
+    async for line, record in iter_records(lines, fmt):
+        await importer.add(line, record)
+    await importer.flush()
+
+    importer.report.elapsed_seconds = time.perf_counter() - started
+    return importer.report
@@ -0,0 +1,111 @@
+import enum
+import hashlib
+import hmac
+import secrets
+import uuid
+from dataclasses import dataclass
+from typing import Optional
+
+from app.core.config import settings
+from app.core.redis import get_redis
+
+
+# --------------------------------------------------
+# Redis layout
+# --------------------------------------------------
+# email_verify:{user_id}           HASH {digest, attempts}, TTL = code lifetime
+# email_verify:cooldown:{user_id}  STRING, TTL = resend cooldown
+#
+# Only an HMAC of the code is stored. Verification is one Lua call:
+# it counts the attempt, compares, and deletes the key on success
+# (single use) or once the attempt budget is spent.
+
+_KEY = "email_verify:{user_id}"
+_COOLDOWN_KEY = "email_verify:cooldown:{user_id}"
+
+_VERIFY = """
+local digest = redis.call('HGET', KEYS[1], 'digest')
+if not digest then
+    return -1
+end
+local attempts = redis.call('HINCRBY', KEYS[1], 'attempts', 1)
+if digest == ARGV[1] then
+    redis.call('DEL', KEYS[1])
+    return 1
+end
+if attempts >= tonumber(ARGV[2]) then
+    redis.call('DEL', KEYS[1])
+    return -2
+end
+return 0
+"""
+
+
+class VerifyResult(str, enum.Enum):
+    verified = "verified"
+    invalid = "invalid"
+    expired = "expired"
+    too_many_attempts = "too_many_attempts"
+
+
+_RESULTS = {
+    1: VerifyResult.verified,
+    0: VerifyResult.invalid,
+    -1: VerifyResult.expired,
+    -2: VerifyResult.too_many_attempts,
+}
+
+
+@dataclass
+class IssuedCode:
+    code: Optional[str]
+    # Seconds until another code may be issued (0 = issued now)
+    retry_after: int = 0
+
+
+def _digest(user_id: uuid.UUID, code: str) -> str:
+    return hmac.new(
+        settings.SECRET_KEY.encode(),
+        f"{user_id}:{code}".encode(),
+        hashlib.sha256,
+    ).hexdigest()
+
+
+async def issue_code(user_id: uuid.UUID) -> IssuedCode:
+    """
+    Create a fresh 6-digit code, replacing any outstanding one.
+
+    Returns ``IssuedCode(code=None, retry_after=n)`` while the
+    resend cooldown is running.
+    """
+    client = get_redis()
+    cooldown_key = _COOLDOWN_KEY.format(user_id=user_id)
+
+    if not await client.set(
+        cooldown_key, 1, nx=True, ex=settings.EMAIL_VERIFICATION_RESEND_SECONDS
+    ):
+        ttl = await client.ttl(cooldown_key)
+        return IssuedCode(code=None, retry_after=max(ttl, 1))
+
+    code = f"{secrets.randbelow(10**6):06d}"
+    key = _KEY.format(user_id=user_id)
+
+    pipe = client.pipeline(transaction=True)
+    pipe.delete(key)
+    pipe.hset(key, mapping={"digest": _digest(user_id, code), "attempts": 0})
+    pipe.expire(key, settings.EMAIL_VERIFICATION_CODE_TTL_SECONDS)
+    await pipe.execute()
+
+    return IssuedCode(code=code)
+
+
+async def verify_code(user_id: uuid.UUID, code: str) -> VerifyResult:
+    client = get_redis()
+    result = await client.eval(
+        _VERIFY,
+        1,
+        _KEY.format(user_id=user_id),
+        _digest(user_id, code),
+        settings.EMAIL_VERIFICATION_MAX_ATTEMPTS,
+    )
+    return _RESULTS[int(result)]
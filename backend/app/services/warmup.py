@@ -0,0 +1,115 @@
+import asyncio
+import contextlib
+import logging
+import time
+from typing import Any
+
+from app.core.config import settings
+from app.core.hashing import password_hasher
+from app.core.redis import close_redis, get_redis
+from app.core.security import get_pwd_context, prepare_keys
+from app.crud.user import principal_lookup
+from app.db.engines import dispose_engines, get_async_engine
+
+
+logger = logging.getLogger(__name__)
+
+
+# --------------------------------------------------
+# Startup
+# --------------------------------------------------
+async def warm_database(connections: int) -> int:
+    """
+    Open ``connections`` pooled connections at once and run the
+    principal lookup on each: SQLAlchemy compiles it once, and every
+    connection prepares it (asyncpg statement cache) before the
+    first real request needs it.
+    """
+    engine = get_async_engine()
+    async with contextlib.AsyncExitStack() as stack:
+        # return_exceptions: every attempt settles (and is on the
+        # stack) before the stack can unwind
+        results = await asyncio.gather(
+            *(stack.enter_async_context(engine.connect()) for _ in range(connections)),
+            return_exceptions=True,
+        )
+        opened = [result for result in results if not isinstance(result, BaseException)]
+        await asyncio.gather(
+            *(connection.execute(principal_lookup("")) for connection in opened)
+        )
+    if len(opened) < connections:
+        raise next(result for result in results if isinstance(result, BaseException))
+    return len(opened)
+
+
+async def warm_redis(connections: int) -> int:
+    # Concurrent PINGs make the pool open one connection each
+    client = get_redis()
+    await asyncio.gather(*(client.ping() for _ in range(connections)))
+    return connections
+
+
+async def _prime_local() -> None:
+    prepare_keys()
+    get_pwd_context()
+
+
+async def warm_up() -> dict[str, Any]:
+    """
+    Pre-open connections and start the hash workers. A failing step
+    is logged and skipped: the resource is then opened lazily, as
+    it would have been without warm-up.
+    """
+    db_connections = min(
+        settings.STARTUP_WARM_DB_CONNECTIONS or settings.DB_POOL_SIZE,
+        settings.DB_POOL_SIZE,
+    )
+    steps = {
+        "database": warm_database(db_connections),
+        "redis": warm_redis(settings.STARTUP_WARM_REDIS_CONNECTIONS),
+        "hasher": password_hasher.warm_up(),
+        "local": _prime_local(),
+    }
+
+    started = time.perf_counter()
+    try:
+        results = await asyncio.wait_for(
+            asyncio.gather(*steps.values(), return_exceptions=True),
+            settings.STARTUP_WARMUP_TIMEOUT_SECONDS,
+        )
+    except asyncio.TimeoutError:
+        logger.warning(
+            "Warm-up did not finish within %.0fs; continuing",
+            settings.STARTUP_WARMUP_TIMEOUT_SECONDS,
+        )
+        return {"timed_out": True}
+
+    report: dict[str, Any] = {"seconds": time.perf_counter() - started}
+    for name, result in zip(steps, results):
+        if isinstance(result, Exception):
+            logger.warning("Warm-up step %s failed: %s", name, result)
+            report[name] = "failed"
+        else:
+            report[name] = result
+    logger.info("Warm-up done: %s", report)
+    return report
+
+
+# --------------------------------------------------
+# Shutdown
+# --------------------------------------------------
+async def close_resources() -> None:
+    """
+    Release pools once nothing can use them any more. Each step
+    runs even if an earlier one fails.
+    """
+    steps = (
+        ("database", dispose_engines),
+        ("redis", close_redis),
+        ("hasher", lambda: asyncio.to_thread(password_hasher.shutdown)),
+    )
+    for name, step in steps:
+        try:
+            await step()
+        except Exception:  # noqa: BLE001 - shutting down regardless
+            logger.exception("Closing %s failed", name)
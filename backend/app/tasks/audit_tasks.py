@@ -0,0 +1,31 @@
+from datetime import datetime, timezone
+
+from app.core.config import settings
+from app.db.engines import get_sync_engine
+from app.db.partitions import (
+    add_months,
+    drop_monthly_partitions_before,
+    ensure_monthly_partitions,
+    month_start,
+)
+from app.tasks.celery_app import celery
+
+
+@celery.task(name="audit.maintain_partitions")
+def maintain_audit_partitions_task() -> dict:
+    """
+    Keep audit_logs partitions created ahead of time and drop
+    whole months that fell out of retention.
+    """
+    this_month = month_start(datetime.now(timezone.utc).date())
+    cutoff = add_months(this_month, -settings.AUDIT_LOG_RETENTION_MONTHS)
+
+    with get_sync_engine().begin() as conn:
+        created = ensure_monthly_partitions(
+            conn,
+            "audit_logs",
+            months_ahead=settings.AUDIT_LOG_PARTITIONS_AHEAD,
+        )
+        dropped = drop_monthly_partitions_before(conn, "audit_logs", cutoff)
+
+    return {"created": created, "dropped": dropped}
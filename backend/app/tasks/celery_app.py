@@ -1,4 +1,6 @@
 from celery import Celery
+from celery.signals import worker_process_shutdown
+
 from app.core.config import settings
 
 
@@ -6,11 +8,16 @@ celery = Celery(
     "postika",
     broker=settings.CELERY_BROKER_URL,
     backend=settings.CELERY_RESULT_BACKEND,
+    # autodiscover_tasks() only looks for app.tasks.tasks
+    include=[
+        "app.tasks.email_tasks",
+        "app.tasks.verification_tasks",
+        "app.tasks.audit_tasks",
+        "app.tasks.referral_tasks",
+        "app.tasks.trial_tasks",
+    ],
 )
 
-# Ensure tasks are discovered correctly under app/
-celery.autodiscover_tasks(["app.tasks"])
-
 # Optional but recommended defaults
 celery.conf.update(
     task_serializer="json",
@@ -20,3 +27,37 @@ celery.conf.update(
     enable_utc=True,
 )
 
+# --------------------------------------------------
+# Periodic tasks (celery beat)
+# --------------------------------------------------
+celery.conf.beat_schedule = {
+    "email-deliver-pending": {
+        "task": "email.deliver_pending",
+        "schedule": 5.0,
+    },
+    "audit-maintain-partitions": {
+        "task": "audit.maintain_partitions",
+        "schedule": 6 * 3600.0,
+    },
+    "referrals-dispatch-settlement": {
+        "task": "referrals.dispatch_settlement",
+        "schedule": 60.0,
+    },
+    "users-expire-trials": {
+        "task": "users.expire_trials",
+        "schedule": 60.0,
+    },
+}
+
+if settings.EMAIL_VERIFICATION_AUDIT:
+    celery.conf.beat_schedule["verification-purge-audit"] = {
+        "task": "verification.purge_audit",
+        "schedule": 3600.0,
+    }
+
+
+@worker_process_shutdown.connect
+def _close_smtp_connection(**_kwargs) -> None:
+    from app.services.email.email_sender import close_connection
+
+    close_connection()
@@ -1,11 +1,23 @@
-from app.core.celery_app import celery
-from app.services.email.email_sender import send_email
+from app.tasks.celery_app import celery
+from app.services.email.outbox import deliver_pending, enqueue_email
 
 
-@celery.task(bind=True, autoretry_for=(Exception,), retry_backoff=10, retry_kwargs={"max_retries": 3})
-def send_verification_code_task(self, email: str, code: str) -> None:
-    send_email(
+@celery.task(name="email.send_verification_code")
+def send_verification_code_task(email: str, code: str) -> dict:
+    # Keyed per recipient: a newer code replaces one still queued
+    enqueue_email(
         to=email,
         subject="Verify your POSTIKA account",
-        body=f"Your verification code is: {code}"
+        body=f"Your verification code is: {code}",
+        dedup_key=f"verify:{email}",
     )
+    return deliver_pending().as_dict()
+
+
+@celery.task(name="email.deliver_pending")
+def deliver_pending_task() -> dict:
+    """
+    Periodic sweep: promotes due retries and drains anything
+    left in the queue.
+    """
+    return deliver_pending().as_dict()
@@ -0,0 +1,32 @@
+import math
+
+from app.core.config import settings
+from app.db.session import get_sync_sessionmaker
+from app.services.referral_settlement import settle_rewards, settlement_backlog
+from app.tasks.celery_app import celery
+
+
+@celery.task(name="referrals.settle_rewards")
+def settle_referral_rewards_task() -> dict:
+    # Safe to retry or run in parallel: rows are claimed with
+    # SKIP LOCKED and only ever move from unpaid to paid once.
+    return settle_rewards().as_dict()
+
+
+@celery.task(name="referrals.dispatch_settlement")
+def dispatch_referral_settlement_task() -> dict:
+    """
+    Periodic entry point: fan out one settlement task per chunk of
+    backlog, up to REFERRAL_SETTLEMENT_CONCURRENCY.
+    """
+    with get_sync_sessionmaker()() as session:
+        backlog = settlement_backlog(session)
+
+    workers = min(
+        settings.REFERRAL_SETTLEMENT_CONCURRENCY,
+        math.ceil(backlog / settings.REFERRAL_SETTLEMENT_CHUNK_SIZE),
+    )
+    for _ in range(workers):
+        settle_referral_rewards_task.delay()
+
+    return {"backlog": backlog, "dispatched": workers}
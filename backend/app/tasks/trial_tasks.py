@@ -0,0 +1,7 @@
+from app.services.trials import sweep_expired_trials
+from app.tasks.celery_app import celery
+
+
+@celery.task(name="users.expire_trials")
+def expire_trials_task() -> dict:
+    return sweep_expired_trials().as_dict()
@@ -0,0 +1,55 @@
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete, select, update
+
+from app.core.config import settings
+from app.db.session import get_sync_sessionmaker
+from app.models.email_verification import EmailVerification
+from app.tasks.celery_app import celery
+
+
+@celery.task(name="verification.record_issued", ignore_result=True)
+def record_code_issued_task(user_id: str, expires_at: str) -> None:
+    with get_sync_sessionmaker()() as session:
+        session.add(
+            EmailVerification(
+                user_id=user_id,
+                expires_at=datetime.fromisoformat(expires_at),
+                used=False,
+            )
+        )
+        session.commit()
+
+
+@celery.task(name="verification.record_used", ignore_result=True)
+def record_code_used_task(user_id: str) -> None:
+    with get_sync_sessionmaker()() as session:
+        latest = (
+            select(EmailVerification.id)
+            .where(
+                EmailVerification.user_id == user_id,
+                EmailVerification.used.is_(False),
+            )
+            .order_by(EmailVerification.created_at.desc())
+            .limit(1)
+            .scalar_subquery()
+        )
+        session.execute(
+            update(EmailVerification)
+            .where(EmailVerification.id == latest)
+            .values(used=True)
+        )
+        session.commit()
+
+
+@celery.task(name="verification.purge_audit")
+def purge_verification_audit_task() -> int:
+    cutoff = datetime.now(timezone.utc) - timedelta(
+        days=settings.EMAIL_VERIFICATION_AUDIT_RETENTION_DAYS
+    )
+    with get_sync_sessionmaker()() as session:
+        result = session.execute(
+            delete(EmailVerification).where(EmailVerification.created_at < cutoff)
+        )
+        session.commit()
+        return result.rowcount
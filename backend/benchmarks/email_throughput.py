@@ -0,0 +1,140 @@
+"""
+Email delivery throughput (messages/sec for one worker).
+
+Runs against the in-process SMTP stand-in, so it measures our
+per-message overhead rather than a real relay:
+
+    per-connection  new SMTP session per message (the old behaviour)
+    pooled          one reused session (SMTPConnection)
+    pipeline        Redis outbox enqueue + batched deliver_pending();
+                    only with --redis-url (uses and clears the email:*
+                    keys in that database)
+
+Usage (from backend/):
+
+    python -m benchmarks.email_throughput --messages 2000
+    python -m benchmarks.email_throughput --redis-url redis://localhost:6379/15
+"""
+
+import argparse
+import os
+import smtplib
+import sys
+import time
+from typing import Any
+
+from benchmarks._common import apply_env_defaults, result_metadata, write_results
+
+
+def _rate(count: int, elapsed: float) -> dict[str, Any]:
+    return {
+        "messages": count,
+        "elapsed_s": elapsed,
+        "messages_per_second": count / elapsed if elapsed else 0.0,
+    }
+
+
+def bench_per_connection(server, count: int) -> dict[str, Any]:
+    from app.services.email.email_sender import build_message
+
+    started = time.perf_counter()
+    for i in range(count):
+        with smtplib.SMTP(server.host, server.port) as smtp:
+            smtp.send_message(build_message(f"user{i}@example.org", "Bench", "body"))
+    return _rate(count, time.perf_counter() - started)
+
+
+def bench_pooled(count: int) -> dict[str, Any]:
+    from app.services.email.email_sender import SMTPConnection, build_message
+
+    connection = SMTPConnection()
+    started = time.perf_counter()
+    for i in range(count):
+        connection.send(build_message(f"user{i}@example.org", "Bench", "body"))
+    elapsed = time.perf_counter() - started
+    connection.close()
+
+    result = _rate(count, elapsed)
+    result["connections_opened"] = connection.connections_opened
+    return result
+
+
+def bench_pipeline(count: int, duplicates: int) -> dict[str, Any]:
+    from app.core.redis import get_sync_redis
+    from app.services.email import outbox
+
+    client = get_sync_redis()
+    client.delete(
+        outbox.OUTBOX_KEY, outbox.QUEUE_KEY, outbox.INFLIGHT_KEY, outbox.RETRY_KEY, outbox.DEAD_KEY
+    )
+
+    started = time.perf_counter()
+    for i in range(count):
+        # Every recipient asks for a code `duplicates` times
+        for _ in range(duplicates):
+            outbox.enqueue_email(
+                f"user{i}@example.org", "Bench", f"code {i}",
+                dedup_key=f"verify:user{i}@example.org",
+            )
+    enqueued = time.perf_counter()
+
+    sent = batches = 0
+    while True:
+        report = outbox.deliver_pending()
+        sent += report.sent
+        batches += report.batches
+        if not report.batches:
+            break
+    finished = time.perf_counter()
+
+    result = _rate(sent, finished - started)
+    result.update(
+        {
+            "enqueued": count * duplicates,
+            "enqueue_s": enqueued - started,
+            "deliver_s": finished - enqueued,
+            "batches": batches,
+        }
+    )
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Email delivery throughput.")
+    parser.add_argument("--messages", type=int, default=1000)
+    parser.add_argument("--redis-url", help="enable the Redis pipeline benchmark")
+    parser.add_argument("--duplicates", type=int, default=1,
+                        help="pipeline: sends per recipient (exercises dedup)")
+    parser.add_argument("--output")
+    args = parser.parse_args()
+
+    from app.services.email.testing import LocalSMTPServer
+
+    with LocalSMTPServer() as server:
+        apply_env_defaults()
+        os.environ["SMTP_HOST"] = server.host
+        os.environ["SMTP_PORT"] = str(server.port)
+        if args.redis_url:
+            os.environ["REDIS_URL"] = args.redis_url
+
+        results = {
+            "per_connection": bench_per_connection(server, args.messages),
+            "pooled": bench_pooled(args.messages),
+        }
+        if args.redis_url:
+            results["pipeline"] = bench_pipeline(args.messages, args.duplicates)
+
+        results["server_messages_received"] = len(server.messages)
+
+    for name, result in results.items():
+        if isinstance(result, dict):
+            print(f"{name:<15} {result['messages_per_second']:>10.1f} msg/s", file=sys.stderr)
+
+    write_results(
+        {"meta": result_metadata("email_throughput", vars(args)), "results": results},
+        args.output,
+    )
+
+
+if __name__ == "__main__":
+    main()
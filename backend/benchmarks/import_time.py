@@ -0,0 +1,179 @@
+"""
+Cold-start import cost of the API app and the Celery worker.
+
+Each target is imported in a fresh interpreter under
+``python -X importtime``, several times. The report shows the
+median total import time, the slowest top-level packages, and any
+package a target must not load (for example, the worker must not
+import fastapi, python-jose, passlib or prometheus_client).
+
+    api      import app.main
+    worker   import app.tasks.celery_app and every task module it
+             includes (what ``celery worker`` imports at boot)
+
+The run fails (exit status 1) when a target exceeds ``--max-ms``,
+or is more than ``--tolerance`` slower than the same target in a
+``--baseline`` file written by an earlier run, or imports a
+forbidden package.
+
+Usage (from backend/):
+
+    python -m benchmarks.import_time --output import-time.json
+    python -m benchmarks.import_time --baseline import-time.json --tolerance 0.15
+    python -m benchmarks.import_time --max-ms api=900,worker=600
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+from typing import Any
+
+from benchmarks._common import (
+    BACKEND_DIR,
+    apply_env_defaults,
+    result_metadata,
+    write_results,
+)
+
+
+TARGETS = {
+    "api": "import app.main",
+    "worker": (
+        "import importlib\n"
+        "from app.tasks.celery_app import celery\n"
+        "for name in celery.conf.include:\n"
+        "    importlib.import_module(name)\n"
+    ),
+}
+
+FORBIDDEN = {
+    "worker": ("fastapi", "jose", "passlib", "prometheus_client", "email_validator"),
+}
+
+
+def parse_importtime(stderr: str) -> list[tuple[str, int, int, int]]:
+    """
+    ``-X importtime`` lines -> (module, depth, self us, cumulative us).
+    Depth 0 is an import made directly by the interpreter or the
+    ``-c`` code; nested imports are indented two spaces per level.
+    """
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        depth = (len(name) - len(name.lstrip(" ")) - 1) // 2
+        rows.append((name.strip(), depth, int(self_us), int(cumulative_us)))
+    return rows
+
+
+def run_once(code: str) -> list[tuple[str, int, int, int]]:
+    env = apply_env_defaults(dict(os.environ))
+    env.pop("PYTHONPROFILEIMPORTTIME", None)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=BACKEND_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import failed:\n{result.stderr[-4000:]}")
+    return parse_importtime(result.stderr)
+
+
+def measure(name: str, code: str, repeats: int, top: int) -> dict[str, Any]:
+    totals, last = [], []
+    for _ in range(repeats):
+        rows = run_once(code)
+        # Top-level entries' cumulative times add up to the whole run
+        # (interpreter startup imports included: this is a cold start)
+        totals.append(sum(cumulative for _m, depth, _s, cumulative in rows if depth == 0))
+        last = rows
+
+    by_package: dict[str, int] = defaultdict(int)
+    for module, _depth, self_us, _cumulative in last:
+        by_package[module.split(".")[0]] += self_us
+    slowest = sorted(by_package.items(), key=lambda item: item[1], reverse=True)[:top]
+
+    loaded = {module.split(".")[0] for module, *_ in last}
+    return {
+        "median_ms": statistics.median(totals) / 1000,
+        "min_ms": min(totals) / 1000,
+        "runs_ms": [total / 1000 for total in totals],
+        "modules": len(last),
+        "slowest_packages_ms": {package: us / 1000 for package, us in slowest},
+        "forbidden_loaded": sorted(loaded.intersection(FORBIDDEN.get(name, ()))),
+    }
+
+
+def _parse_limits(value: str) -> dict[str, float]:
+    limits = {}
+    for item in filter(None, value.split(",")):
+        target, _, ms = item.partition("=")
+        limits[target.strip()] = float(ms)
+    return limits
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Cold-start import time.")
+    parser.add_argument("--targets", default=",".join(TARGETS))
+    parser.add_argument("--repeats", type=int, default=7)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--max-ms", default="", help="absolute limits, e.g. api=900,worker=600")
+    parser.add_argument("--baseline", help="results JSON of an earlier run")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="allowed slowdown against --baseline (0.2 = 20%%)")
+    parser.add_argument("--output")
+    args = parser.parse_args()
+
+    limits = _parse_limits(args.max_ms)
+    baseline: dict[str, Any] = {}
+    if args.baseline:
+        with open(args.baseline) as fh:
+            baseline = json.load(fh)["results"]
+
+    results: dict[str, Any] = {}
+    failures: list[str] = []
+    for name in filter(None, args.targets.split(",")):
+        result = measure(name, TARGETS[name], args.repeats, args.top)
+        results[name] = result
+
+        print(f"{name:<7} median {result['median_ms']:8.1f} ms  "
+              f"({result['modules']} modules)", file=sys.stderr)
+        for package, ms in result["slowest_packages_ms"].items():
+            print(f"          {package:<28} {ms:8.1f} ms", file=sys.stderr)
+
+        if result["forbidden_loaded"]:
+            failures.append(f"{name} imports {', '.join(result['forbidden_loaded'])}")
+        if name in limits and result["median_ms"] > limits[name]:
+            failures.append(f"{name} {result['median_ms']:.1f} ms > limit {limits[name]:.1f} ms")
+        if name in baseline:
+            allowed = baseline[name]["median_ms"] * (1 + args.tolerance)
+            if result["median_ms"] > allowed:
+                failures.append(
+                    f"{name} {result['median_ms']:.1f} ms > baseline "
+                    f"{baseline[name]['median_ms']:.1f} ms + {args.tolerance:.0%}"
+                )
+
+    write_results(
+        {
+            "meta": result_metadata("import_time", vars(args)),
+            "results": results,
+            "failures": failures,
+        },
+        args.output,
+    )
+
+    for failure in failures:
+        print(f"FAIL: {failure}", file=sys.stderr)
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
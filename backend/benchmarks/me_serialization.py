@@ -0,0 +1,114 @@
+"""
+Response-building cost of GET /auth/me, without the network or DB.
+
+Compares, per request, from the state each path starts with:
+
+    orm           principal dict -> transient User -> UserRead
+                  (from_attributes) -> JSON, the old endpoint path
+    orm_prebuilt  same, with the User already built (DB-hit path,
+                  where the ORM instance comes from the session)
+    read_model    principal dict -> projection -> JSON, the new path
+
+Usage (from backend/):
+
+    python -m benchmarks.me_serialization --iterations 50000
+"""
+
+import argparse
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable
+
+from benchmarks._common import apply_env_defaults, result_metadata, write_results
+
+
+def _measure(fn: Callable[[], Any], iterations: int, repeats: int) -> dict[str, Any]:
+    best = float("inf")
+    for _ in range(repeats):
+        started = time.perf_counter()
+        for _i in range(iterations):
+            fn()
+        best = min(best, time.perf_counter() - started)
+    return {
+        "iterations": iterations,
+        "best_run_s": best,
+        "us_per_response": best / iterations * 1e6,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="/auth/me response building cost.")
+    parser.add_argument("--iterations", type=int, default=20000)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--output")
+    args = parser.parse_args()
+
+    apply_env_defaults()
+
+    from fastapi.responses import JSONResponse
+
+    from app.crud.user import user_from_principal, user_to_principal
+    from app.models.user import TierEnum, User
+    from app.read_models import user as read_model
+    from app.schemas.user import UserRead
+
+    now = datetime.now(timezone.utc)
+    user = User(
+        id=uuid.uuid4(),
+        first_name="Bench",
+        last_name="Mark",
+        email="bench@example.org",
+        phone_number="+255700000000",
+        country_code="TZ",
+        hashed_password="x" * 60,
+        is_active=True,
+        is_email_verified=True,
+        role="client",
+        tier=TierEnum.sungura,
+        trial_starts_at=now,
+        trial_expires_at=now + timedelta(days=14),
+        referral_code="BENCH123",
+        accepts_notifications=True,
+        accepted_terms=True,
+        created_at=now,
+        updated_at=now,
+    )
+    principal = user_to_principal(user)
+
+    def orm_response(instance: User) -> bytes:
+        # What FastAPI does with response_model=UserRead
+        payload = UserRead.model_validate(instance).model_dump(mode="json")
+        return JSONResponse(payload).body
+
+    results = {
+        "orm": _measure(
+            lambda: orm_response(user_from_principal(principal)),
+            args.iterations, args.repeats,
+        ),
+        "orm_prebuilt": _measure(
+            lambda: orm_response(user), args.iterations, args.repeats,
+        ),
+        "read_model": _measure(
+            lambda: read_model.user_read_response(principal).body,
+            args.iterations, args.repeats,
+        ),
+    }
+    results["orjson"] = read_model.orjson is not None
+    results["speedup_read_model_vs_orm"] = (
+        results["orm"]["us_per_response"] / results["read_model"]["us_per_response"]
+    )
+
+    for name, result in results.items():
+        if isinstance(result, dict):
+            print(f"{name:<13} {result['us_per_response']:>9.2f} us/response", file=sys.stderr)
+
+    write_results(
+        {"meta": result_metadata("me_serialization", vars(args)), "results": results},
+        args.output,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Per-scheme password hashing micro-benchmark.
+
+Measures hash, verify and needs_update latency for each bcrypt
+round count and (when argon2-cffi is installed) each argon2
+parameter set, so cost changes to the hashing policy can be
+compared before they ship.
+
+Usage (from backend/):
+
+    python -m benchmarks.password_hashing
+    python -m benchmarks.password_hashing --bcrypt-rounds 10,12,13 \\
+        --argon2 65536:3:4,19456:2:1 --samples 20 --output hashing.json
+"""
+
+import argparse
+import sys
+import time
+from typing import Any
+
+from passlib.context import CryptContext
+
+from benchmarks._common import result_metadata, summarize_latencies, write_results
+
+
+PASSWORD = "Bench-Passw0rd!"
+
+
+def _time(fn, *args) -> float:
+    started = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - started
+
+
+def bench_context(context: CryptContext, samples: int) -> dict[str, Any]:
+    hashes, hash_times = [], []
+    for _ in range(samples):
+        started = time.perf_counter()
+        hashes.append(context.hash(PASSWORD))
+        hash_times.append(time.perf_counter() - started)
+
+    verify_times = [_time(context.verify, PASSWORD, hashed) for hashed in hashes]
+    # needs_update runs on every login; it must stay negligible
+    check_times = [_time(context.needs_update, hashed) for hashed in hashes]
+
+    return {
+        "hash": summarize_latencies(hash_times),
+        "verify": summarize_latencies(verify_times),
+        "needs_update": summarize_latencies(check_times),
+        "hash_length": len(hashes[0]),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Password hashing cost per scheme.")
+    parser.add_argument("--bcrypt-rounds", default="10,11,12,13")
+    parser.add_argument("--argon2", default="19456:2:1,65536:3:4",
+                        help="memory_kib:time_cost:parallelism sets")
+    parser.add_argument("--samples", type=int, default=10)
+    parser.add_argument("--output")
+    args = parser.parse_args()
+
+    results: dict[str, Any] = {}
+
+    for rounds in (int(value) for value in args.bcrypt_rounds.split(",") if value):
+        context = CryptContext(schemes=["bcrypt"], bcrypt__rounds=rounds)
+        results[f"bcrypt:rounds={rounds}"] = bench_context(context, args.samples)
+
+    try:
+        import argon2  # noqa: F401
+    except ImportError:
+        print("argon2-cffi not installed; skipping argon2", file=sys.stderr)
+    else:
+        for spec in (value for value in args.argon2.split(",") if value):
+            memory_kib, time_cost, parallelism = (int(part) for part in spec.split(":"))
+            context = CryptContext(
+                schemes=["argon2"],
+                argon2__memory_cost=memory_kib,
+                argon2__time_cost=time_cost,
+                argon2__parallelism=parallelism,
+            )
+            results[f"argon2:m={memory_kib},t={time_cost},p={parallelism}"] = bench_context(
+                context, args.samples
+            )
+
+    for name, result in results.items():
+        print(
+            f"{name:<32} hash p50 {result['hash']['p50_ms']:8.1f} ms"
+            f"   verify p50 {result['verify']['p50_ms']:8.1f} ms",
+            file=sys.stderr,
+        )
+
+    write_results(
+        {"meta": result_metadata("password_hashing", vars(args)), "results": results},
+        args.output,
+    )
+
+
+if __name__ == "__main__":
+    main()
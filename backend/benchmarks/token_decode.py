@@ -0,0 +1,100 @@
+"""
+Per-request access-token verification cost.
+
+Decodes the same token repeatedly, the way a mobile client's
+requests arrive, and reports microseconds per decode for:
+
+    baseline      jose.jwt.decode with the raw secret (the old path)
+    prepared_key  jose.jwt.decode with the key object built once
+    cached        decode_access_token on a warm verified-claims cache
+    cold          decode_access_token with a fresh token each time
+                  (cache miss + insert)
+
+Usage (from backend/):
+
+    python -m benchmarks.token_decode --iterations 50000
+"""
+
+import argparse
+import sys
+import time
+from typing import Any, Callable
+
+from benchmarks._common import apply_env_defaults, result_metadata, write_results
+
+
+def _measure(fn: Callable[[int], Any], iterations: int, repeats: int) -> dict[str, Any]:
+    # Best of several runs: least disturbed by the rest of the machine
+    best = float("inf")
+    for _ in range(repeats):
+        started = time.perf_counter()
+        for i in range(iterations):
+            fn(i)
+        best = min(best, time.perf_counter() - started)
+    return {
+        "iterations": iterations,
+        "best_run_s": best,
+        "us_per_decode": best / iterations * 1e6,
+        "decodes_per_second": iterations / best,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Access-token decode cost.")
+    parser.add_argument("--iterations", type=int, default=20000)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--output")
+    args = parser.parse_args()
+
+    apply_env_defaults()
+
+    from jose import jwt
+
+    from app.core import security
+    from app.core.config import settings
+
+    token = security.create_access_token("bench@example.org")
+    key = security.prepare_keys()
+    algorithms = [security.ALGORITHM]
+
+    # Distinct tokens for the cold path, minted outside the timing
+    fresh_tokens = [
+        security.create_access_token(f"bench{i}@example.org")
+        for i in range(args.iterations)
+    ]
+
+    def cold(i: int) -> None:
+        security.verified_claims_cache.clear()
+        security.decode_access_token(fresh_tokens[i])
+
+    results = {
+        "baseline": _measure(
+            lambda _i: jwt.decode(token, settings.SECRET_KEY, algorithms=algorithms),
+            args.iterations, args.repeats,
+        ),
+        "prepared_key": _measure(
+            lambda _i: jwt.decode(token, key, algorithms=algorithms),
+            args.iterations, args.repeats,
+        ),
+        "cached": _measure(
+            lambda _i: security.decode_access_token(token),
+            args.iterations, args.repeats,
+        ),
+        "cold": _measure(cold, args.iterations, 1),
+    }
+    results["speedup_cached_vs_baseline"] = (
+        results["baseline"]["us_per_decode"] / results["cached"]["us_per_decode"]
+    )
+
+    for name, result in results.items():
+        if isinstance(result, dict):
+            print(f"{name:<13} {result['us_per_decode']:>9.2f} us/decode", file=sys.stderr)
+
+    write_results(
+        {"meta": result_metadata("token_decode", vars(args)), "results": results},
+        args.output,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Declared query budgets of the hot endpoints.
+
+A budget is an upper bound: a cached principal can take a query
+away, never add one. Blowing a budget (an extra lookup, a lazy
+load, an N+1) fails with the statements that ran.
+"""
+
+import pytest
+
+from app.db.query_tracker import query_budget
+from tests.conftest import PASSWORD
+
+
+pytestmark = [pytest.mark.anyio, pytest.mark.integration]
+
+
+async def _login(client, user) -> dict:
+    response = await client.post(
+        "/api/v1/auth/login",
+        json={"email": user.email, "password": PASSWORD},
+    )
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def _joins_users(budget: query_budget) -> bool:
+    return any("JOIN users" in record.normalized for record in budget.records)
+
+
+async def test_login_budget(client, make_user):
+    # A referred user: the login select must not pull the referrer in
+    referrer = await make_user()
+    user = await make_user(referred_by=referrer)
+
+    with query_budget(1) as budget:
+        tokens = await _login(client, user)
+
+    assert tokens["refresh_token"]
+    assert not _joins_users(budget), budget.report()
+
+
+async def test_me_budget(client, make_user):
+    referrer = await make_user()
+    user = await make_user(referred_by=referrer)
+    tokens = await _login(client, user)
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+
+    with query_budget(1) as budget:
+        response = await client.get("/api/v1/auth/me", headers=headers)
+    assert response.status_code == 200, response.text
+    assert response.json()["email"] == user.email
+    assert not _joins_users(budget), budget.report()
+
+    # Served from the principal cache
+    with query_budget(0):
+        response = await client.get("/api/v1/auth/me", headers=headers)
+    assert response.status_code == 200, response.text
+
+
+async def test_refresh_budget(client, make_user):
+    user = await make_user()
+    tokens = await _login(client, user)
+
+    with query_budget(1):
+        response = await client.post(
+            "/api/v1/auth/refresh",
+            json={"refresh_token": tokens["refresh_token"]},
+        )
+    assert response.status_code == 200, response.text
+    assert response.json()["refresh_token"] != tokens["refresh_token"]
+
+
+async def test_referral_stats_budget(client, make_user):
+    referrer = await make_user()
+    child = await make_user(referred_by=referrer)
+    await make_user(referred_by=child)
+    tokens = await _login(client, referrer)
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+
+    # Principal lookup and the stats row, each at most once
+    with query_budget(2, max_repeats=1) as budget:
+        response = await client.get("/api/v1/referrals/me/stats", headers=headers)
+    assert response.status_code == 200, response.text
+    assert response.json() == {
+        "direct_count": 1,
+        "indirect_count": 1,
+        "descendant_count": 2,
+        "depth": 0,
+    }
+    assert not _joins_users(budget), budget.report()
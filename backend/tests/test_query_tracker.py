@@ -0,0 +1,151 @@
+import pytest
+from sqlalchemy import create_engine, text
+
+from app.db.query_tracker import (
+    QueryBudgetExceeded,
+    QueryTracker,
+    fingerprint,
+    install_query_tracking,
+    normalize_statement,
+    query_budget,
+)
+
+
+# --------------------------------------------------
+# normalize_statement
+# --------------------------------------------------
+@pytest.mark.parametrize(
+    "statement",
+    [
+        "SELECT * FROM users WHERE id IN ($1, $2, $3)",
+        "SELECT * FROM users WHERE id IN (%(id_1)s, %(id_2)s)",
+        "SELECT * FROM users WHERE id IN (1, 2, 3, 4)",
+    ],
+)
+def test_in_lists_collapse(statement):
+    assert normalize_statement(statement) == "SELECT * FROM users WHERE id IN (...)"
+
+
+def test_multi_row_values_collapse():
+    two_rows = normalize_statement("INSERT INTO t (a, b) VALUES ($1, $2), ($3, $4)")
+    three_rows = normalize_statement(
+        "INSERT INTO t (a, b) VALUES ($1, $2), ($3, $4), ($5, $6)"
+    )
+    assert two_rows == three_rows == "INSERT INTO t (a, b) VALUES (...), ..."
+
+    single_column = normalize_statement("INSERT INTO t (a) VALUES (%(a_m0)s), (%(a_m1)s)")
+    assert single_column == "INSERT INTO t (a) VALUES (?), ..."
+
+
+def test_casts_are_not_parameters():
+    assert (
+        normalize_statement("SELECT id::text FROM users WHERE created_at > :since::timestamptz")
+        == "SELECT id::text FROM users WHERE created_at > ?::timestamptz"
+    )
+    assert (
+        normalize_statement("SELECT * FROM users WHERE id = ANY($1::uuid[])")
+        == "SELECT * FROM users WHERE id = ANY(?::uuid[])"
+    )
+
+
+def test_literals_and_whitespace():
+    assert (
+        normalize_statement("SELECT *\n  FROM users WHERE name = 'O''Brien' AND age > 30")
+        == "SELECT * FROM users WHERE name = ? AND age > ?"
+    )
+    # Digits inside identifiers are kept
+    assert normalize_statement("SELECT a1 FROM t2") == "SELECT a1 FROM t2"
+
+
+def test_fingerprint_ignores_values():
+    a = normalize_statement("SELECT * FROM users WHERE email = 'a@example.com'")
+    b = normalize_statement("SELECT * FROM users WHERE email = 'b@example.com'")
+    assert fingerprint(a) == fingerprint(b)
+    assert fingerprint(a) != fingerprint(normalize_statement("SELECT * FROM referrals"))
+
+
+# --------------------------------------------------
+# Trackers and budgets
+# --------------------------------------------------
+@pytest.fixture(scope="module")
+def engine():
+    engine = create_engine("sqlite://")
+    install_query_tracking(engine)
+    yield engine
+    engine.dispose()
+
+
+def _run(engine, *values: int) -> None:
+    with engine.connect() as conn:
+        for value in values:
+            conn.execute(text("SELECT :value"), {"value": value})
+
+
+def test_tracker_records_and_nests(engine):
+    with QueryTracker() as outer:
+        _run(engine, 1)
+        with QueryTracker() as inner:
+            _run(engine, 2, 3)
+
+    assert outer.count == 3
+    assert inner.count == 2
+    assert list(outer.repeats()) == [outer.records[0].fingerprint]
+    assert outer.total_seconds >= 0
+
+    # Inactive trackers see nothing
+    _run(engine, 4)
+    assert outer.count == 3
+
+
+def test_budget_context_manager(engine):
+    with query_budget(2):
+        _run(engine, 1, 2)
+
+    with pytest.raises(QueryBudgetExceeded, match="ran 3 statements, budget is 2"):
+        with query_budget(2):
+            _run(engine, 1, 2, 3)
+
+
+def test_budget_max_repeats(engine):
+    with pytest.raises(QueryBudgetExceeded, match="possible N\\+1"):
+        with query_budget(10, max_repeats=1):
+            _run(engine, 1, 2)
+
+
+def test_budget_does_not_mask_errors(engine):
+    with pytest.raises(ZeroDivisionError):
+        with query_budget(0):
+            _run(engine, 1)
+            1 / 0
+
+
+def test_budget_sync_decorator(engine):
+    @query_budget(1)
+    def one_query():
+        _run(engine, 1)
+
+    @query_budget(1)
+    def two_queries():
+        _run(engine, 1, 2)
+
+    # A fresh budget per call
+    one_query()
+    one_query()
+    # Reported under the function's name
+    with pytest.raises(QueryBudgetExceeded, match=r"\(.*\.two_queries\)"):
+        two_queries()
+
+
+@pytest.mark.anyio
+async def test_budget_async_decorator(engine):
+    @query_budget(1)
+    async def one_query():
+        _run(engine, 1)
+
+    @query_budget(5, max_repeats=1)
+    async def n_plus_one():
+        _run(engine, 1, 2, 3)
+
+    await one_query()
+    with pytest.raises(QueryBudgetExceeded, match=r"\(.*\.n_plus_one\)"):
+        await n_plus_one()